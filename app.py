@@ -1,28 +1,42 @@
 import sqlite3
 from datetime import datetime
-from flask import Flask, render_template, jsonify, request, send_from_directory
-import pandas as pd
-from routes.crime_routes import crime_bp
+from flask import Flask, render_template, jsonify, make_response, request, send_from_directory
+from routes.crime_routes import crime_bp, gender_ratio_data, home_kpis_data, reports_summary_data
 from routes.juvenile_routes import juvenile_bp
 from routes.government_routes import gov_bp
 from routes.foreigner_routes import foreign_bp
 from routes.feedback_routes import feedback_bp
 from routes.analytics_routes import analytics_bp
+from routes.batch_routes import batch_bp
 from chat.chat_routes import chat_bp
+from services.compression import init_compression
+from services.http_cache import enable_http_cache
+from services.response_formatter import format_indian_number
+from services.static_assets import init_static_assets
+import hashlib
 import os
 import secrets
 import logging
 from logging.handlers import RotatingFileHandler
 
 app = Flask(__name__)
+
+# Read-only data APIs: ETag / Last-Modified revalidation (services/http_cache)
+for data_bp in (crime_bp, juvenile_bp, gov_bp, foreign_bp, batch_bp):
+    enable_http_cache(data_bp)
+
 app.register_blueprint(crime_bp)
 app.register_blueprint(juvenile_bp)
 app.register_blueprint(gov_bp)
 app.register_blueprint(foreign_bp)
 app.register_blueprint(feedback_bp)
 app.register_blueprint(analytics_bp)
+app.register_blueprint(batch_bp)
 app.register_blueprint(chat_bp)
 
+# gzip / brotli for JSON responses, cached per ETag (services/compression)
+init_compression(app)
+
 # Production-ready secret key
 app.secret_key = os.environ.get('SECRET_KEY', secrets.token_hex(32))
 
@@ -86,91 +100,113 @@ init_db()
 
 
 # ===================== LOAD DATA ONCE =====================
+# All CSVs are loaded by services.data_loader when the blueprints above are
+# imported. Under gunicorn (preload_app) that happens once in the master
+# process and the forked workers share the frames copy-on-write.
+
+
+# ===================== PAGE DATA =====================
+# Headline numbers are constant for a data snapshot: computed once here and
+# rendered into the pages (the /api/home-kpis, /api/gender-ratio and
+# /api/reports-summary JSON endpoints stay for other clients)
+
+def home_page_kpis():
+    kpis = dict(home_kpis_data())
+    kpis["gender_ratio"] = gender_ratio_data("all")["ratio"]
+    population = kpis["total_population"]
+    kpis["crime_rate"] = round(kpis["total_arrests"] / population * 100000) if population else 0
+    return kpis
+
 
-crime_data = {
-    "2016": pd.read_csv("data/crime_data_2016.csv"),
-    "2019": pd.read_csv("data/crime_data_2019.csv"),
-    "2020": pd.read_csv("data/crime_data_2020.csv")
-}
+HOME_KPIS = home_page_kpis()
+REPORTS_SUMMARY = reports_summary_data()
 
+app.add_template_filter(format_indian_number, "indian_number")
 
-gov_data = {
-     "2016": pd.read_csv("data/Data by government 2016.csv"),
-    "2019": pd.read_csv("data/Data by government 2019.csv"),
-    "2020": pd.read_csv("data/Data by government 2020.csv")
-}
+# Minified, hashed, precompressed static files and asset_url() for templates
+init_static_assets(app)
 
-foreign_data = {
-    "2016": pd.read_csv("data/foreigner_2016.csv"),
-    "2019": pd.read_csv("data/foreigner_2019.csv"),
-    "2020": pd.read_csv("data/foreigner_2020.csv")
-}
 
+# ===================== PAGE CACHE =====================
+# Each page renders the same HTML for the life of the process, so it is
+# rendered once and then served from memory, with an ETag for browsers
+# (re-rendered every time in debug mode, where templates are reloaded)
+_page_cache = {}
 
 
-def get_year():
-    return request.args.get("year", "2016")
+def render_page(template, **context):
+    if app.debug:
+        return render_template(template, **context)
 
+    page = _page_cache.get(request.endpoint)
+    if page is None:
+        html = render_template(template, **context)
+        page = _page_cache[request.endpoint] = (html, hashlib.md5(html.encode()).hexdigest())
 
+    html, etag = page
+    response = make_response(html)
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 
 # ===================== PAGES =====================
 
 @app.route("/")
 def home():
-    return render_template("home.html")
+    return render_page("home.html", kpis=HOME_KPIS)
 
 
 @app.route("/dashboard")
 def dashboard():
-    return render_template("dashboard.html")
+    return render_page("dashboard.html")
 
 
 @app.route("/about")
 def about():
-    return render_template("about.html")
+    return render_page("about.html")
 
 
 @app.route("/reports")
 def reports():
-    return render_template("reports.html")
+    return render_page("reports.html", summary=REPORTS_SUMMARY)
 
 
 @app.route("/disclaimer")
 def disclaimer():
-    return render_template("disclaimer.html")
+    return render_page("disclaimer.html")
 
 @app.route("/terms")
 def terms():
-    return render_template("terms.html")
+    return render_page("terms.html")
 
 @app.route("/privacy")
 def privacy():
-    return render_template("privacy.html")
+    return render_page("privacy.html")
 @app.route("/copyright")
 def copyright():
-    return render_template("copyright.html")
+    return render_page("copyright.html")
 
 @app.route("/feedback")
 def feedback():
-    return render_template("feedback.html")
+    return render_page("feedback.html")
 @app.route("/juvenile")
 def juvenile():
-    return render_template("juvenile.html")
+    return render_page("juvenile.html")
 @app.route("/sitemap")
 def sitemap():
-    return render_template("sitemap.html")
+    return render_page("sitemap.html")
 @app.route("/government-data")
 def government_data():
-    return render_template("government.html")
+    return render_page("government.html")
 
 @app.route("/foreigners")
 def foreigners():
-    return render_template("foreigner.html")
+    return render_page("foreigner.html")
 
 @app.route("/faq")
 def faq():
-    return render_template("faq.html")
+    return render_page("faq.html")
 
 @app.route("/api/health-check")
 def health_check():
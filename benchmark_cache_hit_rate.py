@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Response cache benchmark: replay a chat query corpus through /chat and
+compare the old extraction-field cache key with the two cache tiers
+(normalized message, then resolved query plan).
+
+For each message the uncached answer is taken as ground truth. A "hit"
+is a message whose key was already seen; a "wrong hit" is a hit whose
+stored answer differs from the ground truth.
+
+Runs offline (local rule extraction only). Run from the project root:
+    python benchmark_cache_hit_rate.py [corpus.txt]   # one message per line
+"""
+import hashlib
+import os
+import random
+import sys
+import time
+
+# Never call the LLM while replaying
+os.environ["FAST_PATH_MIN_CONFIDENCE"] = "0"
+
+from app import app
+from services.cache_manager import chatbot_cache, message_cache
+from services.rule_extractor import extract_query
+
+# Same questions, worded the way users actually ask them
+CORPUS = [
+    "Delhi arrests 2020", "delhi arrests in 2020", "How many arrests in Delhi in 2020?",
+    "Show me Delhi 2020", "Delhi total arrests 2020", "arrests Delhi 2020",
+    "Delhi female arrests 2019", "women arrested in Delhi 2019", "Delhi women 2019",
+    "Mumbai arrests 2019", "Mumbai 2019 arrests", "Bombay arrests 2019",
+    "Chennai analysis 2020", "Chennai breakdown 2020", "Delhi gender breakdown 2020",
+    "Compare Delhi and Mumbai arrests in 2020", "Delhi vs Mumbai 2020", "compare Mumbai and Delhi 2020",
+    "Mumbai versus Delhi arrests 2020", "compare Delhi and Mumbai 2016 2020", "Delhi vs Mumbai 2016 and 2020",
+    "Top 5 cities by arrests in 2020", "top 5 cities 2020", "show the top 5 cities in 2020",
+    "Top 10 cities 2019", "top 10 cities by arrests 2019", "top 3 female cities 2019",
+    "top 3 cities for women 2019", "highest arrests 2019", "which city has the highest arrests in 2019",
+    "lowest arrests 2020", "city with the lowest arrests 2020", "minimum arrests 2020",
+    "Show me the trend for Bangalore from 2016 to 2020", "Bangalore trend", "Bengaluru trend",
+    "Delhi trend", "delhi arrest trend", "arrest trend female", "female arrest trend", "women arrest trend",
+    "male female ratio 2020", "gender ratio 2020", "male to female ratio 2020",
+    "juvenile arrests 2020", "juveniles 2020", "juvenile girls Delhi 2019", "Delhi juvenile girls 2019",
+    "top juvenile cities 2020", "male arrests 2020", "men arrested 2020", "arrests 2019", "total arrests 2019",
+    "Kolkata male 2016", "Kolkata men 2016", "Indore arrests 2016", "Pune arrests 2020",
+]
+
+
+def strip(response):
+    response = dict(response)
+    response.pop("response_time", None)
+    response.pop("cached", None)
+    return response
+
+
+def extraction_key(message):
+    """The previous cache key: extraction fields only"""
+    structured = extract_query(message) or {}
+    key_data = {
+        'cities': sorted(structured.get('cities', [])),
+        'years': sorted(structured.get('years', [])),
+        'gender': structured.get('gender', ''),
+        'intent': structured.get('intent', ''),
+        'crime': structured.get('crime', '')
+    }
+    return hashlib.md5(str(sorted(key_data.items())).encode()).hexdigest()
+
+
+def ask(client, message):
+    start = time.perf_counter()
+    body = client.post("/chat", json={"message": message}).get_json()
+    return body, (time.perf_counter() - start) * 1000
+
+
+def main():
+    corpus = CORPUS
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as fh:
+            corpus = [line.strip() for line in fh if line.strip()]
+
+    # Replay: every question three times, shuffled
+    replay = corpus * 3
+    random.Random(7).shuffle(replay)
+    client = app.test_client()
+
+    # Ground truth: each distinct message answered with an empty cache
+    truth = {}
+    for message in corpus:
+        chatbot_cache.clear()
+        message_cache.clear()
+        truth[message] = strip(ask(client, message)[0])
+
+    # Old key, simulated on the same replay
+    seen, old_hits, old_wrong = {}, 0, 0
+    for message in replay:
+        key = extraction_key(message)
+        if key in seen:
+            old_hits += 1
+            old_wrong += seen[key] != truth[message]
+        elif truth[message].get("type") not in ("error", "fallback", "clarification", "greeting"):
+            seen[key] = truth[message]
+
+    # Plan key, through the live caches. Tier 1 (normalized message) is
+    # checked first, so the plan tier only sees new wordings
+    chatbot_cache.clear()
+    message_cache.clear()
+    before = chatbot_cache.stats()['hits'], message_cache.stats()['hits']
+    plan_wrong, hit_ms, miss_ms = 0, [], []
+    for message in replay:
+        body, ms = ask(client, message)
+        (hit_ms if body.get("cached") else miss_ms).append(ms)
+        plan_wrong += strip(body) != truth[message]
+    after = chatbot_cache.stats()
+    plan_hits = after["hits"] - before[0]
+    message_hits = message_cache.stats()["hits"] - before[1]
+    total_hits = plan_hits + message_hits
+
+    n = len(replay)
+    print(f"Replayed {n} queries ({len(corpus)} distinct)")
+    print(f"{'key':<18}{'hit rate':>10}{'wrong hits':>12}{'correct hit rate':>18}")
+    print(f"{'extraction fields':<18}{old_hits / n:>10.1%}{old_wrong:>12}{(old_hits - old_wrong) / n:>18.1%}")
+    print(f"{'message + plan':<18}{total_hits / n:>10.1%}{plan_wrong:>12}{(total_hits - plan_wrong) / n:>18.1%}")
+    print(f"  message tier {message_hits} hits, plan tier {plan_hits} hits")
+    print(f"Distinct plans cached: {after['entries']}")
+    if hit_ms and miss_ms:
+        print(f"Latency: hit {sum(hit_ms) / len(hit_ms):.2f} ms, miss {sum(miss_ms) / len(miss_ms):.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Compression benchmark: payload size and CPU cost per endpoint for the
+JSON responses compressed by services/compression.
+
+For each endpoint: identity size, size per encoding, the time to compress
+one response (paid on every request without an ETag, and once per ETag
+otherwise) and the time of a request served from the compressed cache.
+
+Runs offline. Run from the project root:
+    python benchmark_compression.py [repeats]
+"""
+import os
+import sys
+import time
+
+# Never call the LLM while benchmarking
+os.environ["FAST_PATH_MIN_CONFIDENCE"] = "0"
+os.environ["LLM_INSIGHTS"] = "off"
+
+from app import app
+from services.compression import LEVELS, brotli, compress, compressed_cache
+from services.cache_manager import chatbot_cache, message_cache
+
+ENDPOINTS = [
+    ("GET", "/api/gov-data", None),
+    ("GET", "/api/gov-data?format=columnar", None),
+    ("GET", "/api/foreigner-data", None),
+    ("GET", "/api/juvenile-cities?year=2020", None),
+    ("GET", "/api/year-gender-city?year=2020&gender=male", None),
+    ("POST", "/chat", {"message": "2019"}),
+]
+
+
+def timed(fn, repeats):
+    """Mean wall and CPU milliseconds of fn()"""
+    wall, cpu = time.perf_counter(), time.process_time()
+    for _ in range(repeats):
+        fn()
+    return ((time.perf_counter() - wall) * 1000 / repeats,
+            (time.process_time() - cpu) * 1000 / repeats)
+
+
+def fetch(client, method, url, body, encoding="identity"):
+    headers = {"Accept-Encoding": encoding}
+    if method == "POST":
+        return client.post(url, json=body, headers=headers)
+    return client.get(url, headers=headers)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    client = app.test_client()
+    encodings = ["gzip"] + (["br"] if brotli else [])
+
+    print(f"{'endpoint':<46}{'identity':>10}" + "".join(f"{e:>9}{'ratio':>7}" for e in encodings))
+    rows = []
+    for method, url, body in ENDPOINTS:
+        chatbot_cache.clear()
+        message_cache.clear()
+        data = fetch(client, method, url, body).get_data()
+        label = url if body is None else f"{url} {body['message']!r}"
+        sizes = [len(compress(data, e, LEVELS[e]["dynamic"])) for e in encodings]
+        print(f"{label:<46}{len(data):>10}"
+              + "".join(f"{size:>9}{size / len(data):>7.0%}" for size in sizes))
+        rows.append((label, method, url, body, data))
+
+    print(f"\nCPU per response, ms (mean of {repeats})")
+    print(f"{'endpoint':<46}{'request':>9}"
+          + "".join(f"{e + ' dyn':>10}{e + ' max':>10}" for e in encodings) + f"{'cached req':>12}")
+    for label, method, url, body, data in rows:
+        _, request_cpu = timed(lambda: fetch(client, method, url, body), repeats)
+        costs = []
+        for e in encodings:
+            for level in ("dynamic", "cached"):
+                costs.append(timed(lambda: compress(data, e, LEVELS[e][level]), repeats)[1])
+
+        # A warm compressed cache: only data API responses carry an ETag
+        compressed_cache.clear()
+        fetch(client, method, url, body, "gzip")
+        _, cached_cpu = timed(lambda: fetch(client, method, url, body, "gzip"), repeats)
+        hit = compressed_cache.stats()["hits"] > 0
+        print(f"{label:<46}{request_cpu:>9.2f}" + "".join(f"{cost:>10.3f}" for cost in costs)
+              + f"{cached_cpu:>11.2f}{'*' if hit else ' '}")
+
+    print("\n* served from the compressed cache (compression paid once per ETag)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark: boot time and memory per gunicorn worker,
+with and without preloading the app (and its data) in the master.
+
+Both runs use gunicorn.conf.py (same worker class, threads and workers);
+the "before" run only turns off preload_app and the gc.freeze() pre_fork
+hook, so the difference is the preload alone.
+
+Linux only (reads /proc). Run from the project root:
+    python benchmark_startup.py [workers]
+"""
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+import requests
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def memory_kb(pid):
+    """Rss / Pss / shared pages of a process in kB"""
+    stats = {"Rss": 0, "Pss": 0, "Shared": 0}
+    with open(f"/proc/{pid}/smaps_rollup") as fh:
+        for line in fh:
+            key, _, rest = line.partition(":")
+            value = int(rest.split()[0]) if rest.strip() else 0
+            if key in ("Rss", "Pss"):
+                stats[key] = value
+            elif key in ("Shared_Clean", "Shared_Dirty"):
+                stats["Shared"] += value
+    return stats
+
+
+def children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as fh:
+        return [int(p) for p in fh.read().split()]
+
+
+# gunicorn.conf.py with only the preload switched off
+NO_PRELOAD_CONFIG = """
+exec(open({path!r}).read())
+preload_app = False
+
+def pre_fork(server, worker):
+    pass
+"""
+
+
+def no_preload_config(directory):
+    path = os.path.join(directory, "gunicorn_no_preload.py")
+    with open(path, "w") as fh:
+        fh.write(NO_PRELOAD_CONFIG.format(path=os.path.abspath("gunicorn.conf.py")))
+    return path
+
+
+def run(label, config, workers):
+    port = free_port()
+    cmd = [
+        sys.executable, "-m", "gunicorn", "wsgi:application",
+        "--config", config,
+        "--bind", f"127.0.0.1:{port}",
+        "--workers", str(workers),
+    ]
+
+    start = time.time()
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    try:
+        # Booted = every worker forked and the app answering
+        while time.time() - start < 120:
+            try:
+                if requests.get(f"http://127.0.0.1:{port}/api/health-check", timeout=1).ok \
+                        and len(children(proc.pid)) == workers:
+                    break
+            except requests.exceptions.RequestException:
+                pass
+            time.sleep(0.05)
+        boot_time = time.time() - start
+
+        # Let every worker finish importing before sampling memory
+        time.sleep(2)
+
+        master = memory_kb(proc.pid)
+        worker_stats = [memory_kb(pid) for pid in children(proc.pid)]
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    avg = lambda key: sum(w[key] for w in worker_stats) / len(worker_stats)
+
+    print(f"\n=== {label} ===")
+    print(f"Boot time:            {boot_time:.2f}s")
+    print(f"Master RSS:           {master['Rss'] / 1024:.1f} MB")
+    print(f"Worker RSS (avg):     {avg('Rss') / 1024:.1f} MB")
+    print(f"Worker PSS (avg):     {avg('Pss') / 1024:.1f} MB  (private + fair share of shared pages)")
+    print(f"Worker shared (avg):  {avg('Shared') / 1024:.1f} MB")
+    total_pss = master["Pss"] + sum(w["Pss"] for w in worker_stats)
+    print(f"Total PSS:            {total_pss / 1024:.1f} MB")
+
+    return boot_time, total_pss
+
+
+if __name__ == "__main__":
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+
+    print(f"🚀 Gunicorn startup benchmark ({workers} workers)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        before = run("Before: every worker loads the data", no_preload_config(tmp), workers)
+    after = run("After: preload_app + gc.freeze (gunicorn.conf.py)", "gunicorn.conf.py", workers)
+
+    print("\n" + "=" * 60)
+    print(f"Boot time: {before[0]:.2f}s -> {after[0]:.2f}s")
+    print(f"Total PSS: {before[1] / 1024:.1f} MB -> {after[1] / 1024:.1f} MB")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Offline batch job: precompute the LLM insight for every crime head and
+year of the government and foreigner datasets (services/insight_store).
+
+Only insights whose prompt changed since the last run are sent to Groq,
+so re-running on unchanged CSVs costs nothing. Needs GROQ_API_KEY.
+Run from the project root after deploying new data:
+    python build_insights.py [--force] [--workers N]
+"""
+import argparse
+import sys
+
+from chat.foreign_chat import foreign_crime_question, foreign_crime_stats
+from chat.government_chat import crime_question, crime_stats
+from services.data_loader import foreign_data, gov_data
+from services.insight_generator import fetch_insight, insight_prompt
+from services.insight_store import insight_store
+
+
+def insight_jobs():
+    """(dataset, year, crime head, prompt) for every row of both datasets"""
+    for year, df in gov_data.items():
+        for data in df.fillna(0).to_dict(orient="records"):
+            crime_head = data["Crime Head"]
+            prompt = insight_prompt(crime_question(crime_head, year), crime_stats(data))
+            yield "government", year, crime_head, prompt
+
+    for year, df in foreign_data.items():
+        for _, row in df.iterrows():
+            crime_head = row["Crime Head"]
+            prompt = insight_prompt(foreign_crime_question(crime_head, year), foreign_crime_stats(df, row))
+            yield "foreign", year, crime_head, prompt
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--force", action="store_true", help="regenerate every insight")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent Groq requests")
+    args = parser.parse_args()
+
+    jobs = list(insight_jobs())
+    print(f"📚 {len(jobs)} crime head / year pairs")
+
+    generated, reused, failed = insight_store.build(jobs, fetch_insight, force=args.force, workers=args.workers)
+
+    print(f"✅ {generated} generated, {reused} unchanged, {failed} failed")
+    print(f"💾 {insight_store.path(insight_store.digest)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 from flask import jsonify
 from services.data_loader import crime_data
+from services.city_index import city_index
 
 
 def handle_juvenile(year, city=None, category="total", ranking=None, top_n=3):
@@ -11,7 +12,7 @@ def handle_juvenile(year, city=None, category="total", ranking=None, top_n=3):
             "summary": "Year not available."
         })
 
-    df = crime_data[year].copy()
+    df = crime_data[year]
 
     # Clean dataset
     df = df[df["City"].notna()]
@@ -31,23 +32,20 @@ def handle_juvenile(year, city=None, category="total", ranking=None, top_n=3):
             "summary": "Juvenile column not found."
         })
 
-    df[column] = df[column].fillna(0).astype(int)
+    df = df.assign(**{column: df[column].fillna(0).astype(int)})
 
     # ================= CITY QUERY =================
     if city and not ranking:
         
-        import re
-        # Escape regex special characters
-        city_escaped = re.escape(city)
-        row = df[df["City"].str.contains(city_escaped, case=False, na=False, regex=True)]
+        row = city_index.row(year, city)
 
-        if row.empty:
+        if row is None:
             return jsonify({
                 "type": "error",
                 "summary": "City not found."
             })
 
-        value = int(row.iloc[0][column])
+        value = int(row[column])
 
         return jsonify({
             "type": "city_juvenile",
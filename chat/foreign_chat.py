@@ -1,6 +1,7 @@
 from flask import jsonify
 from services.data_loader import foreign_data
 from services.response_formatter import format_number
+from services.insight_store import insight_store
 
 def handle_foreign_chat(intent, years, structured):
     """Enhanced foreign crime chat handler with comprehensive data analysis"""
@@ -20,7 +21,7 @@ def handle_foreign_chat(intent, years, structured):
             ]
         })
 
-    df = foreign_data[year].copy()
+    df = foreign_data[year]
     
     # Check if user wants specific crime type
     crime_query = structured.get("crime", "").lower()
@@ -53,7 +54,7 @@ def handle_foreign_chat(intent, years, structured):
 
 def handle_foreign_summary(year, structured):
     """Provide comprehensive foreign crime summary"""
-    df = foreign_data[year].copy()
+    df = foreign_data[year]
     
     # Filter out total/summary rows that are not actual crimes
     total_keywords = ["total", "total (a)", "total (b)", "total (a+b)"]
@@ -99,7 +100,7 @@ def handle_foreign_summary(year, structured):
 
 def handle_foreign_victim_comparison(year, structured):
     """Compare crimes against tourists vs other foreigners"""
-    df = foreign_data[year].copy()
+    df = foreign_data[year]
     
     # Filter out total/summary rows that are not actual crimes
     total_keywords = ["total", "total (a)", "total (b)", "total (a+b)"]
@@ -159,9 +160,36 @@ def handle_foreign_victim_comparison(year, structured):
     })
 
 
+def foreign_crime_stats(df, crime_data):
+    """Case counts and victim split of one foreign Crime Head row"""
+    crime_name = crime_data["Crime Head"]
+    
+    tourist_col = "Cases of Crimes Committed against - Foreign Tourists"
+    other_col = "Cases of Crimes Committed against - Other Foreigners" if "Cases of Crimes Committed against - Other Foreigners" in df.columns else "Cases of Crimes Committed against - Other  Foreigners"
+    total_col = "Cases of Crimes Committed against - Total Foreigners"
+    
+    tourist_cases = int(crime_data[tourist_col])
+    other_cases = int(crime_data[other_col])
+    total_cases = int(crime_data[total_col])
+    
+    return {
+        "Crime Type": crime_name,
+        "Total Cases": total_cases,
+        "Foreign Tourist Cases": tourist_cases,
+        "Other Foreigner Cases": other_cases,
+        "Tourist Percentage": f"{(tourist_cases/total_cases*100):.1f}%" if total_cases > 0 else "0%",
+        "Other Percentage": f"{(other_cases/total_cases*100):.1f}%" if total_cases > 0 else "0%"
+    }
+
+
+def foreign_crime_question(crime_head, year):
+    """Question the precomputed insight for a foreign crime head answers"""
+    return f"How many cases of {crime_head} were committed against foreigners in {year}?"
+
+
 def handle_specific_foreign_crime(year, crime_query, structured):
     """Handle queries about specific crimes against foreigners"""
-    df = foreign_data[year].copy()
+    df = foreign_data[year]
     
     # Find matching crime
     matching_crimes = df[df["Crime Head"].str.contains(crime_query, case=False, na=False)]
@@ -179,22 +207,10 @@ def handle_specific_foreign_crime(year, crime_query, structured):
     crime_data = matching_crimes.iloc[0]
     crime_name = crime_data["Crime Head"]
     
-    tourist_col = "Cases of Crimes Committed against - Foreign Tourists"
-    other_col = "Cases of Crimes Committed against - Other Foreigners" if "Cases of Crimes Committed against - Other Foreigners" in df.columns else "Cases of Crimes Committed against - Other  Foreigners"
-    total_col = "Cases of Crimes Committed against - Total Foreigners"
-    
-    tourist_cases = int(crime_data[tourist_col])
-    other_cases = int(crime_data[other_col])
-    total_cases = int(crime_data[total_col])
-    
-    response_data = {
-        "Crime Type": crime_name,
-        "Total Cases": total_cases,
-        "Foreign Tourist Cases": tourist_cases,
-        "Other Foreigner Cases": other_cases,
-        "Tourist Percentage": f"{(tourist_cases/total_cases*100):.1f}%" if total_cases > 0 else "0%",
-        "Other Percentage": f"{(other_cases/total_cases*100):.1f}%" if total_cases > 0 else "0%"
-    }
+    response_data = foreign_crime_stats(df, crime_data)
+    tourist_cases = response_data["Foreign Tourist Cases"]
+    other_cases = response_data["Other Foreigner Cases"]
+    total_cases = response_data["Total Cases"]
     
     # Generate insight
     insight = f"In {year}, {format_number(total_cases)} cases of {crime_name.lower()} were reported against foreigners. "
@@ -205,6 +221,9 @@ def handle_specific_foreign_crime(year, crime_query, structured):
     else:
         insight += f"Both foreign tourists and other foreigners were equally affected ({format_number(tourist_cases)} cases each)."
     
+    # Precomputed LLM insight (build_insights.py) when there is one
+    insight = insight_store.get("foreign", year, crime_name) or insight
+    
     return jsonify({
         "type": "foreign_crime_specific",
         "title": f"{crime_name} Against Foreigners - {year}",
@@ -222,7 +241,7 @@ def handle_foreign_trend_analysis(years, structured):
     
     for year in years:
         if year in foreign_data:
-            df = foreign_data[year].copy()
+            df = foreign_data[year]
             
             # Filter out total/summary rows that are not actual crimes
             total_keywords = ["total", "total (a)", "total (b)", "total (a+b)"]
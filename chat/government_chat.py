@@ -1,6 +1,8 @@
 from flask import jsonify
 from services.data_loader import gov_data
 from services.insight_generator import generate_insight
+from services.insight_engine import crime_insight
+from services.insight_store import insight_store
 import pandas as pd
 
 
@@ -9,8 +11,7 @@ def get_crime_suggestions(year):
     if year not in gov_data:
         return []
     
-    df = gov_data[year].copy()
-    df.columns = df.columns.str.strip()
+    df = gov_data[year]
     
     # Get all unique crimes
     all_crimes = df["Crime Head"].dropna().unique().tolist()
@@ -19,6 +20,24 @@ def get_crime_suggestions(year):
     return sorted(all_crimes)
 
 
+def crime_stats(data):
+    """Non-zero statistics of a Crime Head row (numbers as ints)"""
+    key_stats = {}
+    for key, value in data.items():
+        if key != "Crime Head" and value != 0:
+            # Convert to int if numeric
+            try:
+                key_stats[key] = int(value) if isinstance(value, (int, float)) else value
+            except:
+                key_stats[key] = value
+    return key_stats
+
+
+def crime_question(crime_head, year):
+    """Question the LLM insight for a crime head answers"""
+    return f"What are the statistics for {crime_head} in {year}?"
+
+
 def handle_government_chat(intent, years, structured):
 
     year = str(years[0]) if years else list(gov_data.keys())[-1]
@@ -34,8 +53,7 @@ def handle_government_chat(intent, years, structured):
         
         if suggestions:
             # Check if this is 2016 (broad categories) or 2019/2020 (detailed crimes)
-            df = gov_data[year].copy()
-            df.columns = df.columns.str.strip()
+            df = gov_data[year]
             unique_crimes = len(df['Crime Head'].unique())
             
             if unique_crimes < 50:
@@ -61,8 +79,7 @@ def handle_government_chat(intent, years, structured):
                 "summary": f"Crime data not available for {year}."
             })
 
-    df = gov_data[year].copy()
-    df.columns = df.columns.str.strip()
+    df = gov_data[year]
     
     # Try multiple matching strategies
     crime_row = pd.DataFrame()
@@ -111,33 +128,21 @@ def handle_government_chat(intent, years, structured):
     actual_crime_name = data.get("Crime Head", crime_name)
     
     # Extract key statistics
-    key_stats = {}
-    for key, value in data.items():
-        if key != "Crime Head" and value != 0:
-            # Convert to int if numeric
-            try:
-                key_stats[key] = int(value) if isinstance(value, (int, float)) else value
-            except:
-                key_stats[key] = value
+    key_stats = crime_stats(data)
     
-    # Generate insight
-    insight_text = generate_insight(
-        f"What are the statistics for {actual_crime_name} in {year}?",
-        key_stats
-    )
+    # Precomputed LLM insight (build_insights.py) when there is one
+    insight_text = insight_store.get("government", year, actual_crime_name)
     
-    # If LLM insight fails, generate a basic insight
-    if "unavailable" in insight_text.lower():
-        # Create a basic insight from the data
-        cases_reported = key_stats.get("Cases Reported during the year", 0)
-        chargesheeting_rate = key_stats.get("Charge-Sheeting Rate", 0)
+    if insight_text is None:
+        # Local insight from the Crime Head table; the LLM insight is optional
+        basic_insight = crime_insight(year, actual_crime_name, key_stats)
         
-        if cases_reported and chargesheeting_rate:
-            insight_text = f"In {year}, {cases_reported:,} cases of {actual_crime_name} were reported with a charge-sheeting rate of {chargesheeting_rate}%."
-        elif cases_reported:
-            insight_text = f"In {year}, {cases_reported:,} cases of {actual_crime_name} were reported across India."
-        else:
-            insight_text = f"Detailed statistics for {actual_crime_name} in {year} are available in the data."
+        # Generate insight (deferred when the answer is streamed, see /chat/stream)
+        insight_text = generate_insight(
+            crime_question(actual_crime_name, year),
+            key_stats,
+            fallback=basic_insight
+        )
 
     return jsonify({
         "type": "government",
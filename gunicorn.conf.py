@@ -0,0 +1,25 @@
+"""
+Gunicorn configuration for production deployment
+"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+
+# Requests spend most of their time waiting on Groq; threaded workers keep
+# serving while a request is parked on the network instead of blocking the
+# whole process
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 8))
+timeout = 120
+
+# Load the app (and every CSV in services.data_loader) once in the master,
+# then fork workers that share those pages copy-on-write
+preload_app = True
+
+
+def pre_fork(server, worker):
+    # Move everything loaded so far into the permanent GC generation so the
+    # collector in each worker never touches (and un-shares) those pages
+    gc.freeze()
@@ -0,0 +1,65 @@
+from urllib.parse import urlsplit
+from flask import Blueprint, current_app, jsonify, request
+from werkzeug.exceptions import HTTPException
+
+batch_bp = Blueprint('batch_bp', __name__)
+
+# Blueprints whose GET endpoints may be batched (the read-only data APIs)
+BATCHABLE_BLUEPRINTS = ("crime_bp", "juvenile_bp", "gov_bp", "foreign_bp")
+MAX_BATCH_QUERIES = 20
+
+
+def run_query(adapter, url):
+    """(status, body) of one data API call, run in-process"""
+    parts = urlsplit(url)
+    try:
+        endpoint, view_args = adapter.match(parts.path, method="GET")
+    except HTTPException:
+        return 404, {"error": f"Unknown API: {parts.path}"}
+
+    if endpoint.split(".")[0] not in BATCHABLE_BLUEPRINTS:
+        return 400, {"error": f"Not a batchable API: {parts.path}"}
+
+    with current_app.test_request_context(parts.path, query_string=parts.query):
+        try:
+            rv = current_app.view_functions[endpoint](**view_args)
+            response = current_app.make_response(rv)
+        except HTTPException as e:
+            return e.code, {"error": e.description}
+        except Exception as e:
+            current_app.logger.exception(f"Batch query {url} failed")
+            return 500, {"error": str(e)}
+
+    return response.status_code, response.get_json(silent=True)
+
+
+@batch_bp.route("/api/batch", methods=["GET", "POST"])
+def batch():
+    """
+    Several data API calls in one round trip.
+
+    GET /api/batch?cities=/api/cities?year=all&trend=/api/year-trend
+    (each value URL-encoded), or POST {"queries": {"cities": "...", ...}}.
+    Returns {"results": {key: {"status": ..., "data": ...}}}; identical
+    sub-queries are evaluated once.
+    """
+    if request.method == "POST":
+        queries = (request.get_json(silent=True) or {}).get("queries")
+    else:
+        queries = request.args.to_dict()
+
+    if not isinstance(queries, dict) or not queries:
+        return jsonify({"error": "No queries given"}), 400
+    if len(queries) > MAX_BATCH_QUERIES:
+        return jsonify({"error": f"At most {MAX_BATCH_QUERIES} queries per batch"}), 400
+
+    adapter = current_app.url_map.bind("localhost")
+    results, done = {}, {}
+    for key, url in queries.items():
+        url = str(url)
+        if url not in done:
+            status, data = run_query(adapter, url)
+            done[url] = {"status": status, "data": data}
+        results[key] = done[url]
+
+    return jsonify({"results": results})
@@ -1,7 +1,7 @@
-import pandas as pd
 from flask import Blueprint, jsonify, request
 from services.data_loader import crime_data
-from services.helpers import get_year, find_column, POP_COLUMNS
+from services.crime_cube import crime_cube
+from services.helpers import get_year, AGE_BANDS
 
 
 crime_bp = Blueprint('crime_bp', __name__)
@@ -9,16 +9,10 @@ crime_bp = Blueprint('crime_bp', __name__)
 def get_cities():
     year = get_year(crime_data)
     if year == "all":
-     df = pd.concat(crime_data.values(), ignore_index=True)
+     cities = sorted({c for agg in crime_cube.select("all") for c in agg.cities})
     else:
-     df = crime_data[year].copy()
+     cities = crime_cube.year(year).cities
 
-    df.columns = df.columns.str.strip()
-
-    if "City" not in df.columns:
-        return {"cities": []}
-
-    cities = sorted(df["City"].dropna().unique().tolist())
     return {"cities": cities}
 
 
@@ -27,18 +21,8 @@ def city_profile():
     year = request.args.get("year", "2020")
     city = request.args.get("city", "all")
 
-    # ✅ Correct year handling
-    if year == "all":
-        df = pd.concat(crime_data.values(), ignore_index=True)
-    else:
-        df = crime_data[year].copy()
-
-    df.columns = df.columns.str.strip()
-
-    if city != "all":
-        df = df[df["City"] == city]
-
-    sums = df.sum(numeric_only=True)
+    # ✅ Correct year handling ("all" sums every year in the cube)
+    sums = crime_cube.totals(year, city)
 
     required_cols = [
         "Juveniles Apprehended - Boys",
@@ -75,46 +59,26 @@ def filter_data():
     gender = request.args.get("gender", "all")
 
     # -------- YEAR HANDLING --------
-    if year == "all":
-        df = pd.concat(crime_data.values(), ignore_index=True)
-    else:
-        df = crime_data[year].copy()
-
-    df.columns = df.columns.str.strip()
-
-    # -------- CITY FILTER --------
-    if city != "all":
-        df = df[df["City"].astype(str).str.strip() == city]
+    aggs = crime_cube.select(year)
 
     # -------- TOTAL COLUMN --------
-    total_col = find_column(df, ["Total", "Arrested"])
+    total_col = next((a.total_col for a in aggs if a.total_col), None)
     if not total_col:
         return jsonify({"grand_total": 0, "filtered_total": 0})
 
-    # -------- AGE MAP --------
-    age_map = {
-        "18-30": "18 and above and below 30 years",
-        "30-45": "30 and above and below 45 years",
-        "45-60": "45 and above and below 60 years",
-        "60 years and above": "60 years and above",
-    }
-
     # -------- HELPER: SAFE COLUMN FIND --------
     def find_real_column(target):
-        for c in df.columns:
-            if c.replace(" ", "") == target.replace(" ", ""):
-                return c
-        return None
+        return next((a.column(target) for a in aggs if a.column(target)), None)
 
     # -------- DETERMINE FILTER COLUMN --------
     col = total_col
 
     if age != "all" and gender != "all":
-        target = f"{age_map[age]} - {gender.capitalize()}"
+        target = f"{AGE_BANDS[age]} - {gender.capitalize()}"
         col = find_real_column(target)
 
     elif age != "all":
-        target = f"{age_map[age]} - Total"
+        target = f"{AGE_BANDS[age]} - Total"
         col = find_real_column(target)
 
     elif gender != "all":
@@ -122,15 +86,14 @@ def filter_data():
         col = find_real_column(target)
 
     # -------- COLUMN SAFETY --------
-    if not col or col not in df.columns:
+    if not col:
         return jsonify({"grand_total": 0, "filtered_total": 0})
 
-    # -------- NUMERIC CLEAN --------
-    df[total_col] = pd.to_numeric(df[total_col], errors="coerce").fillna(0)
-    df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
+    # -------- CITY FILTER --------
+    sums = crime_cube.totals(year, city)
 
-    grand_total = int(df[total_col].sum())
-    filtered_total = int(df[col].sum())
+    grand_total = int(sums.get(total_col, 0))
+    filtered_total = int(sums.get(col, 0))
 
     return jsonify({
         "grand_total": grand_total,
@@ -141,20 +104,8 @@ def filter_data():
 @crime_bp.route("/api/year-trend")
 def year_trend():
 
-    result = {}
-
-    for year, df in crime_data.items():
-        df = df.copy()
-        df.columns = df.columns.str.strip()
-        
-        # Filter out "Total" rows to avoid double counting
-        df = df[df["City"].notna()]
-        df = df[~df["City"].str.lower().str.contains("total", na=False)]
-
-        total_col = find_column(df, ["Total", "Arrested"])
-        df[total_col] = pd.to_numeric(df[total_col], errors="coerce").fillna(0)
-
-        result[year] = int(df[total_col].sum())
+    # City rows only (the "Total" rows are excluded when the cube is built)
+    result = {year: crime_cube.city_total(year) for year in crime_cube.years}
 
     return jsonify(result)
 
@@ -162,20 +113,7 @@ def year_trend():
 @crime_bp.route("/api/all-kpis")
 def all_year_kpis():
 
-    totals = {}
-
-    for year, df in crime_data.items():
-        df = df.copy()
-        df.columns = df.columns.str.strip()
-        
-        # Filter out "Total" rows to avoid double counting
-        df = df[df["City"].notna()]
-        df = df[~df["City"].str.lower().str.contains("total", na=False)]
-
-        total_col = find_column(df, ["Total", "Arrested"])
-        df[total_col] = pd.to_numeric(df[total_col], errors="coerce").fillna(0)
-
-        totals[year] = int(df[total_col].sum())
+    totals = {year: crime_cube.city_total(year) for year in crime_cube.years}
 
     total_all = sum(totals.values())
     highest_year = max(totals, key=totals.get)
@@ -190,93 +128,57 @@ def all_year_kpis():
         "average": avg
     })
 
-@crime_bp.route("/api/home-kpis")
-def home_kpis():
-
-    # Use latest year data for population
-    latest_year = max(crime_data.keys())
-    df = crime_data[latest_year].copy()
-    df.columns = df.columns.str.strip()
+def home_kpis_data():
 
-    # ---- Population columns ----
-    pop_total_col  = POP_COLUMNS["total"]
-    pop_male_col   = POP_COLUMNS["male"]
-    pop_female_col = POP_COLUMNS["female"]
-
-    last_row = df.iloc[-1]
-
-    total_population  = int(str(last_row[pop_total_col]).replace(",", "").strip())
-    male_population   = int(str(last_row[pop_male_col]).replace(",", "").strip())
-    female_population = int(str(last_row[pop_female_col]).replace(",", "").strip())
+    # ---- Population (NCRB total row of the latest year) ----
+    population = crime_cube.population
 
     # ---- Total arrests across all years ----
-    total_arrests = 0
-    for year, year_df in crime_data.items():
-        year_df = year_df.copy()
-        year_df.columns = year_df.columns.str.strip()
-        
-        # Filter out "Total" rows to avoid double counting
-        filtered_df = year_df[year_df["City"].notna()]
-        filtered_df = filtered_df[~filtered_df["City"].str.lower().str.contains("total", na=False)]
-        
-        total_col = find_column(year_df, ["Total", "Arrested"])
-        if total_col:
-            year_df[total_col] = pd.to_numeric(year_df[total_col], errors="coerce").fillna(0)
-            year_total = int(filtered_df[total_col].sum())
-            total_arrests += year_total
+    total_arrests = sum(crime_cube.city_total(year) for year in crime_cube.years)
 
-    return jsonify({
-        "total_population": total_population,
-        "male_population": male_population,
-        "female_population": female_population,
+    return {
+        "total_population": population["total"],
+        "male_population": population["male"],
+        "female_population": population["female"],
         "total_arrests": total_arrests
-    })
-
-
-@crime_bp.route("/api/gender-ratio")
-def gender_ratio():
+    }
 
-    year = request.args.get("year", "all")
 
-    # Handle all years
-    if year == "all":
-        df = pd.concat(crime_data.values(), ignore_index=True)
-    else:
-        df = crime_data[year].copy()
+@crime_bp.route("/api/home-kpis")
+def home_kpis():
+    return jsonify(home_kpis_data())
 
-    df.columns = df.columns.str.strip()
 
-    male_col = "Total - Male"
-    female_col = "Total - Female"
+def gender_ratio_data(year="all"):
 
-    df[male_col] = pd.to_numeric(df[male_col], errors="coerce").fillna(0)
-    df[female_col] = pd.to_numeric(df[female_col], errors="coerce").fillna(0)
+    # Handle all years
+    sums = crime_cube.totals(year)
 
-    total_male = int(df[male_col].sum())
-    total_female = int(df[female_col].sum())
+    total_male = int(sums["Total - Male"])
+    total_female = int(sums["Total - Female"])
 
     # Avoid division by zero
     ratio = round(total_male / total_female, 2) if total_female else 0
 
-    return jsonify({
+    return {
         "male": total_male,
         "female": total_female,
         "ratio": ratio
-    })
+    }
+
+
+@crime_bp.route("/api/gender-ratio")
+def gender_ratio():
+    return jsonify(gender_ratio_data(request.args.get("year", "all")))
 
 @crime_bp.route("/api/city-comparison")
 def city_comparison():
     year = request.args.get("year")
 
-    df = crime_data[year].copy()
-    df.columns = df.columns.str.strip()
-
-    total_col = find_column(df, ["Total", "Arrested"])
-    df[total_col] = pd.to_numeric(df[total_col], errors="coerce").fillna(0)
+    agg = crime_cube.year(year)
 
     result = (
-        df.groupby("City")[total_col]
-        .sum()
+        agg.by_city[agg.total_col]
         .sort_values(ascending=False)
         .to_dict()
     )
@@ -289,34 +191,20 @@ def age_gender_trend():
     age = request.args.get("age")
     gender = request.args.get("gender")
 
-    age_map = {
-        "18-30": "18 and above and below 30 years",
-        "30-45": "30 and above and below 45 years",
-        "45-60": "45 and above and below 60 years",
-        "60 years and above": "60 years and above",
-    }
-
-    col_name = f"{age_map[age]} - {gender.capitalize()}"
+    col_name = f"{AGE_BANDS[age]} - {gender.capitalize()}"
 
     result = {}
 
-    for year, df in crime_data.items():
-        df = df.copy()
-        df.columns = df.columns.str.strip()
+    for year, agg in crime_cube.years.items():
 
         # find real column (ignore spacing issues)
-        real_col = None
-        for c in df.columns:
-            if c.replace(" ", "") == col_name.replace(" ", ""):
-                real_col = c
-                break
+        real_col = agg.column(col_name)
 
         if not real_col:
             result[year] = 0
             continue
 
-        df[real_col] = pd.to_numeric(df[real_col], errors="coerce").fillna(0)
-        result[year] = int(df[real_col].sum())
+        result[year] = int(agg.all_rows[real_col])
 
     return jsonify(result)
 
@@ -325,40 +213,11 @@ def gender_city_comparison():
 
     gender = request.args.get("gender", "male").capitalize()
 
-    dfs = []
-    for df in crime_data.values():
-        d = df.copy()
-        d.columns = d.columns.str.strip()
-
-        # ---- CLEAN CITY COLUMN PROPERLY ----
-        d["City"] = (
-            d["City"]
-            .astype(str)
-            .str.strip()
-            .str.lower()
-            .str.replace(" ", "", regex=False)   # remove spaces
-            .str.replace("(", "", regex=False)   # remove brackets
-            .str.replace(")", "", regex=False)
-        )
-
-        # ❗ Remove invalid / total rows
-        d = d[
-            d["City"].notna() &
-            (~d["City"].str.contains("total")) &
-            (d["City"] != "nan") &
-            (d["City"] != "")
-        ]
-
-        dfs.append(d)
-
-    df = pd.concat(dfs, ignore_index=True)
-
+    # Cities are keyed by their normalized label (no spaces/brackets, lower case)
     col = f"Total - {gender}"
-    df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
 
     result = (
-        df.groupby("City")[col]
-        .sum()
+        crime_cube.by_normalized_city[col]
         .sort_values(ascending=False)
         .to_dict()
     )
@@ -369,32 +228,18 @@ def gender_city_comparison():
 def age_trend():
     age = request.args.get("age")
 
-    age_map = {
-        "18-30": "18 and above and below 30 years - Total",
-        "30-45": "30 and above and below 45 years - Total",
-        "45-60": "45 and above and below 60 years - Total",
-        "60 years and above": "60 years and above - Total",
-    }
-
-    col_name = age_map[age]
+    col_name = f"{AGE_BANDS[age]} - Total"
     result = {}
 
-    for year, df in crime_data.items():
-        df = df.copy()
-        df.columns = df.columns.str.strip()
+    for year, agg in crime_cube.years.items():
 
-        real_col = None
-        for c in df.columns:
-            if c.replace(" ", "") == col_name.replace(" ", ""):
-                real_col = c
-                break
+        real_col = agg.column(col_name)
 
         if not real_col:
             result[year] = 0
             continue
 
-        df[real_col] = pd.to_numeric(df[real_col], errors="coerce").fillna(0)
-        result[year] = int(df[real_col].sum())
+        result[year] = int(agg.all_rows[real_col])
 
     return jsonify(result)
 
@@ -403,19 +248,11 @@ def year_gender_city():
     year = request.args.get("year")
     gender = request.args.get("gender").capitalize()
 
-    df = crime_data[year].copy()
-    df.columns = df.columns.str.strip()
-
     col = f"Total - {gender}"
 
-    df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-
-    # remove total row
-    df = df[~df["City"].str.lower().str.contains("total", na=False)]
-
+    # total row is already removed from by_city_clean
     result = (
-        df.groupby("City")[col]
-        .sum()
+        crime_cube.year(year).by_city_clean[col]
         .sort_values(ascending=False)
         .to_dict()
     )
@@ -423,59 +260,41 @@ def year_gender_city():
     return jsonify(result)
 
 
-@crime_bp.route("/api/reports-summary")
-def reports_summary():
-
-    dfs = []
-    for df in crime_data.values():
-        d = df.copy()
-        d.columns = d.columns.str.strip()
-        # Filter out "Total" rows to avoid double counting
-        d = d[d["City"].notna()]
-        d = d[~d["City"].str.lower().str.contains("total", na=False)]
-        dfs.append(d)
+def reports_summary_data():
 
-    df = pd.concat(dfs, ignore_index=True)
-
-    total_col = find_column(df, ["Total", "Arrested"])
-    df[total_col] = pd.to_numeric(df[total_col], errors="coerce").fillna(0)
+    # City rows only, summed over every year
+    sums = crime_cube.city_rows("all")
+    total_col = next(a.total_col for a in crime_cube.years.values() if a.total_col)
 
     # ---------- Total arrests ----------
-    total_arrests = int(df[total_col].sum())
+    total_arrests = int(sums[total_col])
 
     # ---------- Top 10 cities concentration ----------
-    city_sum = (
-        df.groupby("City")[total_col]
-        .sum()
-        .sort_values(ascending=False)
-    )
+    city_sum = crime_cube.by_city_all_years[total_col].sort_values(ascending=False)
 
     top10 = city_sum.head(10).sum()
     concentration = round((top10 / total_arrests) * 100, 2)
 
     # ---------- Juvenile percentage ----------
-    j_col = "Juveniles Apprehended - Total"
-    df[j_col] = pd.to_numeric(df[j_col], errors="coerce").fillna(0)
-    juvenile_total = int(df[j_col].sum())
+    juvenile_total = int(sums["Juveniles Apprehended - Total"])
     juvenile_pct = round((juvenile_total / total_arrests) * 100, 2)
 
     # ---------- Gender ratio ----------
-    male_col = "Total - Male"
-    female_col = "Total - Female"
-
-    df[male_col] = pd.to_numeric(df[male_col], errors="coerce").fillna(0)
-    df[female_col] = pd.to_numeric(df[female_col], errors="coerce").fillna(0)
-
-    male = int(df[male_col].sum())
-    female = int(df[female_col].sum())
+    male = int(sums["Total - Male"])
+    female = int(sums["Total - Female"])
     gender_ratio = round(male / female, 2)
 
-    return jsonify({
+    return {
         "total_arrests": total_arrests,
         "top10_concentration": concentration,
         "juvenile_pct": juvenile_pct,
         "gender_ratio": gender_ratio
-    })
+    }
+
+
+@crime_bp.route("/api/reports-summary")
+def reports_summary():
+    return jsonify(reports_summary_data())
 
 
 @crime_bp.route("/api/year-city-filter")
@@ -485,34 +304,21 @@ def year_city_filter():
     age = request.args.get("age", "all")
     gender = request.args.get("gender", "all")
 
-    df = crime_data[year].copy()
-    df.columns = df.columns.str.strip()
-
-    age_map = {
-        "18-30": "18 and above and below 30 years",
-        "30-45": "30 and above and below 45 years",
-        "45-60": "45 and above and below 60 years",
-        "60 years and above": "60 years and above",
-    }
+    agg = crime_cube.year(year)
 
     # Decide column
     if age != "all" and gender != "all":
-        col = f"{age_map[age]} - {gender.capitalize()}"
+        col = f"{AGE_BANDS[age]} - {gender.capitalize()}"
     elif age != "all":
-        col = f"{age_map[age]} - Total"
+        col = f"{AGE_BANDS[age]} - Total"
     elif gender != "all":
         col = f"Total - {gender.capitalize()}"
     else:
-        col = find_column(df, ["Total", "Arrested"])
-
-    df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-
-    # remove total row
-    df = df[~df["City"].str.lower().str.contains("total", na=False)]
+        col = agg.total_col
 
+    # total row is already removed from by_city_clean
     result = (
-        df.groupby("City")[col]
-        .sum()
+        agg.by_city_clean[col]
         .sort_values(ascending=False)
         .to_dict()
     )
@@ -525,21 +331,12 @@ def gender_ratio_trend():
 
     result = {}
 
-    for year, df in crime_data.items():
-        df = df.copy()
-        df.columns = df.columns.str.strip()
-
-        male_col = "Total - Male"
-        female_col = "Total - Female"
+    for year, agg in crime_cube.years.items():
 
-        df[male_col] = pd.to_numeric(df[male_col], errors="coerce").fillna(0)
-        df[female_col] = pd.to_numeric(df[female_col], errors="coerce").fillna(0)
-
-        male = df[male_col].sum()
-        female = df[female_col].sum()
+        male = agg.all_rows["Total - Male"]
+        female = agg.all_rows["Total - Female"]
 
         ratio = round(male / female, 2) if female else 0
         result[year] = ratio
 
     return jsonify(result)
-
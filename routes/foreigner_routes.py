@@ -1,7 +1,6 @@
-import pandas as pd
 from flask import Blueprint, jsonify, request
-from services.data_loader import foreign_data
-from services.helpers import get_year, find_column
+from services.data_loader import foreign_data, foreign_data_all
+from services.helpers import table_response
 
 foreign_bp = Blueprint('foreign_bp', __name__)
 
@@ -12,11 +11,9 @@ def foreigner_crimes():
     if year not in foreign_data:
         year = "2020"  # fallback
     
-    df = foreign_data[year].copy()
-    df.columns = df.columns.str.strip()
+    df = foreign_data[year]
     
     if "Crime Head" in df.columns:
-        df["Crime Head"] = df["Crime Head"].astype(str).str.strip()
         crimes = sorted(df["Crime Head"].dropna().unique().tolist())
         crimes = [c for c in crimes if c != 'nan' and c != '']
     else:
@@ -31,34 +28,20 @@ def foreigner_data_api():
     crime = request.args.get("crime", "all")
     
     if year == "all":
-        # Combine all years
-        df_list = []
-        for y, data in foreign_data.items():
-            temp_df = data.copy()
-            temp_df['Year'] = y
-            df_list.append(temp_df)
-        df = pd.concat(df_list, ignore_index=True)
+        # All years are combined once at load time
+        df = foreign_data_all
     else:
         if year not in foreign_data:
             year = "2020"  # fallback
-        df = foreign_data[year].copy()
-
-    # Clean column names
-    df.columns = df.columns.str.strip()
+        df = foreign_data[year]
     
     # Filter by crime if specified
     if crime != "all" and "Crime Head" in df.columns:
-        df["Crime Head"] = df["Crime Head"].astype(str).str.strip()
         df = df[df["Crime Head"] == crime]
 
-    # Fill NaN values
-    df = df.fillna("")
-
-    return jsonify({
-        "columns": df.columns.tolist(),
-        "rows": df.to_dict(orient="records"),
-        "total_rows": len(df)
-    })
+    # Paged / projected / columnar as requested (every row by default)
+    payload, status = table_response(df)
+    return jsonify(payload), status
 
 @foreign_bp.route("/api/foreigner-trend")
 def foreigner_trend():
@@ -66,8 +49,6 @@ def foreigner_trend():
     result = {}
 
     for year, df in foreign_data.items():
-        df = df.copy()
-        df.columns = df.columns.str.strip()
 
         # find numeric columns only
         numeric_cols = df.select_dtypes(include="number").columns
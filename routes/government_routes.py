@@ -1,7 +1,6 @@
-import pandas as pd
 from flask import Blueprint, jsonify, request
-from services.data_loader import gov_data
-from services.helpers import get_year, find_column
+from services.data_loader import gov_data, gov_data_all
+from services.helpers import table_response
 
 gov_bp = Blueprint('gov_bp', __name__)
 
@@ -9,49 +8,23 @@ gov_bp = Blueprint('gov_bp', __name__)
 def gov_data_api():
     year = request.args.get("year", "all")
     crime = request.args.get("crime", "all")
-    page = int(request.args.get("page", 1))
-    per_page = int(request.args.get("per_page", 100))
 
     try:
-        # Handle year selection
+        # Handle year selection (all years are combined once at load time)
         if year == "all":
-            # Combine all years
-            df_list = []
-            for y, data in gov_data.items():
-                temp_df = data.copy()
-                temp_df['Year'] = y
-                df_list.append(temp_df)
-            df = pd.concat(df_list, ignore_index=True)
+            df = gov_data_all
         else:
             if year not in gov_data:
                 year = "2020"  # fallback
-            df = gov_data[year].copy()
-
-        # Clean column names
-        df.columns = df.columns.str.strip()
+            df = gov_data[year]
 
         # Filter by crime if specified
         if crime != "all" and "Crime Head" in df.columns:
-            df["Crime Head"] = df["Crime Head"].astype(str).str.strip()
             df = df[df["Crime Head"] == crime]
 
-        total_rows = len(df)
-
-        # Pagination
-        start = (page - 1) * per_page
-        end = start + per_page
-        df_page = df.iloc[start:end]
-
-        # Fill NaN values
-        df_page = df_page.fillna("")
-
-        return jsonify({
-            "columns": df.columns.tolist(),
-            "rows": df_page.to_dict(orient="records"),
-            "total_rows": total_rows,
-            "page": page,
-            "per_page": per_page
-        })
+        # Paged (100 rows by default) / projected / columnar as requested
+        payload, status = table_response(df, default_per_page=100)
+        return jsonify(payload), status
     
     except Exception as e:
         return jsonify({
@@ -59,8 +32,8 @@ def gov_data_api():
             "columns": [],
             "rows": [],
             "total_rows": 0,
-            "page": page,
-            "per_page": per_page
+            "page": request.args.get("page", 1, type=int),
+            "per_page": request.args.get("per_page", 100, type=int)
         }), 500
 
 # GOV CRIMES
@@ -72,11 +45,9 @@ def gov_crimes():
     if year not in gov_data:
         year = "2020"  # fallback
     
-    df = gov_data[year].copy()
-    df.columns = df.columns.str.strip()
+    df = gov_data[year]
     
     if "Crime Head" in df.columns:
-        df["Crime Head"] = df["Crime Head"].astype(str).str.strip()
         crimes = sorted(df["Crime Head"].dropna().unique().tolist())
         crimes = [c for c in crimes if c != 'nan' and c != '']
     else:
@@ -91,8 +62,6 @@ def highest_crime_trend():
     result = {}
 
     for year, df in gov_data.items():
-        df = df.copy()
-        df.columns = df.columns.str.strip()
 
         # remove non numeric columns
         numeric_df = df.select_dtypes(include="number")
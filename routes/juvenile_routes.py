@@ -1,13 +1,10 @@
-import pandas as pd
 from flask import Blueprint, jsonify, request
-from services.data_loader import crime_data
-from services.helpers import get_year, find_column
+from services.data_loader import crime_data, crime_totals
 
 juvenile_bp = Blueprint('juvenile_bp', __name__)
 
-def get_total_row(df):
-    df.columns = df.columns.str.strip()
-    return df.tail(1).iloc[0]   # ← THIS is the truth for your CSV
+def get_total_row(year):
+    return crime_totals[year]   # ← NCRB grand-total row, split out at load time
 
 
 
@@ -16,8 +13,7 @@ def juvenile_kpis():
 
     year = request.args.get("year", "all")
 
-    def extract(df):
-        row = get_total_row(df)
+    def extract(row):
         return (
             int(row["Juveniles Apprehended - Boys"]),
             int(row["Juveniles Apprehended - Girls"]),
@@ -27,15 +23,15 @@ def juvenile_kpis():
     if year == "all":
         boys = girls = total = 0
         for y in crime_data:
-            b, g, t = extract(crime_data[y].copy())
+            b, g, t = extract(get_total_row(y))
             boys += b
             girls += g
             total += t
         return jsonify({"boys": boys, "girls": girls, "total": total})
     else:
-        b, g, t = extract(crime_data[year].copy())
+        b, g, t = extract(get_total_row(year))
         return jsonify({"boys": b, "girls": g, "total": t})
-    
+
 @juvenile_bp.route("/api/juvenile-filter")
 def juvenile_filter():
 
@@ -43,14 +39,13 @@ def juvenile_filter():
     gender = request.args.get("gender", "total").lower()
     city   = request.args.get("city", "all").strip()
 
-    df = crime_data[year].copy()
-    df.columns = df.columns.str.strip()
+    df = crime_data[year]
 
     if city.lower() == "all":
-        row = get_total_row(df)
+        row = get_total_row(year)
     else:
-        city_row = df[df["City"].str.strip().str.lower() == city.lower()]
-        row = city_row.iloc[0] if not city_row.empty else get_total_row(df)
+        city_row = df[df["City"].str.lower() == city.lower()]
+        row = city_row.iloc[0] if not city_row.empty else get_total_row(year)
 
     boys  = int(row["Juveniles Apprehended - Boys"])
     girls = int(row["Juveniles Apprehended - Girls"])
@@ -68,20 +63,11 @@ def juvenile_cities():
 
     year = request.args.get("year", "2020")
 
-    df = crime_data[year].copy()
-    df.columns = df.columns.str.strip()
-
-    df["City"] = df["City"].astype(str).str.strip()
-    df["Juveniles Apprehended - Total"] = pd.to_numeric(
-        df["Juveniles Apprehended - Total"],
-        errors="coerce"
-    )
-
-    # remove last row (grand total row)
-    df = df.iloc[:-1]
+    # grand total row is not part of crime_data
+    df = crime_data[year]
 
     return jsonify({
-        "labels": df["City"].tolist(),
+        "labels": df["City"].astype(str).tolist(),
         "values": df["Juveniles Apprehended - Total"].astype(int).tolist()
     })
 
@@ -91,19 +77,11 @@ def juvenile_trend():
 
     result = {}
 
-    for year, df in crime_data.items():
-        df = df.copy()
-        df.columns = df.columns.str.strip()
+    for year in crime_data:
 
-        # NCRB total row is ALWAYS last row
-        total_row = df.tail(1).iloc[0]
+        # NCRB total row is ALWAYS last row (kept in crime_totals)
+        total_row = get_total_row(year)
 
-        total_value = pd.to_numeric(
-            total_row["Juveniles Apprehended - Total"],
-            errors="coerce"
-        )
-
-        result[year] = int(total_value)
+        result[year] = int(total_row["Juveniles Apprehended - Total"])
 
     return jsonify(result)
-
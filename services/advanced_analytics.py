@@ -4,7 +4,8 @@ Advanced Analytics Module - Complex statistical analysis
 import pandas as pd
 import numpy as np
 from services.data_loader import crime_data, gov_data
-from services.analytics_engine import calculate_city_totals
+from services.analytics_engine import calculate_city_totals, year_city_totals
+from services.city_index import city_index
 
 
 def calculate_statistics(data_dict):
@@ -35,25 +36,16 @@ def get_percentile_rank(city, year, gender=None):
     if year not in crime_data:
         return None
     
-    df = crime_data[year]
-    df = df[df["City"].notna()]
-    df = df[~df["City"].str.lower().str.contains("total", na=False)]
+    city_totals = year_city_totals(year, gender)
     
-    city_totals = []
-    target_value = None
-    
-    for _, row in df.iterrows():
-        total = calculate_city_totals(row.to_dict(), gender)
-        city_totals.append(total)
-        
-        if city.lower() in row["City"].lower():
-            target_value = total
-    
-    if target_value is None:
+    # Last city whose label contains the name
+    matches = city_totals[city_totals.index.str.lower().str.contains(city.lower(), regex=False)]
+    if matches.empty:
         return None
+    target_value = matches.iloc[-1]
     
     # Calculate percentile
-    below = sum(1 for x in city_totals if x < target_value)
+    below = int((city_totals < target_value).sum())
     percentile = (below / len(city_totals)) * 100
     
     return round(percentile, 1)
@@ -64,27 +56,14 @@ def compare_with_average(city, year, gender=None):
     if year not in crime_data:
         return None
     
-    import re
-    df = crime_data[year]
-    df = df[df["City"].notna()]
-    df = df[~df["City"].str.lower().str.contains("total", na=False)]
-    
-    city_totals = []
-    target_value = None
-    
-    # Escape regex special characters
-    city_escaped = re.escape(city)
-    
-    for _, row in df.iterrows():
-        total = calculate_city_totals(row.to_dict(), gender)
-        city_totals.append(total)
-        
-        if re.search(city_escaped, row["City"], re.IGNORECASE):
-            target_value = total
+    city_totals = year_city_totals(year, gender).to_numpy()
     
-    if target_value is None:
+    city_row = city_index.row(year, city)
+    if city_row is None:
         return None
     
+    target_value = calculate_city_totals(city_row, gender)
+    
     avg = np.mean(city_totals)
     diff = target_value - avg
     pct_diff = (diff / avg) * 100 if avg > 0 else 0
@@ -110,19 +89,13 @@ def analyze_gender_gap(city, year):
     if year not in crime_data:
         return None
     
-    import re
-    df = crime_data[year]
-    
-    # Escape regex special characters
-    city_escaped = re.escape(city)
-    row = df[df["City"].str.contains(city_escaped, case=False, na=False, regex=True)]
+    row = city_index.row(year, city)
     
-    if row.empty:
+    if row is None:
         return None
     
-    data = row.iloc[0].to_dict()
-    male_total = calculate_city_totals(data, "male")
-    female_total = calculate_city_totals(data, "female")
+    male_total = calculate_city_totals(row, "male")
+    female_total = calculate_city_totals(row, "female")
     
     if male_total == 0 and female_total == 0:
         return None
@@ -146,16 +119,11 @@ def get_top_cities_by_metric(year, metric="total", gender=None, top_n=10):
     if year not in crime_data:
         return None
     
-    df = crime_data[year]
-    df = df[df["City"].notna()]
-    df = df[~df["City"].str.lower().str.contains("total", na=False)]
-    
-    city_data = []
-    
-    for _, row in df.iterrows():
-        city = row["City"]
-        total = calculate_city_totals(row.to_dict(), gender)
-        city_data.append({"city": city, "value": int(total)})
+    totals = year_city_totals(year, gender)
+    city_data = [
+        {"city": city, "value": total}
+        for city, total in zip(totals.index, totals.tolist())
+    ]
     
     # Sort by value
     city_data.sort(key=lambda x: x["value"], reverse=True)
@@ -168,24 +136,16 @@ def calculate_correlation(city1, city2, years):
     city1_values = []
     city2_values = []
     
-    import re
-    
     for year in years:
         if year not in crime_data:
             continue
         
-        df = crime_data[year]
-        
-        # Escape regex special characters
-        city1_escaped = re.escape(city1)
-        city2_escaped = re.escape(city2)
-        
-        row1 = df[df["City"].str.contains(city1_escaped, case=False, na=False, regex=True)]
-        row2 = df[df["City"].str.contains(city2_escaped, case=False, na=False, regex=True)]
+        row1 = city_index.row(year, city1)
+        row2 = city_index.row(year, city2)
         
-        if not row1.empty and not row2.empty:
-            val1 = calculate_city_totals(row1.iloc[0].to_dict(), None)
-            val2 = calculate_city_totals(row2.iloc[0].to_dict(), None)
+        if row1 is not None and row2 is not None:
+            val1 = calculate_city_totals(row1, None)
+            val2 = calculate_city_totals(row2, None)
             city1_values.append(val1)
             city2_values.append(val2)
     
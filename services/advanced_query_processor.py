@@ -3,7 +3,8 @@ Advanced Query Processor - Handle complex and natural language queries
 """
 import re
 from services.data_loader import crime_data, gov_data, foreign_data
-from services.analytics_engine import calculate_city_totals
+from services.analytics_engine import calculate_city_totals, year_city_totals
+from services.city_index import city_index
 from services.advanced_analytics import analyze_gender_gap, compare_with_average, get_percentile_rank
 from services.response_formatter import format_number
 
@@ -130,15 +131,7 @@ class AdvancedQueryProcessor:
         
         for year in years:
             if year in crime_data:
-                df = crime_data[year]
-                df = df[df["City"].notna()]
-                df = df[~df["City"].str.lower().str.contains("total", na=False)]
-                
-                total = sum(
-                    calculate_city_totals(row.to_dict(), gender)
-                    for _, row in df.iterrows()
-                )
-                national_data[year] = int(total)
+                national_data[year] = int(year_city_totals(year, gender).sum())
         
         return national_data
     
@@ -148,15 +141,7 @@ class AdvancedQueryProcessor:
         latest_year = sorted(years)[-1] if years else "2020"
         
         if latest_year in crime_data:
-            df = crime_data[latest_year]
-            df = df[df["City"].notna()]
-            df = df[~df["City"].str.lower().str.contains("total", na=False)]
-            
-            city_totals = {}
-            for _, row in df.iterrows():
-                city = row["City"]
-                total = calculate_city_totals(row.to_dict(), gender)
-                city_totals[city] = int(total)
+            city_totals = year_city_totals(latest_year, gender).to_dict()
             
             # Get top 5 cities
             top_cities = sorted(city_totals.items(), key=lambda x: x[1], reverse=True)[:5]
@@ -168,12 +153,9 @@ class AdvancedQueryProcessor:
                 city_data = {}
                 for year in years:
                     if year in crime_data:
-                        df = crime_data[year]
-                        import re
-                        city_escaped = re.escape(city)
-                        row = df[df["City"].str.contains(city_escaped, case=False, na=False, regex=True)]
-                        if not row.empty:
-                            total = calculate_city_totals(row.iloc[0].to_dict(), gender)
+                        row = city_index.row(year, city)
+                        if row is not None:
+                            total = calculate_city_totals(row, gender)
                             city_data[year] = int(total)
                 
                 if city_data:
@@ -196,27 +178,16 @@ class AdvancedQueryProcessor:
             last_year = sorted(years)[-1]
             
             if first_year in crime_data and last_year in crime_data:
-                # Compare first and last year
-                df_first = crime_data[first_year]
-                df_last = crime_data[last_year]
-                
-                # Filter out totals
-                df_first = df_first[df_first["City"].notna()]
-                df_first = df_first[~df_first["City"].str.lower().str.contains("total", na=False)]
-                df_last = df_last[df_last["City"].notna()]
-                df_last = df_last[~df_last["City"].str.lower().str.contains("total", na=False)]
+                # Compare first and last year (totals rows excluded)
+                first_totals = year_city_totals(first_year, gender)
                 
                 city_changes = {}
                 
-                for _, row_first in df_first.iterrows():
-                    city = row_first["City"]
-                    import re
-                    city_escaped = re.escape(city)
-                    row_last = df_last[df_last["City"].str.contains(city_escaped, case=False, na=False, regex=True)]
+                for city, first_val in zip(first_totals.index, first_totals.tolist()):
+                    row_last = city_index.row(last_year, city)
                     
-                    if not row_last.empty:
-                        first_val = calculate_city_totals(row_first.to_dict(), gender)
-                        last_val = calculate_city_totals(row_last.iloc[0].to_dict(), gender)
+                    if row_last is not None:
+                        last_val = calculate_city_totals(row_last, gender)
                         
                         if first_val > 0:
                             change_pct = ((last_val - first_val) / first_val * 100)
@@ -281,12 +252,9 @@ class AdvancedQueryProcessor:
                 city_data = {}
                 for year in years:
                     if year in crime_data:
-                        df = crime_data[year]
-                        import re
-                        city_escaped = re.escape(city)
-                        row = df[df["City"].str.contains(city_escaped, case=False, na=False, regex=True)]
-                        if not row.empty:
-                            total = calculate_city_totals(row.iloc[0].to_dict(), structured.get('gender'))
+                        row = city_index.row(year, city)
+                        if row is not None:
+                            total = calculate_city_totals(row, structured.get('gender'))
                             city_data[year] = int(total)
                 
                 if city_data:
@@ -317,12 +285,9 @@ class AdvancedQueryProcessor:
             
             for year in sorted(years):
                 if year in crime_data:
-                    df = crime_data[year]
-                    import re
-                    city_escaped = re.escape(city)
-                    row = df[df["City"].str.contains(city_escaped, case=False, na=False, regex=True)]
-                    if not row.empty:
-                        total = calculate_city_totals(row.iloc[0].to_dict(), structured.get('gender'))
+                    row = city_index.row(year, city)
+                    if row is not None:
+                        total = calculate_city_totals(row, structured.get('gender'))
                         pattern_data[year] = int(total)
             
             if len(pattern_data) >= 2:
@@ -350,12 +315,9 @@ class AdvancedQueryProcessor:
             
             for year in sorted(years):
                 if year in crime_data:
-                    df = crime_data[year]
-                    import re
-                    city_escaped = re.escape(city)
-                    row = df[df["City"].str.contains(city_escaped, case=False, na=False, regex=True)]
-                    if not row.empty:
-                        total = calculate_city_totals(row.iloc[0].to_dict(), structured.get('gender'))
+                    row = city_index.row(year, city)
+                    if row is not None:
+                        total = calculate_city_totals(row, structured.get('gender'))
                         historical_data[year] = int(total)
             
             if len(historical_data) >= 2:
@@ -384,15 +346,12 @@ class AdvancedQueryProcessor:
             year = years[0] if years else "2020"
             
             if year in crime_data:
-                df = crime_data[year]
                 comparison_data = {}
                 
                 for city in cities[:5]:  # Limit to 5 cities
-                    import re
-                    city_escaped = re.escape(city)
-                    row = df[df["City"].str.contains(city_escaped, case=False, na=False, regex=True)]
-                    if not row.empty:
-                        total = calculate_city_totals(row.iloc[0].to_dict(), structured.get('gender'))
+                    row = city_index.row(year, city)
+                    if row is not None:
+                        total = calculate_city_totals(row, structured.get('gender'))
                         comparison_data[city] = int(total)
                 
                 if len(comparison_data) >= 3:
@@ -417,14 +376,10 @@ class AdvancedQueryProcessor:
         year = years[0] if years else "2020"
         
         if year in crime_data:
-            df = crime_data[year]
-            df = df[df["City"].notna()]
-            df = df[~df["City"].str.lower().str.contains("total", na=False)]
+            totals = year_city_totals(year, gender)
             
             rankings = []
-            for _, row in df.iterrows():
-                city = row["City"]
-                total = calculate_city_totals(row.to_dict(), gender)
+            for city, total in zip(totals.index, totals.tolist()):
                 
                 # Get additional metrics
                 percentile = get_percentile_rank(city, year, gender)
@@ -467,14 +422,7 @@ class AdvancedQueryProcessor:
         
         for year in years:
             if year in crime_data:
-                df = crime_data[year]
-                df = df[df["City"].notna()]
-                df = df[~df["City"].str.lower().str.contains("total", na=False)]
-                
-                totals = []
-                for _, row in df.iterrows():
-                    total = calculate_city_totals(row.to_dict(), gender)
-                    totals.append(total)
+                totals = year_city_totals(year, gender).tolist()
                 
                 if totals:
                     aggregated_data[year] = {
@@ -528,15 +476,7 @@ class AdvancedQueryProcessor:
         year = years[0] if years else "2020"
         
         if year in crime_data:
-            df = crime_data[year]
-            df = df[df["City"].notna()]
-            df = df[~df["City"].str.lower().str.contains("total", na=False)]
-            
-            city_totals = {}
-            for _, row in df.iterrows():
-                city = row["City"]
-                total = calculate_city_totals(row.to_dict(), gender)
-                city_totals[city] = int(total)
+            city_totals = year_city_totals(year, gender).to_dict()
             
             if city_totals:
                 if extreme_type == "highest":
@@ -1,15 +1,41 @@
+from functools import lru_cache
+import pandas as pd
+from services.data_loader import crime_data
+
+# Arrest total column per gender (no / unknown gender -> all persons)
+TOTAL_COLUMNS = {
+    "male": "Total - Male",
+    "female": "Total - Female",
+}
+ALL_PERSONS_COLUMN = "Total - Total Persons Arrested by age and Sex"
+
+
+def totals_column(gender=None):
+    """Column holding the arrest total for a gender"""
+    return TOTAL_COLUMNS.get(gender.lower() if gender else None, ALL_PERSONS_COLUMN)
+
+
 def calculate_city_totals(data, gender=None):
+    """Arrest total of a single row (dict or Series)"""
+    return int(data.get(totals_column(gender), 0))
+
 
-    if gender:
-        gender = gender.lower()
+@lru_cache(maxsize=None)
+def _year_city_totals(year, column):
+    df = crime_data[year]
+    df = df[df["City"].notna()]
+    df = df[~df["City"].str.lower().str.contains("total", na=False)]
 
-    if gender == "male":
-        return int(data.get("Total - Male", 0))
+    if column not in df.columns:
+        values = pd.Series(0, index=df.index, dtype="int64")
+    else:
+        values = df[column].astype("int64")
+    return pd.Series(values.to_numpy(), index=df["City"].to_numpy(), name=column)
 
-    elif gender == "female":
-        return int(data.get("Total - Female", 0))
 
-    # default total
-    return int(
-        data.get("Total - Total Persons Arrested by age and Sex", 0)
-    )
\ No newline at end of file
+def year_city_totals(year, gender=None):
+    """
+    Arrest totals per city for a year, indexed by City in CSV order
+    ("Total" summary rows and blank cities excluded). Treat as read-only.
+    """
+    return _year_city_totals(year, totals_column(gender))
@@ -1,79 +1,383 @@
 """
 Intelligent Cache Manager for Chatbot Performance
 """
+import os
 import time
 import hashlib
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
 from functools import wraps
+from services.chatbot_analytics import chatbot_analytics
 
 
-class ChatbotCache:
-    """Smart caching system for chatbot responses"""
+class CacheBackend(ABC):
+    """
+    Storage for JSON-encoded responses (bytes). Backends own TTL and size limits;
+    ChatbotCache owns keys, (de)serialization and hit/miss counting.
+    """
+    
+    @abstractmethod
+    def get(self, key):
+        """Stored payload (bytes) if present and fresh, else None"""
+    
+    @abstractmethod
+    def set(self, key, payload):
+        pass
+    
+    @abstractmethod
+    def clear(self):
+        pass
     
-    def __init__(self, max_size=1000, ttl=3600):
-        self.cache = {}
-        self.access_times = {}
+    @abstractmethod
+    def stats(self):
+        """entries / bytes / evictions / expirations"""
+
+
+class MemoryBackend(CacheBackend):
+    """Per-process LRU over an OrderedDict guarded by a lock: O(1) get/set/evict"""
+    
+    def __init__(self, max_size=1000, ttl=3600, max_bytes=32 * 1024 * 1024):
+        self.cache = OrderedDict()  # key -> (stored_at, JSON-encoded response)
         self.max_size = max_size
         self.ttl = ttl  # Time to live in seconds
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._lock = threading.RLock()
     
-    def _generate_key(self, query_data):
-        """Generate cache key from query parameters"""
-        # Create a consistent hash from query components
-        key_data = {
-            'cities': sorted(query_data.get('cities', [])),
-            'years': sorted(query_data.get('years', [])),
-            'gender': query_data.get('gender', ''),
-            'intent': query_data.get('intent', ''),
-            'crime': query_data.get('crime', '')
+    def _remove(self, key):
+        _, payload = self.cache.pop(key)
+        self.current_bytes -= len(payload)
+    
+    def get(self, key):
+        with self._lock:
+            entry = self.cache.get(key)
+            if entry is None:
+                return None
+            
+            cached_time, payload = entry
+            
+            # Check if cache is still valid
+            if time.time() - cached_time >= self.ttl:
+                self._remove(key)
+                self.expirations += 1
+                return None
+            
+            self.cache.move_to_end(key)
+            return payload
+    
+    def set(self, key, payload):
+        # A single response larger than the whole budget is not worth keeping
+        if len(payload) > self.max_bytes:
+            return
+        
+        with self._lock:
+            if key in self.cache:
+                self._remove(key)
+            
+            self.cache[key] = (time.time(), payload)
+            self.current_bytes += len(payload)
+            
+            while len(self.cache) > self.max_size or self.current_bytes > self.max_bytes:
+                oldest = next(iter(self.cache))
+                self._remove(oldest)
+                self.evictions += 1
+    
+    def clear(self):
+        with self._lock:
+            self.cache.clear()
+            self.current_bytes = 0
+    
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'memory',
+                'entries': len(self.cache),
+                'bytes': self.current_bytes,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+
+class SQLiteBackend(CacheBackend):
+    """
+    Host-wide LRU in a SQLite file (WAL mode), shared by every gunicorn
+    worker on the machine. Eviction is by last access, bounded by entry
+    count and total payload bytes; expired rows are purged on write.
+    
+    Reads never write: hits and expired rows seen by a worker are buffered
+    and applied in its next write transaction, so hits don't queue for the
+    single WAL writer lock. The LRU order is exact for this worker's reads
+    and approximate for reads by other workers.
+    """
+    
+    def __init__(self, db_path, max_size=5000, ttl=3600, max_bytes=128 * 1024 * 1024,
+                 table="response_cache"):
+        self.db_path = db_path
+        self.table = table
+        self.max_size = max_size
+        self.ttl = ttl  # Time to live in seconds
+        self.max_bytes = max_bytes
+        # Per-process counts; entries/bytes come from the shared table
+        self.evictions = 0
+        self.expirations = 0
+        # key -> last hit time, and expired keys, not yet written back
+        self._touched = {}
+        self._expired = set()
+        self._pending_lock = threading.Lock()
+        self._init_db()
+    
+    def _connect(self):
+        # autocommit; writes open their own IMMEDIATE transaction
+        conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+    
+    def _init_db(self):
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {self.table} (
+                    key TEXT PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    stored_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )""")
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{self.table}_accessed ON {self.table} (accessed_at)"
+            )
+        finally:
+            conn.close()
+    
+    def get(self, key):
+        now = time.time()
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                f"SELECT value, stored_at FROM {self.table} WHERE key = ?", (key,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if row is None:
+            return None
+        
+        payload, stored_at = row
+        with self._pending_lock:
+            if now - stored_at >= self.ttl:
+                if key not in self._expired:
+                    self._expired.add(key)
+                    self.expirations += 1
+                return None
+            
+            # Bounded: past max_size pending hits, further ones are dropped
+            if key in self._touched or len(self._touched) < self.max_size:
+                self._touched[key] = now
+        return payload
+    
+    def _flush_pending(self, conn):
+        """Write back buffered hits and drop expired rows seen by get()"""
+        with self._pending_lock:
+            touched, self._touched = self._touched, {}
+            expired, self._expired = self._expired, set()
+        if touched:
+            conn.executemany(
+                f"UPDATE {self.table} SET accessed_at = MAX(accessed_at, ?) WHERE key = ?",
+                [(at, key) for key, at in touched.items()]
+            )
+        if expired:
+            conn.executemany(
+                f"DELETE FROM {self.table} WHERE key = ? AND stored_at <= ?",
+                [(key, time.time() - self.ttl) for key in expired]
+            )
+    
+    def set(self, key, payload):
+        if len(payload) > self.max_bytes:
+            return
+        
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            self._flush_pending(conn)
+            conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, sqlite3.Binary(payload), len(payload), now, now)
+            )
+            expired = conn.execute(
+                f"DELETE FROM {self.table} WHERE stored_at <= ?", (now - self.ttl,)
+            ).rowcount
+            self.expirations += max(expired, 0)
+            self._evict(conn)
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+    
+    def _evict(self, conn):
+        count, total = conn.execute(
+            f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+        ).fetchone()
+        if count <= self.max_size and total <= self.max_bytes:
+            return
+        
+        # Oldest-accessed first until both limits hold again
+        victims = []
+        for key, size in conn.execute(f"SELECT key, size FROM {self.table} ORDER BY accessed_at"):
+            if count <= self.max_size and total <= self.max_bytes:
+                break
+            victims.append((key,))
+            count -= 1
+            total -= size
+        conn.executemany(f"DELETE FROM {self.table} WHERE key = ?", victims)
+        self.evictions += len(victims)
+    
+    def clear(self):
+        with self._pending_lock:
+            self._touched, self._expired = {}, set()
+        conn = self._connect()
+        try:
+            conn.execute(f"DELETE FROM {self.table}")
+        finally:
+            conn.close()
+    
+    def stats(self):
+        conn = self._connect()
+        try:
+            count, total = conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(size), 0) FROM {self.table}"
+            ).fetchone()
+        finally:
+            conn.close()
+        return {
+            'backend': 'sqlite',
+            'entries': count,
+            'bytes': total,
+            'evictions': self.evictions,
+            'expirations': self.expirations
         }
-        key_string = str(sorted(key_data.items()))
+
+
+class ChatbotCache:
+    """
+    Smart caching system for chatbot responses.
+
+    Responses are stored as JSON, so every hit returns a private copy and
+    backends can bound the cache by bytes as well as by entry count; unlike
+    pickle, a cache file shared between processes can't run code on load. A
+    failing backend degrades to a cache miss, never to a failed request.
+    """
+    
+    def __init__(self, backend=None):
+        self.backend = backend or MemoryBackend()
+        self._lock = threading.Lock()
+        
+        # Counters reported through ChatbotAnalytics
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+    
+    def _generate_key(self, query_data):
+        """Generate cache key from every query parameter (see services.query_plan)"""
+        key_string = json.dumps(query_data, sort_keys=True, default=str)
         return hashlib.md5(key_string.encode()).hexdigest()
     
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+    
     def get(self, query_data):
-        """Get cached response if available and valid"""
+        """Get a copy of the cached response if available and valid"""
         key = self._generate_key(query_data)
         
-        if key in self.cache:
-            cached_time, response = self.cache[key]
-            
-            # Check if cache is still valid
-            if time.time() - cached_time < self.ttl:
-                self.access_times[key] = time.time()
-                return response
-            else:
-                # Remove expired cache
-                del self.cache[key]
-                if key in self.access_times:
-                    del self.access_times[key]
+        try:
+            payload = self.backend.get(key)
+        except sqlite3.Error as e:
+            print(f"Response cache read failed: {e}")
+            self._count('errors')
+            payload = None
+        
+        if payload is None:
+            self._count('misses')
+            return None
         
-        return None
+        try:
+            response = json.loads(payload)
+        except ValueError as e:
+            # Not JSON (e.g. written by an older version): treat as a miss
+            print(f"Response cache entry unreadable: {e}")
+            self._count('errors')
+            self._count('misses')
+            return None
+        
+        self._count('hits')
+        return response
     
     def set(self, query_data, response):
-        """Cache response with automatic cleanup"""
+        """Cache response, evicting least recently used entries when full"""
         key = self._generate_key(query_data)
-        current_time = time.time()
-        
-        # Clean up if cache is full
-        if len(self.cache) >= self.max_size:
-            self._cleanup_old_entries()
+        try:
+            payload = json.dumps(response, separators=(',', ':')).encode()
+        except (TypeError, ValueError) as e:
+            print(f"Response not cacheable: {e}")
+            self._count('errors')
+            return
         
-        self.cache[key] = (current_time, response)
-        self.access_times[key] = current_time
-    
-    def _cleanup_old_entries(self):
-        """Remove least recently used entries"""
-        # Sort by access time and remove oldest 20%
-        sorted_keys = sorted(self.access_times.items(), key=lambda x: x[1])
-        keys_to_remove = [k for k, _ in sorted_keys[:len(sorted_keys)//5]]
+        try:
+            self.backend.set(key, payload)
+        except sqlite3.Error as e:
+            print(f"Response cache write failed: {e}")
+            self._count('errors')
+    
+    def clear(self):
+        self.backend.clear()
+    
+    def stats(self):
+        """Counters for ChatbotAnalytics"""
+        try:
+            stats = self.backend.stats()
+        except sqlite3.Error as e:
+            print(f"Response cache stats failed: {e}")
+            stats = {}
         
-        for key in keys_to_remove:
-            if key in self.cache:
-                del self.cache[key]
-            if key in self.access_times:
-                del self.access_times[key]
+        lookups = self.hits + self.misses
+        stats.update({
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors,
+            'hit_rate': round(self.hits / lookups * 100, 2) if lookups else 0
+        })
+        return stats
+
+
+def create_backend(db_path=None, table="response_cache"):
+    """SQLite backend shared by all workers when db_path is set, else in-process memory"""
+    if db_path:
+        try:
+            return SQLiteBackend(db_path, table=table)
+        except (sqlite3.Error, OSError) as e:
+            print(f"Shared response cache disabled, using memory: {e}")
+    return MemoryBackend()
 
 
-# Global cache instance
-chatbot_cache = ChatbotCache()
+# Global cache instances (set RESPONSE_CACHE_DB to share them between workers):
+# answers by normalized message, checked before extraction, and by query plan
+message_cache = ChatbotCache(create_backend(os.getenv("RESPONSE_CACHE_DB"), table="message_cache"))
+chatbot_cache = ChatbotCache(create_backend(os.getenv("RESPONSE_CACHE_DB"), table="response_cache"))
+chatbot_analytics.register_cache('message', message_cache)
+chatbot_analytics.register_cache('plan', chatbot_cache)
 
 
 def cache_response(func):
@@ -33,6 +33,9 @@ class ChatbotAnalytics:
         
         self.query_patterns = defaultdict(int)
         self.error_patterns = defaultdict(int)
+        
+        # Caches that report their own counters (see register_cache)
+        self.caches = {}
     
     def log_query(self, query, extracted_data, response, response_time, session_id, success=True):
         """Log query metrics"""
@@ -81,6 +84,24 @@ class ChatbotAnalytics:
         else:
             self.metrics['cache_misses'] += 1
     
+    def register_cache(self, name, cache):
+        """Report a cache's stats() (hits/misses/evictions) under a name"""
+        self.caches[name] = cache
+    
+    def get_cache_stats(self):
+        """Counters of every registered cache"""
+        return {name: cache.stats() for name, cache in self.caches.items()}
+    
+    def _cache_hit_rate(self):
+        """Hit rate over logged lookups and every registered cache"""
+        hits = self.metrics['cache_hits']
+        misses = self.metrics['cache_misses']
+        for stats in self.get_cache_stats().values():
+            hits += stats['hits']
+            misses += stats['misses']
+        total = hits + misses
+        return (hits / total * 100) if total > 0 else 0
+    
     def get_performance_summary(self):
         """Get comprehensive performance summary"""
         total_queries = self.metrics['total_queries']
@@ -90,8 +111,7 @@ class ChatbotAnalytics:
         success_rate = (self.metrics['successful_queries'] / total_queries) * 100
         avg_response_time = sum(self.metrics['response_times']) / len(self.metrics['response_times'])
         
-        cache_total = self.metrics['cache_hits'] + self.metrics['cache_misses']
-        cache_hit_rate = (self.metrics['cache_hits'] / cache_total * 100) if cache_total > 0 else 0
+        cache_hit_rate = self._cache_hit_rate()
         
         return {
             'overview': {
@@ -105,6 +125,7 @@ class ChatbotAnalytics:
             'popular_cities': dict(self.metrics['popular_cities'].most_common(5)),
             'popular_years': dict(self.metrics['popular_years'].most_common(3)),
             'common_errors': dict(self.error_patterns.most_common(3)),
+            'cache': self.get_cache_stats(),
             'performance_trends': self._get_performance_trends()
         }
     
@@ -174,8 +195,7 @@ class ChatbotAnalytics:
             })
         
         # Cache performance
-        cache_total = self.metrics['cache_hits'] + self.metrics['cache_misses']
-        cache_hit_rate = (self.metrics['cache_hits'] / cache_total * 100) if cache_total > 0 else 0
+        cache_hit_rate = self._cache_hit_rate()
         if cache_hit_rate < 60:
             recommendations.append({
                 'type': 'caching',
@@ -207,6 +227,7 @@ class ChatbotAnalytics:
             'daily_stats': {k: {**v, 'unique_users': len(v['unique_users'])} for k, v in self.daily_stats.items()},
             'query_patterns': dict(self.query_patterns),
             'error_patterns': dict(self.error_patterns),
+            'caches': self.get_cache_stats(),
             'export_timestamp': datetime.now().isoformat()
         }
         
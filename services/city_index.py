@@ -0,0 +1,76 @@
+"""
+City Index - Load-time lookup from city names to rows of the crime data
+"""
+import re
+from functools import lru_cache
+from services.data_loader import crime_data
+from services.helpers import normalize_city_key
+
+
+def city_aliases(label):
+    """Names a City label answers to: "Indore(Madhya Pradesh)" -> indore, ..."""
+    label = label.strip().lower()
+    base = re.sub(r"\s*\(.*?\)\s*", " ", label).strip()
+    return [label, base, normalize_city_key(label), normalize_city_key(base)]
+
+
+class CityIndex:
+    """
+    City name / alias -> row position in crime_data[year].
+
+    Exact aliases are a dict lookup; any other name falls back to the
+    substring match the handlers always used (case-insensitive, first row
+    wins), memoized per (year, name).
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self._labels = {}
+        self._aliases = {}
+
+        for year, df in data.items():
+            labels = df["City"].tolist() if "City" in df.columns else []
+            self._labels[year] = []
+            self._aliases[year] = {}
+
+            for pos, label in enumerate(labels):
+                # Summary rows are never a city
+                if not isinstance(label, str) or "total" in label.lower():
+                    continue
+                self._labels[year].append((pos, label.lower()))
+                for alias in city_aliases(label):
+                    if alias:
+                        self._aliases[year].setdefault(alias, pos)
+
+    @lru_cache(maxsize=2048)
+    def positions(self, year, city):
+        """Row positions matching a city name (alias hit first, then substring)"""
+        if year not in self._labels or not city:
+            return ()
+
+        name = str(city).strip().lower()
+        aliases = self._aliases[year]
+        for key in (name, normalize_city_key(name)):
+            if key in aliases:
+                return (aliases[key],)
+
+        return tuple(pos for pos, label in self._labels[year] if name in label)
+
+    def position(self, year, city):
+        """First matching row position, or None"""
+        found = self.positions(year, city)
+        return found[0] if found else None
+
+    def contains(self, year, city):
+        return self.position(year, city) is not None
+
+    def row(self, year, city):
+        """First matching row of crime_data[year] as a Series, or None"""
+        pos = self.position(year, city)
+        if pos is None:
+            return None
+        return self.data[year].iloc[pos]
+
+
+# Global index instance
+city_index = CityIndex(crime_data)
@@ -0,0 +1,165 @@
+"""
+Compression - Negotiated gzip / brotli for JSON responses
+
+JSON responses of at least COMPRESS_MIN_SIZE bytes are compressed with the
+best encoding the client accepts (brotli when the package is installed,
+else gzip). Responses carrying a strong ETag (the data APIs, see
+services/http_cache) always have the same body for that ETag, so their
+compressed bytes are kept in a small LRU and the compression cost is paid
+once per representation. Each encoding gets its own ETag ("<etag>-gzip"),
+as a strong validator must differ between encodings.
+"""
+import gzip
+import os
+import threading
+from collections import OrderedDict
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional dependency, gzip only
+    brotli = None
+
+# Smaller bodies don't shrink enough to be worth the CPU
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+COMPRESS_CACHE_BYTES = int(os.getenv("COMPRESS_CACHE_MB", "32")) * 1024 * 1024
+
+COMPRESSIBLE_MIMETYPES = {"application/json"}
+ENCODINGS = ("br", "gzip")
+
+# Per-response compression is kept cheap; cached bodies can afford more
+LEVELS = {
+    "gzip": {"dynamic": 6, "cached": 9},
+    "br": {"dynamic": 4, "cached": 9},
+}
+
+
+def compress(data, encoding, level):
+    if encoding == "br":
+        return brotli.compress(data, quality=level)
+    return gzip.compress(data, compresslevel=level, mtime=0)
+
+
+def accepted_encodings(accept_encodings):
+    """Encodings both the client accepts and this process can produce"""
+    encodings = ENCODINGS if brotli else ("gzip",)
+    return [name for name in encodings if accept_encodings[name]]
+
+
+def choose_encoding(accept_encodings):
+    """Best encoding the client accepts, or None for identity"""
+    encodings = accepted_encodings(accept_encodings)
+    if not encodings:
+        return None
+    return max(encodings, key=lambda name: accept_encodings[name])  # ties keep br first
+
+
+def encoded_etag(etag, encoding):
+    return f"{etag}-{encoding}"
+
+
+class CompressedCache:
+    """Compressed bodies by (ETag, encoding): LRU bounded by total bytes"""
+
+    def __init__(self, max_bytes=COMPRESS_CACHE_BYTES):
+        self.cache = OrderedDict()
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self.cache.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return data
+
+    def set(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        with self._lock:
+            if key in self.cache:
+                return
+            self.cache[key] = data
+            self.current_bytes += len(data)
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self.cache.popitem(last=False)
+                self.current_bytes -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self.cache.clear()
+            self.current_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self.cache),
+                "bytes": self.current_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def compress_response(response):
+    """Compress a JSON response in place when the client accepts it"""
+    etag, weak = response.get_etag()
+
+    # A 304 for an encoded copy must repeat that copy's ETag
+    if response.status_code == 304:
+        response.vary.add("Accept-Encoding")
+        if etag and request.if_none_match:
+            for encoding in accepted_encodings(request.accept_encodings):
+                if request.if_none_match.contains(encoded_etag(etag, encoding)):
+                    response.set_etag(encoded_etag(etag, encoding))
+                    break
+        return response
+
+    if response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    response.vary.add("Accept-Encoding")
+
+    if (
+        response.status_code < 200
+        or response.status_code == 204
+        or response.direct_passthrough
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+        or (response.content_length or 0) < COMPRESS_MIN_SIZE
+    ):
+        return response
+
+    encoding = choose_encoding(request.accept_encodings)
+    if encoding is None:
+        return response
+
+    key = (etag, encoding) if etag and not weak else None
+    data = compressed_cache.get(key) if key else None
+    if data is None:
+        level = LEVELS[encoding]["cached" if key else "dynamic"]
+        data = compress(response.get_data(), encoding, level)
+        if key:
+            compressed_cache.set(key, data)
+
+    response.set_data(data)
+    response.headers["Content-Encoding"] = encoding
+    if etag:
+        response.set_etag(encoded_etag(etag, encoding), weak=weak)
+    return response
+
+
+def init_compression(app):
+    """Compress the app's JSON responses (runs after the blueprints' hooks)"""
+    app.after_request(compress_response)
+
+
+# Global compressed body cache instance
+compressed_cache = CompressedCache()
@@ -0,0 +1,143 @@
+"""
+Crime Aggregate Cube - Load-time aggregates for the city arrest dataset
+"""
+import pandas as pd
+from services.data_loader import crime_data, crime_totals
+from services.helpers import find_column, normalize_city_key, POP_COLUMNS
+
+
+def sum_measures(series_list):
+    """Add up per-measure Series (missing measures count as zero)"""
+    series_list = [s for s in series_list if not s.empty]
+    if not series_list:
+        return pd.Series(dtype=float)
+    if len(series_list) == 1:
+        return series_list[0]
+    return pd.concat(series_list, axis=1).sum(axis=1)
+
+
+class YearAggregates:
+    """Pre-summed arrest measures for a single year"""
+
+    def __init__(self, rows, total):
+        self.columns = rows.columns.tolist()
+        self.total_col = find_column(rows, ["Total", "Arrested"])
+
+        # Space-insensitive column lookup (first match wins, like the routes did)
+        self._column_lookup = {}
+        for col in self.columns:
+            self._column_lookup.setdefault(col.replace(" ", ""), col)
+
+        # Endpoints that have always summed every CSV row keep counting the
+        # NCRB grand-total row, so put it back for the aggregates below
+        df = rows
+        if not total.empty:
+            total_row = total.to_frame().T.astype(rows.dtypes.to_dict())
+            df = pd.concat([rows, total_row], ignore_index=True)
+
+        if "City" not in df.columns:
+            df = df.assign(City=None)
+
+        values = df.drop(columns="City")
+        city = df["City"]
+        is_city = city.notna() & ~city.str.lower().str.contains("total", na=False)
+
+        # Every row, including the NCRB grand-total row
+        self.all_rows = values.sum()
+        # Only real city rows (total/summary rows removed)
+        self.city_rows = values[is_city].sum()
+
+        # Per-label sums
+        self.by_city = values.groupby(city).sum()
+        self.by_city_clean = self.by_city[
+            ~self.by_city.index.str.lower().str.contains("total")
+        ]
+        self.cities = sorted(city.dropna().unique().tolist())
+
+        self.total = total
+
+    def column(self, name):
+        """Resolve a column name ignoring spacing differences"""
+        return self._column_lookup.get(name.replace(" ", ""))
+
+    def city(self, label):
+        """Summed measures for the rows carrying a given City label"""
+        if label in self.by_city.index:
+            return self.by_city.loc[label]
+        return pd.Series(dtype=float)
+
+
+class CrimeCube:
+    """Year x city x age-band x gender aggregates built once at load time"""
+
+    def __init__(self, data, totals):
+        self.years = {
+            year: YearAggregates(df, totals[year]) for year, df in data.items()
+        }
+
+        # Cross-year city sums (reports summary)
+        self.by_city_all_years = self._combine(
+            [agg.by_city_clean for agg in self.years.values()]
+        )
+
+        # Cross-year sums keyed by normalized city label (gender comparison)
+        normalized = []
+        for agg in self.years.values():
+            frame = agg.by_city.rename(index=normalize_city_key)
+            keep = (
+                ~frame.index.str.contains("total") &
+                (frame.index != "nan") &
+                (frame.index != "")
+            )
+            normalized.append(frame[keep])
+        self.by_normalized_city = self._combine(normalized)
+
+        latest = self.years[max(self.years)] if self.years else None
+        self.population = self._population(latest.total) if latest else {}
+
+    @staticmethod
+    def _combine(frames):
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames).groupby(level=0).sum()
+
+    @staticmethod
+    def _population(row):
+        population = {}
+        for key, col in POP_COLUMNS.items():
+            if col in row.index:
+                population[key] = int(row[col])
+        return population
+
+    def year(self, year):
+        """Aggregates for one year (KeyError for unknown years)"""
+        return self.years[year]
+
+    def select(self, year):
+        """Aggregates for one year, or every year when year == 'all'"""
+        if year == "all":
+            return list(self.years.values())
+        return [self.years[year]]
+
+    def totals(self, year, city="all"):
+        """Summed measures over every row, or over the rows of one City label"""
+        return sum_measures([
+            agg.all_rows if city == "all" else agg.city(city)
+            for agg in self.select(year)
+        ])
+
+    def city_rows(self, year):
+        """Summed measures over real city rows only (no total rows)"""
+        return sum_measures([agg.city_rows for agg in self.select(year)])
+
+    def city_total(self, year):
+        """Total arrests across real cities for a year"""
+        agg = self.years[year]
+        if not agg.total_col:
+            return 0
+        return int(agg.city_rows.get(agg.total_col, 0))
+
+
+# Global cube instance
+crime_cube = CrimeCube(crime_data, crime_totals)
@@ -1,4 +1,11 @@
+from types import MappingProxyType
 import pandas as pd
+from services.snapshot_cache import load_snapshot
+
+# The frames loaded below are shared by every request (and, under gunicorn,
+# every worker): handlers filter and slice them but never write into them -
+# derived columns go through .assign() or new Series instead.
+
 
 def load_csv(path):
     try:
@@ -9,23 +16,121 @@ def load_csv(path):
         print(f"Error loading {path}: {e}")
         return pd.DataFrame()
 
-# Crime data by year
-crime_data = {
-    "2016": load_csv("data/crime_data_2016.csv"),
-    "2019": load_csv("data/crime_data_2019.csv"),
-    "2020": load_csv("data/crime_data_2020.csv"),
+
+def to_number(series):
+    """Coerce a column to numbers ("1,234" -> 1234, junk -> NaN)"""
+    if series.dtype == object:
+        series = series.astype(str).str.replace(",", "", regex=False).str.strip()
+    return pd.to_numeric(series, errors="coerce")
+
+
+def strip_labels(df, column):
+    """Strip stray whitespace from a label column (City / Crime Head)"""
+    if column in df.columns and df[column].dtype == object:
+        df[column] = df[column].str.strip()
+    return df
+
+
+def normalize_crime(df):
+    """Strip City labels and type every measure column of a city arrest table"""
+    if df.empty:
+        return df
+
+    df = strip_labels(df.copy(), "City")
+
+    for col in df.columns:
+        if col != "City":
+            df[col] = to_number(df[col]).fillna(0)
+
+    return df
+
+
+def split_total(df):
+    """
+    Split a city arrest table into city rows and the NCRB grand-total row
+    (always the last row of the CSV).
+    """
+    if df.empty:
+        return df, pd.Series(dtype=object)
+    return df.iloc[:-1].reset_index(drop=True), df.iloc[-1]
+
+
+def normalize_table(df, label_column="Crime Head"):
+    """Strip labels and type numeric columns of a Crime Head table"""
+    if df.empty:
+        return df
+
+    df = strip_labels(df.copy(), label_column)
+
+    for col in df.columns:
+        if col == label_column or df[col].dtype != object:
+            continue
+        # Only convert columns where every present value is a number
+        parsed = to_number(df[col])
+        if not parsed[df[col].notna()].isna().any():
+            df[col] = parsed
+
+    return df
+
+
+def combine_years(data):
+    """Stack every year of a dataset into one frame with a Year column"""
+    frames = [df.assign(Year=year) for year, df in data.items() if not df.empty]
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames, ignore_index=True)
+
+
+def _read_crime(path):
+    return normalize_crime(load_csv(path))
+
+
+def _read_table(path):
+    return normalize_table(load_csv(path))
+
+
+# Normalized frames are served from binary snapshots (services/snapshot_cache)
+# while the CSVs are unchanged, so only the first start parses CSV text
+def _load_crime(paths):
+    data, totals = {}, {}
+    for year, path in paths.items():
+        data[year], totals[year] = split_total(load_snapshot(path, _read_crime))
+    return MappingProxyType(data), MappingProxyType(totals)
+
+
+def _load_table(paths):
+    return MappingProxyType({
+        year: load_snapshot(path, _read_table) for year, path in paths.items()
+    })
+
+
+# Source CSVs (their contents version services/insight_store and services/http_cache)
+CRIME_DATA_PATHS = {
+    "2016": "data/crime_data_2016.csv",
+    "2019": "data/crime_data_2019.csv",
+    "2020": "data/crime_data_2020.csv",
+}
+GOV_DATA_PATHS = {
+    "2016": "data/Data by government 2016.csv",
+    "2019": "data/Data by government 2019.csv",
+    "2020": "data/Data by government 2020.csv",
 }
+FOREIGN_DATA_PATHS = {
+    "2016": "data/foreigner_2016.csv",
+    "2019": "data/foreigner_2019.csv",
+    "2020": "data/foreigner_2020.csv",
+}
+
+# Crime data by year (city rows only, numeric, read-only)
+# and the NCRB grand-total row for each year
+crime_data, crime_totals = _load_crime(CRIME_DATA_PATHS)
 
 # Government data by year
-gov_data = {
-    "2016": load_csv("data/Data by government 2016.csv"),
-    "2019": load_csv("data/Data by government 2019.csv"),
-    "2020": load_csv("data/Data by government 2020.csv"),
-}
+gov_data = _load_table(GOV_DATA_PATHS)
 
 # Foreigner crime data by year
-foreign_data = {
-    "2016": load_csv("data/foreigner_2016.csv"),
-    "2019": load_csv("data/foreigner_2019.csv"),
-    "2020": load_csv("data/foreigner_2020.csv"),
-}
\ No newline at end of file
+foreign_data = _load_table(FOREIGN_DATA_PATHS)
+
+# All years stacked (for the year=all table views)
+gov_data_all = combine_years(gov_data)
+foreign_data_all = combine_years(foreign_data)
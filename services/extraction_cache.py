@@ -0,0 +1,102 @@
+"""
+Extraction Cache - Reuse LLM query extractions for repeated questions
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+
+from services.cache_manager import MemoryBackend, SQLiteBackend
+
+
+def normalize_message(message):
+    """Collapse case, spacing and trailing punctuation so near-identical questions share a key"""
+    text = re.sub(r"\s+", " ", str(message).lower()).strip()
+    return text.strip(" ?!.,;:")
+
+
+class ExtractionCache:
+    """
+    Normalized message -> structured extraction: a per-process LRU with a
+    TTL, optionally backed by a SQLite store (the response cache's
+    SQLiteBackend, so the same WAL, TTL purge and size-bounded eviction)
+    that survives restarts and is shared between workers.
+    """
+
+    def __init__(self, max_size=2000, ttl=86400, db_path=None, db_max_size=20000):
+        self.memory = MemoryBackend(max_size=max_size, ttl=ttl)
+        self.store = None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if db_path:
+            try:
+                self.store = SQLiteBackend(db_path, max_size=db_max_size, ttl=ttl, table="extraction_cache")
+                _drop_legacy_table(db_path)
+            except (sqlite3.Error, OSError) as e:
+                print(f"Extraction cache DB disabled: {e}")
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def _load(self, key):
+        if self.store is None:
+            return None
+        try:
+            return self.store.get(key)
+        except sqlite3.Error as e:
+            print(f"Extraction cache read failed: {e}")
+            return None
+
+    def get(self, message):
+        """Cached extraction for a message (a fresh copy), or None"""
+        key = normalize_message(message)
+
+        payload = self.memory.get(key)
+        if payload is None:
+            payload = self._load(key)
+            if payload is not None:
+                self.memory.set(key, payload)
+
+        if payload is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return json.loads(payload)
+
+    def set(self, message, structured):
+        """Cache a successful extraction"""
+        key = normalize_message(message)
+        payload = json.dumps(structured).encode()
+
+        self.memory.set(key, payload)
+        if self.store is not None:
+            try:
+                self.store.set(key, payload)
+            except sqlite3.Error as e:
+                print(f"Extraction cache write failed: {e}")
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "entries": self.memory.stats()["entries"],
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total * 100, 2) if total else 0
+        }
+
+
+def _drop_legacy_table(db_path):
+    """The first version kept every extraction forever in llm_extractions"""
+    conn = sqlite3.connect(db_path, timeout=5, isolation_level=None)
+    try:
+        conn.execute("DROP TABLE IF EXISTS llm_extractions")
+    finally:
+        conn.close()
+
+
+# Global extraction cache (set EXTRACTION_CACHE_DB to persist to SQLite)
+extraction_cache = ExtractionCache(db_path=os.getenv("EXTRACTION_CACHE_DB"))
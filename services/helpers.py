@@ -18,9 +18,104 @@ def find_column(df, keywords):
     return None
 
 
+def table_response(df, default_per_page=None, max_per_page=1000):
+    """
+    Paged JSON body for the table APIs, as (payload, status).
+
+    Query args: page and per_page (every row when neither per_page nor a
+    default is given), fields=col1,col2 to return only some columns, and
+    format=records (a dict per row, the default) or format=columnar (the
+    column list once, then one value array per row).
+    """
+    page = max(request.args.get("page", 1, type=int), 1)
+    per_page = request.args.get("per_page", default_per_page, type=int)
+    if per_page is not None:
+        per_page = min(max(per_page, 1), max_per_page)
+    fmt = request.args.get("format", "records")
+
+    fields = [f.strip() for f in request.args.get("fields", "").split(",") if f.strip()]
+    unknown = [f for f in fields if f not in df.columns]
+    if unknown:
+        return {
+            "error": f"Unknown fields: {', '.join(unknown)}",
+            "available_fields": df.columns.tolist()
+        }, 400
+    if fmt not in ("records", "columnar"):
+        return {"error": f"Unknown format: {fmt} (use records or columnar)"}, 400
+
+    if fields:
+        df = df[fields]
+    total_rows = len(df)
+
+    # Slice before filling NaN so only the returned rows are touched
+    if per_page is not None:
+        start = (page - 1) * per_page
+        df = df.iloc[start:start + per_page]
+    df = df.fillna("")
+
+    payload = {
+        "columns": df.columns.tolist(),
+        "total_rows": total_rows,
+        "format": fmt,
+        "rows": df.values.tolist() if fmt == "columnar" else df.to_dict(orient="records")
+    }
+    if per_page is not None:
+        payload["page"] = page
+        payload["per_page"] = per_page
+    return payload, 200
+
+
+def normalize_city_key(city):
+    """Collapse a City label to a spacing/bracket-insensitive key"""
+    return (
+        str(city).strip().lower()
+        .replace(" ", "")
+        .replace("(", "")
+        .replace(")", "")
+    )
+
+
 # Population column mappings
 POP_COLUMNS = {
     "total": "Total Population",
     "male": "Male Population",
     "female": "Female Population"
 }
+
+# Age band mappings (dashboard filter value -> NCRB column prefix)
+AGE_BANDS = {
+    "18-30": "18 and above and below 30 years",
+    "30-45": "30 and above and below 45 years",
+    "45-60": "45 and above and below 60 years",
+    "60 years and above": "60 years and above",
+}
+
+# Crime heads the chatbot recognizes (government dataset, lower case)
+VALID_CRIMES = [
+    "murder","culpable homicide not amounting to murder","causing death by negligence",
+    "dowry deaths","abetment of suicide","attempt to commit murder",
+    "attempt to commit culpable homicide","attempt to commit suicide",
+    "hurt","grievous hurt","acid attack","attempt to acid attack",
+    "wrongful restraint/confinement","assault on women with intent to outrage her modesty",
+    "sexual harassment","assault or use of criminal force on women with intent to disrobe",
+    "voyeurism","stalking","kidnapping and abduction","kidnapping for ransom",
+    "procuration of minor girls","importation of girls from foreign country",
+    "human trafficking","rape","attempt to commit rape","unnatural offences",
+    "offences against state","sedition","unlawful assembly","riots",
+    "offences promoting enmity between different groups","affray",
+    "theft","auto/motor vehicle theft","other thefts","burglary",
+    "extortion & blackmailing","robbery","dacoity",
+    "criminal misappropriation","criminal breach of trust",
+    "dishonestly receiving/dealing-in stolen property",
+    "counterfeiting","counterfeit currency & bank notes",
+    "forgery, cheating & fraud","fraud","other cheating","other forgery",
+    "offences relating to elections",
+    "disobedience to order duly promulgated by public servant",
+    "harbouring an offender","rash driving on public way",
+    "sale of obscene books/objects","obscene acts and songs at public places",
+    "offences relating to religion","cheating by impersonation",
+    "offences related to mischief","arson","criminal trespass",
+    "cruelty by husband or his relatives","circulate false/fake news/rumours",
+    "criminal intimidation","insult to the modesty of women",
+    "other ipc crimes","total cognizable ipc crimes"
+]
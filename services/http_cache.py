@@ -0,0 +1,95 @@
+"""
+HTTP Cache - ETag / Last-Modified revalidation for the read-only data APIs
+
+The dashboard APIs answer from the CSV data and the query string alone, so
+their ETag is derived from those two (plus API_CACHE_VERSION) without
+building the body. A request whose If-None-Match / If-Modified-Since still
+matches gets a 304 before the view runs.
+"""
+import hashlib
+import os
+from datetime import datetime, timezone
+
+from flask import Response, request
+
+from services.compression import accepted_encodings, encoded_etag
+from services.data_loader import CRIME_DATA_PATHS, FOREIGN_DATA_PATHS, GOV_DATA_PATHS
+from services.snapshot_cache import sources_hash
+
+# Bump when a data API's response format changes without a CSV change
+API_CACHE_VERSION = 1
+
+# How long browsers / CDNs may reuse a data response before revalidating
+API_CACHE_MAX_AGE = int(os.getenv("API_CACHE_MAX_AGE", "3600"))
+
+DATA_SOURCES = {
+    "crime": CRIME_DATA_PATHS,
+    "government": GOV_DATA_PATHS,
+    "foreign": FOREIGN_DATA_PATHS,
+}
+
+
+def _last_modified(sources):
+    mtimes = [
+        os.path.getmtime(path)
+        for paths in sources.values() for path in paths.values()
+        if os.path.exists(path)
+    ]
+    if not mtimes:
+        return None
+    return datetime.fromtimestamp(int(max(mtimes)), tz=timezone.utc)
+
+
+# Fixed for the life of the process: the data is loaded once at startup
+DATA_VERSION = sources_hash(DATA_SOURCES, salt=f"api-v{API_CACHE_VERSION}")
+DATA_MODIFIED = _last_modified(DATA_SOURCES)
+
+
+def request_etag():
+    """Strong ETag for the current request: data version + path + query args"""
+    # Argument order doesn't matter, the order of repeated values does
+    args = sorted(request.args.items(multi=True), key=lambda item: item[0])
+    query = "&".join(f"{key}={value}" for key, value in args)
+    return hashlib.sha1(f"{DATA_VERSION}|{request.path}|{query}".encode()).hexdigest()[:20]
+
+
+def is_not_modified(etag):
+    """Whether the client's cached copy is current (If-None-Match wins)"""
+    if request.if_none_match:
+        # A compressed copy carries its own ETag (services/compression),
+        # current only for a client that can still decode it
+        encodings = accepted_encodings(request.accept_encodings)
+        tags = [etag] + [encoded_etag(etag, encoding) for encoding in encodings]
+        return any(request.if_none_match.contains(tag) for tag in tags)
+    since = request.if_modified_since
+    return since is not None and DATA_MODIFIED is not None and since >= DATA_MODIFIED
+
+
+def add_cache_headers(response, etag):
+    response.set_etag(etag)
+    if DATA_MODIFIED is not None:
+        response.last_modified = DATA_MODIFIED
+    response.cache_control.public = True
+    response.cache_control.max_age = API_CACHE_MAX_AGE
+    return response
+
+
+def enable_http_cache(blueprint):
+    """Revalidation for every GET route of a blueprint of read-only data APIs"""
+
+    @blueprint.before_request
+    def answer_not_modified():
+        if request.method not in ("GET", "HEAD"):
+            return None
+        etag = request_etag()
+        if is_not_modified(etag):
+            return add_cache_headers(Response(status=304), etag)
+        return None
+
+    @blueprint.after_request
+    def add_validators(response):
+        if request.method in ("GET", "HEAD") and response.status_code == 200:
+            add_cache_headers(response, request_etag())
+        return response
+
+    return blueprint
@@ -0,0 +1,79 @@
+"""
+HTTP Client - Pooled keep-alive session for outbound API calls (Groq)
+"""
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# (connect, read) seconds; a slow completion is not retried, a refused /
+# throttled one is, within the retry budget below
+DEFAULT_TIMEOUT = (3.05, 10)
+
+
+class HttpClient:
+    """Shared requests session with connection pooling, timeouts and retry/backoff"""
+
+    def __init__(self, pool_size=10, retries=2, backoff=0.3,
+                 retry_statuses=(429, 500, 502, 503, 504), timeout=DEFAULT_TIMEOUT):
+        self.pool_size = pool_size
+        self.retries = retries
+        self.backoff = backoff
+        self.retry_statuses = retry_statuses
+        self.timeout = timeout
+        self._sessions = {}
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _build_session(self, retries):
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,                      # never resend a request the server may be working on
+            status=retries,
+            backoff_factor=self.backoff,  # 0.3s, 0.6s, ...
+            status_forcelist=self.retry_statuses,
+            allowed_methods=frozenset(["GET", "POST"]),
+            respect_retry_after_header=False,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size, max_retries=retry)
+
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def _get_session(self, retry):
+        # Built lazily per process: gunicorn workers forked from a preloaded
+        # master must not share the master's sockets
+        with self._lock:
+            if self._pid != os.getpid():
+                self._sessions = {}
+                self._pid = os.getpid()
+            if retry not in self._sessions:
+                self._sessions[retry] = self._build_session(self.retries if retry else 0)
+            return self._sessions[retry]
+
+    @property
+    def session(self):
+        return self._get_session(True)
+
+    def post(self, url, timeout=None, retry=True, **kwargs):
+        """
+        POST through the pool (timeout: seconds or (connect, read)).
+        retry=False sends exactly one request, for callers that retry
+        themselves (services/llm_guard).
+        """
+        return self._get_session(retry).post(url, timeout=timeout or self.timeout, **kwargs)
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions = {}
+
+
+# Global client shared by the LLM services
+http_client = HttpClient()
@@ -0,0 +1,142 @@
+"""
+Insight Engine - Local template insights for government crime statistics
+
+Rules over a year's Crime Head table: volume and share of all cognizable
+IPC crimes, rank among crime heads, charge-sheeting against the all-crimes
+rate, the pending backlog, and the change since the previous year in the
+dataset. No network call; the LLM insight is an optional extra on top.
+"""
+from functools import lru_cache
+from services.data_loader import gov_data
+from services.helpers import find_column
+from services.response_formatter import format_number
+
+
+def ordinal(n):
+    if 10 <= n % 100 <= 20:
+        suffix = "th"
+    else:
+        suffix = {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return f"{n}{suffix}"
+
+
+def _stat(stats, *keywords):
+    """Value of the first statistic whose name has all keywords (0 if absent)"""
+    for key, value in stats.items():
+        if all(k in key.lower() for k in keywords):
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return 0
+    return 0
+
+
+@lru_cache(maxsize=None)
+def year_profile(year):
+    """
+    Per-year context: reported cases by crime head (lower case), their
+    ranks and charge-sheeting rates, and the all-crimes totals (from the
+    grand-total row if any).
+    """
+    df = gov_data[year]
+    reported_col = find_column(df, ["reported"])
+    rate_col = find_column(df, ["charge", "rate"])
+    if reported_col is None:
+        return None
+
+    names = df["Crime Head"].astype(str).str.strip()
+    is_total = names.str.lower().str.contains("total", na=False)
+
+    heads = df[~is_total]
+    reported = heads[reported_col].fillna(0).astype(float)
+    reported.index = names[~is_total].str.lower()
+    ranks = reported.rank(ascending=False, method="min").astype(int)
+    rates = {}
+    if rate_col:
+        rates = dict(zip(reported.index, heads[rate_col].fillna(0).astype(float)))
+
+    total_rows = df[is_total]
+    if not total_rows.empty:
+        total_reported = float(total_rows[reported_col].iloc[-1])
+        overall_rate = float(total_rows[rate_col].iloc[-1]) if rate_col else 0
+    else:
+        total_reported = float(reported.sum())
+        overall_rate = 0
+
+    return {
+        "reported": reported.to_dict(),
+        "ranks": ranks.to_dict(),
+        "rates": rates,
+        "heads": len(reported),
+        "total_reported": total_reported,
+        "overall_rate": overall_rate
+    }
+
+
+def _previous_year(year):
+    earlier = [y for y in sorted(gov_data.keys()) if y < year]
+    return earlier[-1] if earlier else None
+
+
+def crime_insight(year, crime_head, stats):
+    """2-4 sentence insight for one crime head's statistics in a year"""
+    key = str(crime_head).strip().lower()
+    profile = year_profile(year)
+
+    reported = _stat(stats, "reported")
+    chargesheeted = _stat(stats, "charge-sheeted") or _stat(stats, "chargesheeted")
+    # The table's rate keeps its decimals (stats may hold it truncated)
+    rate = (profile or {}).get("rates", {}).get(key) or _stat(stats, "charge", "rate")
+    if profile and "total" in key:
+        rate = profile["overall_rate"] or rate
+    pending = _stat(stats, "pending", "previous")
+    under_investigation = _stat(stats, "total", "investigation")
+
+    if not reported:
+        return f"No cases of {crime_head} were reported in {year}."
+
+    # Volume, share and rank
+    sentence = f"In {year}, {format_number(reported)} cases of {crime_head} were reported"
+    if profile and profile["total_reported"] and "total" not in key:
+        share = reported / profile["total_reported"] * 100
+        sentence += f", {share:.1f}% of all cognizable IPC crimes"
+    if profile and key in profile["ranks"]:
+        sentence += f", the {ordinal(profile['ranks'][key])} highest of {profile['heads']} crime heads"
+    parts = [sentence + "."]
+
+    # Charge-sheeting
+    if rate:
+        sentence = f"The charge-sheeting rate was {rate:g}%"
+        if chargesheeted:
+            sentence = f"Police charge-sheeted {format_number(chargesheeted)} cases, a rate of {rate:g}%"
+        overall = profile["overall_rate"] if profile else 0
+        if overall and "total" not in key:
+            if rate > overall:
+                sentence += f", above the {overall:g}% rate for all IPC crimes"
+            elif rate < overall:
+                sentence += f", below the {overall:g}% rate for all IPC crimes"
+            else:
+                sentence += ", in line with all IPC crimes"
+        parts.append(sentence + ".")
+
+    # Backlog carried into the year
+    if pending and under_investigation:
+        share = pending / under_investigation * 100
+        parts.append(
+            f"{format_number(pending)} cases ({share:.0f}% of the {format_number(under_investigation)} "
+            f"under investigation) were pending from previous years."
+        )
+
+    # Change since the previous year in the dataset
+    previous = _previous_year(year)
+    previous_profile = year_profile(previous) if previous else None
+    if previous_profile and previous_profile["reported"].get(key):
+        before = previous_profile["reported"][key]
+        change = (reported - before) / before * 100
+        if abs(change) < 0.5:
+            parts.append(f"Reported cases were nearly unchanged from {previous} ({format_number(before)}).")
+        else:
+            direction = "rose" if change > 0 else "fell"
+            parts.append(f"Reported cases {direction} {abs(change):.1f}% from {format_number(before)} in {previous}.")
+
+    return " ".join(parts)
@@ -1,12 +1,27 @@
 import os
-import requests
 import json
+import requests
+from contextlib import contextmanager
+from contextvars import ContextVar
+from services.llm_guard import LLMUnavailable, groq_breaker, guarded_post
+from services.single_flight import single_flight
 
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
 
-def generate_insight(user_question, data):
-    prompt = f"""
+# When callers with a local insight (fallback) use the LLM:
+#   off   - never; the local insight is the answer
+#   async - only streamed after the data on /chat/stream (default)
+#   sync  - also block /chat on it, as before
+LLM_INSIGHTS = os.getenv("LLM_INSIGHTS", "async").lower()
+
+# Set by deferred_insights(): generate_insight records its prompt there
+# instead of calling the LLM, so a streaming response can send the data first
+_deferred = ContextVar("deferred_insights", default=None)
+
+
+def insight_prompt(user_question, data):
+    return f"""
 You are an expert crime analytics assistant providing insights from Indian crime data.
 
 User Question: {user_question}
@@ -25,38 +40,116 @@ INSTRUCTIONS:
 Return ONLY the insight text, no headings or formatting.
 """
 
+
+def _post_completion(prompt, stream=False):
+    body = {
+        "model": "llama-3.1-8b-instant",
+        "messages": [
+            {"role": "system", "content": "You are a crime analytics expert."},
+            {"role": "user", "content": prompt}
+        ],
+        "temperature": 0.3
+    }
+    if stream:
+        body["stream"] = True
+
+    return guarded_post(
+        GROQ_URL,
+        headers={
+            "Authorization": f"Bearer {GROQ_API_KEY}",
+            "Content-Type": "application/json"
+        },
+        json=body,
+        timeout=(3.05, 10),
+        stream=stream
+    )
+
+
+@contextmanager
+def deferred_insights():
+    """Collect insight requests ({prompt, fallback}) instead of waiting on the LLM"""
+    pending = []
+    token = _deferred.set(pending)
     try:
-        response = requests.post(
-            GROQ_URL,
-            headers={
-                "Authorization": f"Bearer {GROQ_API_KEY}",
-                "Content-Type": "application/json"
-            },
-            json={
-                "model": "llama-3.1-8b-instant",
-                "messages": [
-                    {"role": "system", "content": "You are a crime analytics expert."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.3
-            },
-            timeout=10
-        )
-
-        # 🔥 Check HTTP status
-        if response.status_code != 200:
-            print("GROQ ERROR:", response.status_code, response.text)
-            return "Insight generation unavailable at the moment."
+        yield pending
+    finally:
+        _deferred.reset(token)
+
+
+def fetch_insight(prompt):
+    """Insight text for a prompt, None on a bad response (raises if not sent)"""
+    response = _post_completion(prompt)
+
+    # 🔥 Check HTTP status
+    if response.status_code != 200:
+        print("GROQ ERROR:", response.status_code, response.text)
+        return None
+
+    result = response.json()
 
-        result = response.json()
+    # 🔥 Check structure safely
+    if "choices" not in result:
+        print("INVALID GROQ RESPONSE:", result)
+        return None
 
-        # 🔥 Check structure safely
-        if "choices" not in result:
-            print("INVALID GROQ RESPONSE:", result)
-            return "Insight generation unavailable."
+    return result["choices"][0]["message"]["content"]
 
-        return result["choices"][0]["message"]["content"]
+
+def waits_for_llm():
+    """Whether /chat answers carry the LLM insight (LLM_INSIGHTS=sync)"""
+    return LLM_INSIGHTS == "sync"
+
+
+def generate_insight(user_question, data, fallback=None):
+    """
+    LLM insight for the data. A fallback (local insight), if given, is
+    returned when the LLM is unavailable, and instead of waiting on the
+    LLM at all unless LLM_INSIGHTS is "sync".
+    """
+    prompt = insight_prompt(user_question, data)
+
+    pending = _deferred.get()
+    if pending is not None:
+        if fallback is None or LLM_INSIGHTS != "off":
+            pending.append({"prompt": prompt, "fallback": fallback or ""})
+        return fallback or ""
+
+    if fallback is not None and LLM_INSIGHTS != "sync":
+        return fallback
+
+    def request_insight():
+        return fetch_insight(prompt) or fallback or "Insight generation unavailable at the moment."
+
+    try:
+        # Concurrent requests for the same insight share one Groq call
+        return single_flight.do(("insight", prompt), request_insight)
 
     except Exception as e:
-        print("INSIGHT EXCEPTION:", e)
-        return "Insight generation temporarily unavailable."
\ No newline at end of file
+        # Breaker open / budget spent: fall back quietly
+        if not isinstance(e, LLMUnavailable):
+            print("INSIGHT EXCEPTION:", e)
+        return fallback or "Insight generation temporarily unavailable."
+
+
+def stream_insight(prompt):
+    """Yield the insight text for a prompt as the LLM writes it (raises on failure)"""
+    response = _post_completion(prompt, stream=True)
+    try:
+        if response.status_code != 200:
+            raise RuntimeError(f"Groq returned {response.status_code}")
+
+        for line in response.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            payload = line[len("data:"):].strip()
+            if payload == "[DONE]":
+                break
+            delta = json.loads(payload)["choices"][0].get("delta", {}).get("content")
+            if delta:
+                yield delta
+    except requests.RequestException:
+        # Stalled / dropped mid-stream counts against the breaker too
+        groq_breaker.record_failure()
+        raise
+    finally:
+        response.close()
@@ -0,0 +1,158 @@
+"""
+Insight Store - Precomputed LLM insights for every crime head and year
+
+build_insights.py asks the LLM once per (dataset, year, crime head) and
+writes the answers to INSIGHT_STORE_DIR/insights-<hash>.json, where <hash>
+covers the store version and the contents of the source CSVs. The server
+loads the file matching its CSVs into a dict and answers from it without
+calling the LLM; after a CSV edit no file matches, so nothing stale is
+served until the job runs again.
+"""
+import glob
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from services.data_loader import FOREIGN_DATA_PATHS, GOV_DATA_PATHS
+from services.snapshot_cache import sources_hash
+
+INSIGHT_STORE_DIR = os.environ.get("INSIGHT_STORE_DIR", os.path.join("data", ".insights"))
+
+# Bump when prompts or stored fields change so every insight is regenerated
+INSIGHT_STORE_VERSION = 1
+
+SOURCES = {"government": GOV_DATA_PATHS, "foreign": FOREIGN_DATA_PATHS}
+
+
+def data_hash(sources=None):
+    """Hash of the store version and every source CSV's contents"""
+    return sources_hash(sources or SOURCES, salt=f"v{INSIGHT_STORE_VERSION}")
+
+
+def insight_key(dataset, year, crime_head):
+    return f"{dataset}|{year}|{str(crime_head).strip().lower()}"
+
+
+def prompt_hash(prompt):
+    return hashlib.sha1(prompt.encode()).hexdigest()
+
+
+def _write_json(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as fh:
+        json.dump(data, fh, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+class InsightStore:
+    """Insights for the current CSVs (served from memory, written by build())"""
+
+    def __init__(self, directory=INSIGHT_STORE_DIR, sources=None):
+        self.directory = directory
+        self.sources = sources
+        self.digest = None
+        self._insights = None
+        self._lock = threading.Lock()
+
+    def path(self, digest):
+        return os.path.join(self.directory, f"insights-{digest}.json")
+
+    def _read(self, path):
+        try:
+            with open(path) as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    def load(self):
+        """(Re)load the store file that matches the current CSVs"""
+        digest = data_hash(self.sources)
+        stored = self._read(self.path(digest)) or {}
+        entries = stored.get("insights", {}) if stored.get("data_hash") == digest else {}
+        with self._lock:
+            self.digest = digest
+            self._insights = {key: entry["text"] for key, entry in entries.items()}
+        return len(self._insights)
+
+    def get(self, dataset, year, crime_head):
+        """Precomputed insight, or None if the batch job has not produced one"""
+        if self._insights is None:
+            self.load()
+        return self._insights.get(insight_key(dataset, year, crime_head))
+
+    def stats(self):
+        return {
+            "data_hash": self.digest,
+            "entries": len(self._insights or {})
+        }
+
+    # ---------- Batch job ----------
+
+    def _known_answers(self):
+        """Stored text by prompt hash, across every store file on disk"""
+        known = {}
+        for path in sorted(glob.glob(os.path.join(self.directory, "insights-*.json")), key=os.path.getmtime):
+            for entry in (self._read(path) or {}).get("insights", {}).values():
+                known[entry["prompt"]] = entry["text"]
+        return known
+
+    def build(self, jobs, fetch, force=False, workers=4):
+        """
+        Write the store for the current CSVs and drop older store files.
+
+        jobs: iterable of (dataset, year, crime_head, prompt)
+        fetch: prompt -> text (None or an exception when it fails)
+
+        Insights whose prompt is unchanged are copied from earlier store
+        files; only new or changed prompts (all of them with force) are
+        sent to fetch. Returns (generated, reused, failed) counts.
+        """
+        digest = data_hash(self.sources)
+        known = {} if force else self._known_answers()
+        insights, todo = {}, []
+
+        for dataset, year, crime_head, prompt in jobs:
+            key, sha = insight_key(dataset, year, crime_head), prompt_hash(prompt)
+            if sha in known:
+                insights[key] = {"text": known[sha], "prompt": sha}
+            else:
+                todo.append((key, sha, prompt))
+        reused = len(insights)
+
+        def run(job):
+            key, sha, prompt = job
+            try:
+                return key, sha, fetch(prompt)
+            except Exception as e:
+                print(f"Insight for {key} failed: {e}")
+                return key, sha, None
+
+        failed = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for key, sha, text in pool.map(run, todo):
+                if text and text.strip():
+                    insights[key] = {"text": text.strip(), "prompt": sha}
+                else:
+                    failed += 1
+
+        os.makedirs(self.directory, exist_ok=True)
+        current = self.path(digest)
+        _write_json(current, {
+            "version": INSIGHT_STORE_VERSION,
+            "data_hash": digest,
+            "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "insights": insights
+        })
+        for path in glob.glob(os.path.join(self.directory, "insights-*.json")):
+            if path != current:
+                os.remove(path)
+
+        self.load()
+        return len(todo) - failed, reused, failed
+
+
+# Global instance
+insight_store = InsightStore()
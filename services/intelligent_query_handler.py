@@ -4,7 +4,8 @@ Intelligent Query Handler - Enhanced chatbot capabilities
 import pandas as pd
 from difflib import get_close_matches
 from services.data_loader import crime_data, gov_data, foreign_data
-from services.analytics_engine import calculate_city_totals
+from services.analytics_engine import calculate_city_totals, year_city_totals
+from services.city_index import city_index
 from services.insight_generator import generate_insight
 
 
@@ -194,16 +195,12 @@ class IntelligentQueryHandler:
         if not city or len(years) < 2:
             return None
         
-        import re
         trend_data = {}
         for year in years:
             if year in crime_data:
-                df = crime_data[year]
-                # Escape regex special characters in city name
-                city_escaped = re.escape(city)
-                row = df[df["City"].str.contains(city_escaped, case=False, na=False, regex=True)]
-                if not row.empty:
-                    total = calculate_city_totals(row.iloc[0].to_dict(), gender)
+                row = city_index.row(year, city)
+                if row is not None:
+                    total = calculate_city_totals(row, gender)
                     trend_data[year] = int(total)
         
         if len(trend_data) < 2:
@@ -240,15 +237,11 @@ class IntelligentQueryHandler:
         if year not in crime_data:
             return None
         
-        df = crime_data[year]
-        df = df[df["City"].notna()]
-        df = df[~df["City"].str.lower().str.contains("total", na=False)]
-        
-        rankings = []
-        for _, row in df.iterrows():
-            city = row["City"]
-            total = calculate_city_totals(row.to_dict(), gender)
-            rankings.append({"city": city, "arrests": int(total)})
+        totals = year_city_totals(year, gender)
+        rankings = [
+            {"city": city, "arrests": total}
+            for city, total in zip(totals.index, totals.tolist())
+        ]
         
         rankings.sort(key=lambda x: x["arrests"], reverse=True)
         
@@ -1,7 +1,9 @@
 import os
-import requests
 import json
 from dotenv import load_dotenv
+from services.extraction_cache import extraction_cache, normalize_message
+from services.llm_guard import LLMUnavailable, guarded_post
+from services.single_flight import single_flight
 
 load_dotenv()
 
@@ -9,7 +11,13 @@ GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 GROQ_URL = "https://api.groq.com/openai/v1/chat/completions"
 
 
-def llm_extract(message):
+def llm_extract(message, default=None):
+    """Structured query from the LLM (default, or an empty result, on failure)"""
+
+    # Repeated / near-identical questions skip the network round trip
+    cached = extraction_cache.get(message)
+    if cached is not None:
+        return cached
 
     system_prompt = """
 You are an advanced AI assistant for a comprehensive crime analytics dashboard with access to Indian crime data.
@@ -82,8 +90,8 @@ Return ONLY valid JSON (no markdown, no explanation):
 }
                 """
 
-    try:
-        response = requests.post(
+    def request_extraction():
+        response = guarded_post(
             GROQ_URL,
             headers={
                 "Authorization": f"Bearer {GROQ_API_KEY}",
@@ -97,7 +105,7 @@ Return ONLY valid JSON (no markdown, no explanation):
                 ],
                 "temperature": 0
             },
-            timeout=10
+            timeout=(3.05, 10)
         )
 
         result = response.json()
@@ -110,13 +118,22 @@ Return ONLY valid JSON (no markdown, no explanation):
         # Add confidence score if not present
         if "confidence" not in parsed:
             parsed["confidence"] = 0.8
+
+        # Only successful extractions are cached; failures retry next time
+        extraction_cache.set(message, parsed)
             
         return parsed
 
-        return json.loads(content)
+    try:
+        # Concurrent requests for the same question share one Groq call
+        return single_flight.do(("extract", normalize_message(message)), request_extraction)
 
     except Exception as e:
-        print("LLM ERROR:", e)
+        # Breaker open / budget spent: fall back quietly
+        if not isinstance(e, LLMUnavailable):
+            print("LLM ERROR:", e)
+        if default is not None:
+            return default
         return {
             "intent": "unknown",
             "cities": [],
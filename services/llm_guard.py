@@ -0,0 +1,209 @@
+"""
+LLM Guard - Circuit breaker and per-request latency budget for Groq calls
+
+Every Groq request goes through guarded_post(). After repeated failures or
+timeouts the breaker opens and calls fail at once (callers fall back to the
+local extractor / basic insights) until a single half-open probe succeeds.
+Independently, a request may spend at most LLM_LATENCY_BUDGET seconds on
+LLM calls in total; each attempt's timeout is cut to what is left.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+import requests
+
+from services.http_client import DEFAULT_TIMEOUT, http_client
+
+# Seconds a single chat request may spend waiting on the LLM
+LLM_LATENCY_BUDGET = float(os.getenv("LLM_LATENCY_BUDGET", "8"))
+
+# Not worth starting a call with less time than this left
+MIN_CALL_SECONDS = 0.25
+
+
+class LLMUnavailable(Exception):
+    """The LLM was not called (breaker open or budget spent)"""
+
+
+class CircuitOpenError(LLMUnavailable):
+    pass
+
+
+class BudgetExhausted(LLMUnavailable):
+    pass
+
+
+class CircuitBreaker:
+    """
+    closed -> open after failure_threshold consecutive failures;
+    open -> half_open after reset_timeout seconds, letting one probe through;
+    half_open -> closed on success, back to open on failure.
+    """
+
+    def __init__(self, name, failure_threshold=5, reset_timeout=30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.short_circuited = 0
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def _set_state(self, state):
+        if state != self.state:
+            print(f"Circuit '{self.name}': {self.state} -> {state}")
+            self.state = state
+
+    def allow(self):
+        """Whether a call may go out now"""
+        with self._lock:
+            if self.state == "open" and time.monotonic() - self.opened_at >= self.reset_timeout:
+                self._set_state("half_open")
+                self._probing = False
+
+            if self.state == "closed":
+                return True
+            # One probe at a time (a probe that never reported is replaced)
+            if self.state == "half_open" and (
+                not self._probing or time.monotonic() - self._probe_started >= self.reset_timeout
+            ):
+                self._probing = True
+                self._probe_started = time.monotonic()
+                return True
+
+            self.short_circuited += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            self._set_state("closed")
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == "half_open" or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+                self._set_state("open")
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "short_circuited": self.short_circuited
+            }
+
+
+# ---------- Latency budget ----------
+
+_deadline = ContextVar("llm_deadline", default=None)
+
+
+@contextmanager
+def latency_budget(seconds=None):
+    """Limit the LLM time of everything run inside (one chat request)"""
+    token = _deadline.set(time.monotonic() + (LLM_LATENCY_BUDGET if seconds is None else seconds))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_budget():
+    """Seconds of LLM time left for this request (None outside a budget)"""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+# ---------- Guarded call ----------
+
+def _budget_timeout(timeout):
+    """(connect, read) cut to the request's remaining budget, None if spent"""
+    connect, read = timeout
+    remaining = remaining_budget()
+    if remaining is None:
+        return connect, read
+    if remaining < MIN_CALL_SECONDS:
+        return None
+    return min(connect, remaining), min(read, remaining)
+
+
+def guarded_post(url, timeout=DEFAULT_TIMEOUT, breaker=None, **kwargs):
+    """
+    POST to the LLM through the breaker, within the request's budget.
+
+    Retries (throttling / 5xx / refused connections) happen here rather than
+    in the HTTP client, so every attempt is checked against the budget and
+    the breaker, and every failed attempt is counted. A read timeout bounds
+    the wait between bytes, not the whole call, so the deadline is checked
+    again once a response is in.
+    """
+    breaker = breaker or groq_breaker
+    response, error = None, None
+
+    for attempt in range(http_client.retries + 1):
+        if attempt:
+            delay = http_client.backoff * (2 ** (attempt - 1))
+            remaining = remaining_budget()
+            if remaining is not None and remaining - delay < MIN_CALL_SECONDS:
+                break
+            time.sleep(delay)
+
+        attempt_timeout = _budget_timeout(timeout)
+        if attempt_timeout is None:
+            if attempt:
+                break
+            raise BudgetExhausted(f"LLM budget spent ({LLM_LATENCY_BUDGET}s)")
+
+        if not breaker.allow():
+            if attempt:
+                break
+            raise CircuitOpenError(f"Circuit '{breaker.name}' is open")
+
+        if response is not None:
+            response.close()  # discarded failure, frees a streamed connection
+        response, error = None, None
+        try:
+            response = http_client.post(url, timeout=attempt_timeout, retry=False, **kwargs)
+        except requests.ConnectionError as e:
+            # Never reached the model: safe to try again
+            breaker.record_failure()
+            error = e
+            continue
+        except requests.RequestException:
+            breaker.record_failure()
+            raise
+
+        remaining = remaining_budget()
+        if remaining is not None and remaining < 0:
+            # Trickled in past the deadline: as bad as a timeout
+            breaker.record_failure()
+            raise BudgetExhausted(f"LLM call overran the budget ({LLM_LATENCY_BUDGET}s)")
+
+        if response.status_code == 429 or response.status_code >= 500:
+            breaker.record_failure()
+            continue
+
+        breaker.record_success()
+        return response
+
+    if response is None:
+        raise error
+    return response
+
+
+# Global breaker for the Groq API
+groq_breaker = CircuitBreaker(
+    "groq",
+    failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", "5")),
+    reset_timeout=float(os.getenv("LLM_BREAKER_RESET", "30"))
+)
@@ -0,0 +1,155 @@
+"""
+Query Plan - Canonical description of what a chat answer depends on
+
+The routing stage of /chat resolves the message and its extraction into a
+plan: the route taken plus only the parameters that route reads (year,
+cities, gender, top N, juvenile category ...). Every response of a
+cacheable route is a function of its plan alone, so the plan is the
+response cache key: differently worded questions with the same plan
+share one entry, and questions that are answered differently never do.
+"""
+from services.data_loader import crime_data
+from services.city_index import city_index
+from services.query_understanding import detect_query_type, extract_top_n
+
+# Bump when a route's parameters or its response change shape
+PLAN_VERSION = 1
+
+# Routes whose responses are not a function of the plan (errors / handoffs)
+UNCACHED_ROUTES = {"invalid_years", "year_crimes", "fallback"}
+
+GENDER_WORDS = ["male", "men", "man", "female", "women", "woman"]
+GENDER_RATIO_WORDS = ["ratio", "male female", "male vs female", "gender gap", "gender breakdown", "gender comparison"]
+JUVENILE_KEYWORDS = ["juvenile", "minor", "child", "under 18"]
+
+
+def plan_key(plan):
+    """Cache key data for a plan: its parameters plus the plan version"""
+    return dict(plan, v=PLAN_VERSION)
+
+
+def is_cacheable(plan):
+    return plan["route"] not in UNCACHED_ROUTES
+
+
+def resolve_plan(message, structured):
+    """Resolve the route and its parameters for the NCRB arrest questions"""
+    message_lower = message.lower()
+
+    city_list = structured.get("cities", [])
+    gender = structured.get("gender")
+    detected_crime = structured.get("crime", "").strip()
+
+    # ================= YEARS =================
+    original_years = [str(y) for y in structured.get("years", [])]
+    years = [y for y in original_years if y in crime_data]
+
+    # If user mentions "all" and no specific years, use all available years
+    if not years and "all" in message_lower and ("year" in message_lower or "trend" in message_lower):
+        years = sorted(crime_data.keys())
+    elif not years and not original_years:
+        # No years mentioned at all - use default
+        years = [sorted(crime_data.keys())[-1]]
+    elif not years and original_years:
+        # Years were mentioned but none are valid
+        return {"route": "invalid_years", "years": [y for y in original_years if y not in crime_data]}
+
+    year = years[0]
+
+    # Year-only questions ("2020", "show me 2020 data") list the year's crimes.
+    # Don't trigger if a crime was detected or if a city was found
+    if not city_list and not detected_crime and not gender and len(message.split()) <= 3:
+        return {"route": "year_crimes", "years": years}
+
+    # ================= GENDER =================
+    # Crime queries with gender words (e.g., "Assault on Women") never get here
+    if not any(word in message_lower for word in GENDER_WORDS):
+        gender = None
+    gender = gender or None
+
+    # ================= INTENT =================
+    intent = structured.get("intent", "")
+    top_n = structured.get("top_n", extract_top_n(message))
+
+    if top_n or "top" in message_lower:
+        intent = "top"
+        top_n = top_n or 3  # default
+    elif any(word in message_lower for word in ["highest", "maximum", "most"]):
+        intent = "highest"
+    elif any(word in message_lower for word in ["lowest", "minimum", "least"]):
+        intent = "lowest"
+
+    if any(word in message_lower for word in ["compare", "vs", "between"]):
+        intent = "compare"
+
+    # ================= ROUTES (first match wins) =================
+    if any(word in message_lower for word in JUVENILE_KEYWORDS):
+        city = None
+        if city_list and city_index.contains(year, city_list[0]):
+            city = city_list[0]
+
+        # Check "female" before "male" because "female" contains "male"
+        if "girls" in message_lower or "female" in message_lower or "women" in message_lower:
+            category = "girls"
+        elif "boys" in message_lower or "male" in message_lower:
+            category = "boys"
+        else:
+            category = "total"
+
+        return {
+            "route": "juvenile",
+            "year": year,
+            "city": city,
+            "category": category,
+            "ranking": intent if intent in ["top", "highest", "lowest"] else None
+        }
+
+    if intent == "top":
+        return {"route": "top", "year": year, "gender": gender, "top_n": top_n}
+
+    if intent == "compare" and len(city_list) >= 2 and len(years) >= 2:
+        return {"route": "matrix", "cities": sorted(city_list), "years": sorted(years), "gender": gender}
+
+    if len(city_list) >= 2:
+        return {"route": "multi_city", "cities": sorted(city_list[:2]), "year": year, "gender": gender}
+
+    if intent in ["highest", "lowest"]:
+        return {"route": intent, "year": year, "gender": gender}
+
+    if len(city_list) == 1:
+        trend = "trend" in message_lower
+        # Trends default to every year when at most one is given
+        if trend and len(years) == 1:
+            years = sorted(crime_data.keys())
+
+        query_types = detect_query_type(message, structured)
+        plan = {
+            "route": "city",
+            "city": city_list[0],
+            "years": sorted(years),
+            "gender": gender,
+            "trend": trend,
+            "gender_analysis": "gender" in query_types or "analysis" in query_types
+        }
+        if plan["gender_analysis"]:
+            plan["analysis_year"] = years[0]
+        return plan
+
+    # No city from here on: national questions
+    if any(word in message_lower for word in GENDER_RATIO_WORDS):
+        return {"route": "gender_ratio", "year": year}
+
+    if "trend" in message_lower:
+        return {
+            "route": "national_trend",
+            "years": sorted(crime_data.keys()) if len(years) == 1 else sorted(years),
+            "gender": gender
+        }
+
+    if gender and len(years) == 1:
+        return {"route": "gender_total", "year": year, "gender": gender}
+
+    if not gender and "arrest" in message_lower:
+        return {"route": "year_total", "year": year}
+
+    return {"route": "fallback"}
@@ -8,6 +8,20 @@ def format_number(num):
     return f"{int(num):,}"
 
 
+def format_indian_number(num):
+    """Format number with Indian digit grouping (1,23,45,678), as the pages do"""
+    num = int(num)
+    digits = str(abs(num))
+    if len(digits) > 3:
+        head, tail = digits[:-3], digits[-3:]
+        groups = []
+        while len(head) > 2:
+            groups.insert(0, head[-2:])
+            head = head[:-2]
+        digits = ",".join(([head] if head else []) + groups + [tail])
+    return f"-{digits}" if num < 0 else digits
+
+
 def format_comparison_response(data, context):
     """Format multi-city comparison response"""
     cities = list(data.keys())
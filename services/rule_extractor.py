@@ -0,0 +1,231 @@
+"""
+Rule Extractor - Local fast path for the LLM query extraction
+
+Parses the common question shapes ("Delhi arrests 2020", "top 5 cities
+2019", "compare Mumbai and Delhi") with the dataset's own city and crime
+vocabulary and returns the same schema as llm_extract, plus a confidence
+score. Groq is only asked when the local parse is unsure.
+"""
+import os
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import copy_context
+from services.helpers import VALID_CRIMES
+from services.intelligent_query_handler import intelligent_handler
+from services.llm_extractor import llm_extract
+from services.query_understanding import extract_top_n, detect_aggregation_type
+
+# Below this confidence the message goes to the LLM
+FAST_PATH_MIN_CONFIDENCE = float(os.getenv("FAST_PATH_MIN_CONFIDENCE", "0.9"))
+
+# Threads that wait on Groq so the request thread can keep working
+# (started lazily, so none exist in a preloading gunicorn master)
+llm_pool = ThreadPoolExecutor(
+    max_workers=int(os.getenv("LLM_MAX_CONCURRENCY", "8")),
+    thread_name_prefix="llm-extract"
+)
+
+# Other spellings people use for the dataset's cities
+CITY_ALTERNATES = {
+    "bangalore": "bengaluru",
+    "bombay": "mumbai",
+    "calcutta": "kolkata",
+    "madras": "chennai",
+    "poona": "pune",
+    "cochin": "kochi",
+    "calicut": "kozhikode",
+    "trivandrum": "thiruvananthapuram",
+    "gurgaon": "gurugram",
+    "new delhi": "delhi",
+}
+
+# Single words the LLM would return as the crime for a query
+CRIME_WORDS = [
+    "kidnapping", "abduction", "assault", "cheating", "forgery", "trafficking",
+    "extortion", "dowry", "harassment", "trespass", "intimidation", "mischief",
+]
+
+GENDER_WORDS = {
+    "female": ["female", "females", "women", "woman", "girls", "girl"],
+    "male": ["male", "males", "men", "man", "boys", "boy"],
+}
+
+# Intent keywords, checked in order (first match wins)
+INTENT_KEYWORDS = [
+    ("juvenile", ["juvenile", "juveniles", "minor", "minors", "child", "children", "under 18"]),
+    # before the dataset intents: the foreign handler looks for "trend" in the intent
+    ("trend", ["trend", "trends", "over time", "change", "growth", "increase", "decrease"]),
+    ("foreign_data", ["foreign", "foreigner", "foreigners", "international", "tourist", "tourists"]),
+    ("gov_crime_full_data", ["government", "national", "india total"]),
+    ("city_comparison", ["compare", "comparison", "vs", "versus"]),
+    ("highest", ["highest", "maximum", "most", "top"]),
+    ("lowest", ["lowest", "minimum", "least", "bottom"]),
+    ("ranking", ["rank", "ranking", "rankings", "position", "standing", "order"]),
+    ("percentage", ["percentage", "percent", "ratio", "proportion"]),
+    ("average", ["average", "mean", "typical"]),
+    ("total", ["total", "sum", "aggregate"]),
+    ("analysis", ["analyze", "analyse", "analysis", "breakdown", "detailed"]),
+    ("statistics", ["stats", "statistics", "data", "information"]),
+]
+
+STATISTICAL_OPERATIONS = {
+    "correlation": ["correlation", "correlate", "relationship"],
+    "prediction": ["predict", "prediction", "forecast", "future"],
+    "pattern": ["pattern", "patterns"],
+}
+
+# Words that carry no meaning of their own for the extraction
+FILLER_WORDS = {
+    "a", "an", "the", "in", "of", "for", "and", "or", "to", "from", "with", "by",
+    "on", "at", "is", "are", "was", "were", "be", "what", "which", "who", "how",
+    "many", "much", "show", "me", "tell", "about", "give", "list", "get", "find",
+    "city", "cities", "year", "years", "has", "have", "had", "do", "does", "did",
+    "all", "i", "want", "see", "please", "their", "there", "its", "it", "number",
+    "numbers", "count", "crime", "crimes", "arrest", "arrests", "arrested",
+    "cases", "case", "rate", "rates", "india", "indian", "across", "over",
+    "between", "than", "more", "less", "per", "wise", "this", "that", "these",
+    "those", "can", "you", "my", "we", "during", "each", "every", "overall",
+    "gender", "other", "against", "data", "recorded", "reported", "where",
+    "first", "last", "latest", "s", "vs", "versus", "compared", "like", "any",
+}
+
+
+def _phrase_pattern(phrases):
+    phrases = sorted(set(phrases), key=len, reverse=True)
+    return re.compile(r"\b(" + "|".join(re.escape(p) for p in phrases) + r")\b")
+
+
+def _build_city_aliases(cities):
+    aliases = {}
+    for label in cities:
+        base = label.split("(")[0].strip().lower()
+        aliases.setdefault(label.lower(), label)
+        aliases.setdefault(base, label)
+    for alternate, base in CITY_ALTERNATES.items():
+        if base in aliases:
+            aliases.setdefault(alternate, aliases[base])
+    return aliases
+
+
+CITY_ALIASES = _build_city_aliases(intelligent_handler.all_cities)
+CITY_PATTERN = _phrase_pattern(CITY_ALIASES) if CITY_ALIASES else None
+CRIME_PATTERN = _phrase_pattern(VALID_CRIMES + CRIME_WORDS)
+INTENT_VOCABULARY = {w for _, words in INTENT_KEYWORDS for w in words}
+KNOWN_WORDS = (
+    FILLER_WORDS | INTENT_VOCABULARY
+    | {w for words in GENDER_WORDS.values() for w in words}
+    | {w for words in STATISTICAL_OPERATIONS.values() for w in words}
+)
+
+
+def _has_any(text, words):
+    return any(re.search(r"\b" + re.escape(w) + r"\b", text) for w in words)
+
+
+def rule_extract(message):
+    """Extract the llm_extract schema from a message with local rules"""
+    msg = " ".join(str(message).lower().split())
+    rest = msg
+
+    # ---------- Cities (in order of mention) ----------
+    cities = []
+    if CITY_PATTERN:
+        for match in CITY_PATTERN.finditer(msg):
+            city = CITY_ALIASES[match.group(1)]
+            if city not in cities:
+                cities.append(city)
+        rest = CITY_PATTERN.sub(" ", rest)
+
+    # ---------- Crime (longest phrase wins) ----------
+    crime_matches = CRIME_PATTERN.findall(rest)
+    crime = max(crime_matches, key=len) if crime_matches else ""
+    rest = CRIME_PATTERN.sub(" ", rest)
+
+    # ---------- Years / top N ----------
+    years = list(dict.fromkeys(re.findall(r"\b((?:19|20)\d{2})\b", msg)))
+    top_n = extract_top_n(msg) or 0
+
+    # ---------- Gender ----------
+    is_female = _has_any(msg, GENDER_WORDS["female"])
+    is_male = _has_any(msg, GENDER_WORDS["male"])
+    gender = "female" if is_female and not is_male else "male" if is_male and not is_female else ""
+
+    # ---------- Intent ----------
+    intent = ""
+    if re.search(r"\btop\s+\d{1,2}\b", msg):
+        intent = "top_n"
+    for name, words in INTENT_KEYWORDS:
+        if intent:
+            break
+        if _has_any(msg, words):
+            intent = name
+    if len(cities) >= 2 and intent in ("", "statistics", "total"):
+        intent = "city_comparison"
+    if not intent and cities:
+        intent = "city_profile"
+    if not intent and (years or crime):
+        intent = "statistics"
+
+    statistical_operation = next(
+        (op for op, words in STATISTICAL_OPERATIONS.items() if _has_any(msg, words)), ""
+    )
+
+    # ---------- Confidence: share of the message the rules explain ----------
+    tokens = re.findall(r"[a-z]+|\d+", rest)
+    unknown = [t for t in tokens if not t.isdigit() and t not in KNOWN_WORDS]
+    recognized = bool(cities or years or crime or intent)
+    if not recognized:
+        confidence = 0.0
+    elif not tokens:
+        confidence = 1.0
+    else:
+        confidence = round(1 - len(unknown) / len(tokens), 2)
+
+    if len(cities) >= 3 or statistical_operation:
+        complexity = "complex"
+    elif len(cities) == 2 or len(years) >= 2:
+        complexity = "moderate"
+    else:
+        complexity = "simple"
+
+    if intent == "city_comparison":
+        query_type = "comparison"
+    elif intent in ("trend", "analysis") or statistical_operation:
+        query_type = "analysis"
+    else:
+        query_type = "data_request"
+
+    return {
+        "intent": intent,
+        "cities": cities,
+        "years": years,
+        "gender": gender,
+        "crime": crime,
+        "aggregation": detect_aggregation_type(msg) or "",
+        "top_n": top_n,
+        "confidence": confidence,
+        "complexity": complexity,
+        "query_type": query_type,
+        "filters": [],
+        "statistical_operation": statistical_operation,
+    }
+
+
+def submit_extract(message):
+    """
+    Start extracting a chat message: a future for its structured query.
+    Local rules answer at once when they are confident; otherwise the LLM
+    call runs on llm_pool (falling back to the rules if it fails).
+    """
+    structured = rule_extract(message)
+    if structured["confidence"] >= FAST_PATH_MIN_CONFIDENCE:
+        done = Future()
+        done.set_result(structured)
+        return done
+    # copy_context: the pool thread keeps this request's LLM latency budget
+    return llm_pool.submit(copy_context().run, llm_extract, message, structured)
+
+
+def extract_query(message):
+    """Structured query for a chat message (rules, or the LLM when unsure)"""
+    return submit_extract(message).result()
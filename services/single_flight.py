@@ -0,0 +1,78 @@
+"""
+Single Flight - Coalesce identical concurrent calls into one execution
+
+While a call for a key is running, other threads asking for the same key
+wait for it and share its result (or its exception) instead of starting
+their own. Used around the LLM calls and the /chat cache fill so a burst
+of the same question costs one Groq request.
+"""
+import copy
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Per-process call coalescing keyed by any hashable value"""
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key, fn):
+        """
+        Result of fn(), run at most once at a time per key.
+
+        Waiters get a deep copy of the result, so callers may mutate what
+        they receive without affecting each other.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executed += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+                shared = call.waiters > 0
+            call.done.set()
+
+        # Waiters copy the stored result, so the leader must not hand it out
+        return copy.deepcopy(call.result) if shared else call.result
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_flight': len(self._calls),
+                'executed': self.executed,
+                'coalesced': self.coalesced
+            }
+
+
+# Global instance; keys are namespaced tuples, e.g. ("extract", message)
+single_flight = SingleFlight()
@@ -0,0 +1,139 @@
+"""
+Snapshot Cache - Binary columnar copies of the CSV inputs for fast startup
+
+The first load of a CSV stores the normalized frame as a Feather file
+(pyarrow) or, when pyarrow is not installed, as a pickle. Later starts read
+the snapshot (memory-mapped for Feather) as long as the source CSV has not
+changed; a stale or unreadable snapshot falls back to parsing the CSV.
+"""
+import hashlib
+import json
+import os
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # optional dependency, pickle snapshots are used instead
+    feather = None
+
+SNAPSHOT_DIR = os.environ.get("DATA_SNAPSHOT_DIR", os.path.join("data", ".snapshots"))
+
+# Bump when the normalization in data_loader changes so old snapshots are rebuilt
+SNAPSHOT_VERSION = 1
+SNAPSHOT_FORMAT = "feather" if feather else "pickle"
+
+
+def file_hash(path):
+    """SHA-1 of a file's contents"""
+    digest = hashlib.sha1()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sources_hash(sources, salt=""):
+    """Short hash of the contents of {dataset: {year: path}} source files"""
+    digest = hashlib.sha1(salt.encode())
+    for dataset, paths in sorted(sources.items()):
+        for year, path in sorted(paths.items()):
+            content = file_hash(path) if os.path.exists(path) else "missing"
+            digest.update(f"|{dataset}|{year}|{content}".encode())
+    return digest.hexdigest()[:16]
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return {"mtime": st.st_mtime_ns, "size": st.st_size}
+
+
+def _paths(source, name):
+    base = os.path.join(SNAPSHOT_DIR, f"{os.path.basename(source)}.{name}")
+    ext = "feather" if SNAPSHOT_FORMAT == "feather" else "pkl"
+    return f"{base}.{ext}", f"{base}.json"
+
+
+def _read_meta(meta_path):
+    try:
+        with open(meta_path) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w") as fh:
+        json.dump(data, fh)
+    os.replace(tmp, path)
+
+
+def _is_fresh(meta, source, meta_path):
+    """Snapshot matches the source (mtime+size shortcut, content hash otherwise)"""
+    if not meta or meta.get("version") != SNAPSHOT_VERSION or meta.get("format") != SNAPSHOT_FORMAT:
+        return False
+
+    stamp = _stamp(source)
+    if meta.get("mtime") == stamp["mtime"] and meta.get("size") == stamp["size"]:
+        return True
+
+    # File was touched or copied: only the contents decide
+    if meta.get("sha1") != file_hash(source):
+        return False
+
+    try:
+        _write_json(meta_path, {**meta, **stamp})
+    except OSError:
+        pass
+    return True
+
+
+def _read_frame(snapshot_path):
+    if SNAPSHOT_FORMAT == "feather":
+        return feather.read_feather(snapshot_path, memory_map=True)
+    return pd.read_pickle(snapshot_path)
+
+
+def _write_frame(df, snapshot_path):
+    tmp = f"{snapshot_path}.{os.getpid()}.tmp"
+    if SNAPSHOT_FORMAT == "feather":
+        feather.write_feather(df, tmp)
+    else:
+        df.to_pickle(tmp)
+    os.replace(tmp, snapshot_path)
+
+
+def load_snapshot(source, build):
+    """
+    Return build(source), served from a snapshot while the source CSV is unchanged
+    """
+    if not os.path.exists(source):
+        return build(source)
+
+    snapshot_path, meta_path = _paths(source, build.__name__.strip("_"))
+
+    meta = _read_meta(meta_path)
+    if os.path.exists(snapshot_path) and _is_fresh(meta, source, meta_path):
+        try:
+            return _read_frame(snapshot_path)
+        except Exception as e:
+            print(f"Snapshot {snapshot_path} unreadable, reloading CSV: {e}")
+
+    df = build(source)
+    if df.empty:
+        return df
+
+    try:
+        os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+        stamp = _stamp(source)
+        _write_frame(df, snapshot_path)
+        _write_json(meta_path, {
+            "version": SNAPSHOT_VERSION,
+            "format": SNAPSHOT_FORMAT,
+            "sha1": file_hash(source),
+            **stamp,
+        })
+    except Exception as e:
+        print(f"Could not write snapshot for {source}: {e}")
+
+    return df
@@ -0,0 +1,190 @@
+"""
+Static Assets - Minified, fingerprinted, precompressed static files
+
+At startup (once in the gunicorn master) every file under static/ is copied
+to static/dist/ under a content-hashed name: CSS and JS minified first, and
+text files also stored .gz (and .br when brotli is installed). Templates
+link them through asset_url(); /static/dist/ serves the smallest variant
+the client accepts, cached as immutable since the name changes with the
+content. Files whose source is unchanged are not rebuilt.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+
+from flask import request, send_from_directory, url_for
+
+try:
+    import brotli
+except ImportError:  # optional dependency, only .gz variants are built
+    brotli = None
+
+try:
+    import rcssmin
+    import rjsmin
+except ImportError:  # optional dependency, the simple minifiers below are used
+    rcssmin = rjsmin = None
+
+STATIC_DIR = "static"
+DIST = "dist"
+MANIFEST = "manifest.json"
+
+# Bump when minification or the output layout changes
+ASSET_VERSION = 2
+
+COMPRESSIBLE = {".css", ".js", ".json", ".geojson", ".svg", ".txt", ".html"}
+
+# Hashed names never change content, so they can be cached for a year
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+# Quoted strings are kept whole; comments and the code between them are minified
+_CSS_TOKENS = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|(/\*.*?\*/)|([^"\'/]+|/)', re.S)
+
+
+def minify_css(text):
+    """Drop comments and collapse whitespace (quoted strings kept as is)"""
+    if rcssmin:
+        return rcssmin.cssmin(text)
+
+    def token(match):
+        string, comment, code = match.groups()
+        if string:
+            return string
+        if comment:
+            return ""
+        code = re.sub(r"\s*([{};,>])\s*", r"\1", re.sub(r"\s+", " ", code))
+        return code.replace(";}", "}")
+
+    return _CSS_TOKENS.sub(token, text).strip()
+
+
+def minify_js(text):
+    """Strip indentation and blank lines (safe without a JS parser)"""
+    if rjsmin:
+        return rjsmin.jsmin(text)
+    lines = (line.strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+MINIFIERS = {".css": minify_css, ".js": minify_js}
+
+
+def _source_files(static_dir):
+    dist = os.path.join(static_dir, DIST)
+    for root, dirs, files in os.walk(static_dir):
+        if os.path.abspath(root).startswith(os.path.abspath(dist)):
+            continue
+        for name in files:
+            path = os.path.join(root, name)
+            yield os.path.relpath(path, static_dir).replace(os.sep, "/"), path
+
+
+def _write(path, data):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(data)
+    os.replace(tmp, path)
+
+
+def _read_manifest(path):
+    try:
+        with open(path) as fh:
+            manifest = json.load(fh)
+        return manifest if manifest.get("version") == ASSET_VERSION else None
+    except (OSError, ValueError):
+        return None
+
+
+def build_assets(static_dir=STATIC_DIR):
+    """
+    Build static/dist and its manifest; returns {source name: hashed name}.
+    Sources whose SHA-1 matches the manifest are skipped.
+    """
+    dist_dir = os.path.join(static_dir, DIST)
+    manifest_path = os.path.join(dist_dir, MANIFEST)
+    old = _read_manifest(manifest_path) or {"files": {}}
+    files = {}
+
+    for name, path in _source_files(static_dir):
+        with open(path, "rb") as fh:
+            source = fh.read()
+        source_sha = hashlib.sha1(source).hexdigest()
+
+        previous = old["files"].get(name)
+        if previous and previous["source"] == source_sha and os.path.exists(os.path.join(dist_dir, previous["asset"])):
+            files[name] = previous
+            continue
+
+        base, ext = os.path.splitext(name)
+        data = source
+        if ext in MINIFIERS:
+            data = MINIFIERS[ext](source.decode("utf-8")).encode("utf-8")
+
+        asset = f"{base}.{hashlib.md5(data).hexdigest()[:10]}{ext}"
+        target = os.path.join(dist_dir, asset)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        _write(target, data)
+        if ext in COMPRESSIBLE:
+            _write(f"{target}.gz", gzip.compress(data, compresslevel=9, mtime=0))
+            if brotli:
+                _write(f"{target}.br", brotli.compress(data, quality=11))
+
+        files[name] = {"asset": asset, "source": source_sha, "size": len(source), "minified": len(data)}
+
+    # Remove outputs no longer referenced
+    current = {entry["asset"] for entry in files.values()}
+    for name, _ in _source_files(dist_dir):
+        plain = re.sub(r"\.(gz|br)$", "", name)
+        if name != MANIFEST and plain not in current:
+            os.remove(os.path.join(dist_dir, name))
+
+    if files != old["files"]:
+        os.makedirs(dist_dir, exist_ok=True)
+        _write(manifest_path, json.dumps({"version": ASSET_VERSION, "files": files}, indent=1).encode())
+
+    return {name: entry["asset"] for name, entry in files.items()}
+
+
+def init_static_assets(app, static_dir=STATIC_DIR):
+    """Build the assets and add asset_url() and the /static/dist/ route to the app"""
+    dist_dir = os.path.abspath(os.path.join(static_dir, DIST))
+    try:
+        assets = build_assets(static_dir)
+    except Exception as e:
+        # Pages still work from the plain static files
+        print(f"Static asset build failed, serving unbuilt files: {e}")
+        assets = {}
+
+    @app.context_processor
+    def asset_helpers():
+        def asset_url(filename):
+            """Hashed URL of a static file (the plain one while debugging)"""
+            asset = assets.get(filename)
+            if app.debug or asset is None:
+                return url_for("static", filename=filename)
+            return url_for("static", filename=f"{DIST}/{asset}")
+        return {"asset_url": asset_url}
+
+    @app.route(f"/static/{DIST}/<path:filename>")
+    def hashed_static(filename):
+        mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+        accepted = request.accept_encodings
+        for encoding, suffix in (("br", ".br"), ("gzip", ".gz")):
+            if accepted[encoding] and os.path.isfile(os.path.join(dist_dir, filename + suffix)):
+                response = send_from_directory(dist_dir, filename + suffix, mimetype=mimetype)
+                response.headers["Content-Encoding"] = encoding
+                break
+        else:
+            response = send_from_directory(dist_dir, filename, mimetype=mimetype)
+
+        response.vary.add("Accept-Encoding")
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = IMMUTABLE_MAX_AGE
+        response.cache_control.immutable = True
+        return response
+
+    return assets
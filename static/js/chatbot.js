@@ -94,18 +94,46 @@ async function sendAssistantQuery() {
     body.scrollTop = body.scrollHeight;
 
     try {
-        const res = await fetch("/chat", {
+        const res = await fetch("/chat/stream", {
             method: "POST",
             headers: { "Content-Type": "application/json" },
             body: JSON.stringify({ message })
         });
 
-        const data = await res.json();
-
-        clearInterval(dotInterval);
-        body.removeChild(typing);
+        if (!res.ok || !res.body) throw new Error(`HTTP ${res.status}`);
+
+        // The answer renders as soon as its data arrives; the AI insight
+        // is then written into it as it streams
+        let card = null;
+        let insightEl = null;
+        let streamed = "";
+        let data = null;
+
+        await readEventStream(res, (event, payload) => {
+            if (event === "response") {
+                clearInterval(dotInterval);
+                body.removeChild(typing);
+
+                appendEnhancedResponse(payload);
+                card = body.lastElementChild;
+                insightEl = card ? card.querySelector(".assistant-summary") : null;
+            } else if (event === "insight" && insightEl) {
+                streamed += payload.text;
+                insightEl.textContent = streamed;
+                body.scrollTop = body.scrollHeight;
+            } else if (event === "done") {
+                data = payload;
+                if (insightEl) {
+                    insightEl.textContent = payload.insight || payload.summary || "";
+                } else if (card && payload.insight) {
+                    // No insight box to stream into: re-render the final answer
+                    body.removeChild(card);
+                    appendEnhancedResponse(payload);
+                }
+            }
+        });
 
-        appendEnhancedResponse(data);
+        if (!data) throw new Error("Incomplete response stream");
 
         // Show follow-up suggestions if available
         if (data.followup_suggestions && data.followup_suggestions.length > 0) {
@@ -117,7 +145,7 @@ async function sendAssistantQuery() {
 
     } catch (err) {
         clearInterval(dotInterval);
-        body.removeChild(typing);
+        if (typing.parentNode) body.removeChild(typing);
 
         const errorDiv = document.createElement("div");
         errorDiv.className = "assistant-error";
@@ -128,6 +156,34 @@ async function sendAssistantQuery() {
     body.scrollTop = body.scrollHeight;
 }
 
+/* Server-Sent Events over fetch (EventSource cannot POST) */
+async function readEventStream(res, onEvent) {
+    const reader = res.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = "";
+
+    while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        // Events are separated by a blank line
+        let boundary;
+        while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+            const block = buffer.slice(0, boundary);
+            buffer = buffer.slice(boundary + 2);
+
+            let event = "message";
+            let dataLines = [];
+            block.split("\n").forEach(line => {
+                if (line.startsWith("event:")) event = line.slice(6).trim();
+                else if (line.startsWith("data:")) dataLines.push(line.slice(5).trim());
+            });
+            if (dataLines.length) onEvent(event, JSON.parse(dataLines.join("\n")));
+        }
+    }
+}
+
 /* Enhanced Response Rendering */
 function appendEnhancedResponse(payload) {
     const body = document.getElementById("assistantBody");
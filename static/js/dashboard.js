@@ -61,11 +61,53 @@ function destroyAllCharts() {
     if (ageGenderChart) ageGenderChart.destroy();
 }
 
+/* ---------- BATCHED API CALLS ---------- */
+// GETs issued in the same tick go out together as one /api/batch request
+let pendingQueries = null;
+
+function apiGet(url) {
+    if (!pendingQueries) {
+        pendingQueries = [];
+        setTimeout(flushQueries, 0);
+    }
+    return new Promise((resolve, reject) => {
+        pendingQueries.push({ url, resolve, reject });
+    });
+}
+
+function flushQueries() {
+    const queries = pendingQueries;
+    pendingQueries = null;
+
+    // A lone request keeps its own URL (and its own HTTP cache entry)
+    if (queries.length === 1) {
+        const q = queries[0];
+        fetch(q.url).then(res => res.json()).then(q.resolve, q.reject);
+        return;
+    }
+
+    const params = new URLSearchParams();
+    queries.forEach((q, i) => params.append(`q${i}`, q.url));
+
+    fetch(`/api/batch?${params}`)
+        .then(res => res.json())
+        .then(data => {
+            queries.forEach((q, i) => {
+                const result = data.results && data.results[`q${i}`];
+                if (result && result.status === 200) {
+                    q.resolve(result.data);
+                } else {
+                    q.reject(new Error((result && result.data && result.data.error) || "Batch query failed"));
+                }
+            });
+        })
+        .catch(err => queries.forEach(q => q.reject(err)));
+}
+
 /* ---------- LOADERS ---------- */
 
 function loadCities(year) {
-    return fetch(`/api/cities?year=${year}`)
-        .then(res => res.json())
+    return apiGet(`/api/cities?year=${year}`)
         .then(data => {
             const cityFilter = document.getElementById("cityFilter");
             cityFilter.innerHTML = `<option value="all">All</option>`;
@@ -76,8 +118,7 @@ function loadCities(year) {
 }
 
 function loadYearTrend() {
-    fetch("/api/year-trend")
-        .then(res => res.json())
+    apiGet("/api/year-trend")
         .then(data => {
 
             const labels = Object.keys(data);
@@ -126,8 +167,7 @@ function loadYearTrend() {
 
 function loadCityComparison(year) {
 
-    fetch(`/api/city-comparison?year=${year}`)
-        .then(res => res.json())
+    apiGet(`/api/city-comparison?year=${year}`)
         .then(data => {
 
             const labels = Object.keys(data);
@@ -174,8 +214,7 @@ function loadCityComparison(year) {
 
 function loadGenderCityComparison(gender) {
 
-    fetch(`/api/gender-city-comparison?gender=${gender}`)
-        .then(res => res.json())
+    apiGet(`/api/gender-city-comparison?gender=${gender}`)
         .then(data => {
 
             const labels = Object.keys(data);
@@ -230,8 +269,7 @@ function loadGenderCityComparison(gender) {
 
 function loadAgeGenderTrend(age, gender) {
 
-    fetch(`/api/age-gender-trend?age=${age}&gender=${gender}`)
-        .then(res => res.json())
+    apiGet(`/api/age-gender-trend?age=${age}&gender=${gender}`)
         .then(data => {
 
             const labels = Object.keys(data);
@@ -331,8 +369,7 @@ function loadPie(grand, filtered) {
 
 function loadCityProfile(year, city, age, gender) {
 
-    fetch(`/api/city-profile?year=${year}&city=${city}&age=${age}&gender=${gender}`)
-        .then(res => res.json())
+    apiGet(`/api/city-profile?year=${year}&city=${city}&age=${age}&gender=${gender}`)
         .then(data => {
 
             const labels = Object.keys(data);
@@ -484,8 +521,7 @@ if (year !== "all" && city === "all" && age === "all" && gender !== "all") {
     // 5️⃣ City selected → detailed
     showOnly("mainCharts");
 
-    fetch(`/api/filter?year=${year}&city=${city}&age=${age}&gender=${gender}`)
-        .then(res => res.json())
+    apiGet(`/api/filter?year=${year}&city=${city}&age=${age}&gender=${gender}`)
         .then(data => loadPie(data.grand_total, data.filtered_total));
 
     if (city !== "all") {
@@ -503,9 +539,17 @@ document.addEventListener("DOMContentLoaded", () => {
     const genderFilter = document.getElementById("genderFilter");
     const resetBtn     = document.getElementById("resetBtn");
 
+    // City list and charts for a year, requested together in one batch
+    // (the charts use City = All, which loadCities selects anyway)
+    function reloadCitiesAndCharts(year) {
+        cityFilter.innerHTML = `<option value="all">All</option>`;
+        loadCities(year);
+        applyFilters();
+    }
+
     // 🔥 AUTO APPLY ON CHANGE
     yearFilter.addEventListener("change", () => {
-        loadCities(yearFilter.value).then(applyFilters);
+        reloadCitiesAndCharts(yearFilter.value);
     });
 
     cityFilter.addEventListener("change", applyFilters);
@@ -518,17 +562,16 @@ document.addEventListener("DOMContentLoaded", () => {
         cityFilter.value = "all";
         ageFilter.value = "all";
         genderFilter.value = "all";
-        loadCities("all").then(applyFilters);
+        reloadCitiesAndCharts("all");
     });
 
     // Initial load
-    loadCities("all").then(applyFilters);
+    reloadCitiesAndCharts("all");
 });
 
 function loadAgeTrend(age) {
 
-    fetch(`/api/age-trend?age=${age}`)
-        .then(res => res.json())
+    apiGet(`/api/age-trend?age=${age}`)
         .then(data => {
 
             const labels = Object.keys(data);
@@ -576,8 +619,7 @@ function loadAgeTrend(age) {
 
 function loadYearGenderCityComparison(year, gender) {
 
-    fetch(`/api/year-gender-city?year=${year}&gender=${gender}`)
-        .then(res => res.json())
+    apiGet(`/api/year-gender-city?year=${year}&gender=${gender}`)
         .then(data => {
 
             const labels = Object.keys(data);
@@ -628,8 +670,7 @@ function loadYearGenderCityComparison(year, gender) {
 
 function loadYearFilteredCityComparison(year, age, gender) {
 
-    fetch(`/api/year-city-filter?year=${year}&age=${age}&gender=${gender}`)
-        .then(res => res.json())
+    apiGet(`/api/year-city-filter?year=${year}&age=${age}&gender=${gender}`)
         .then(data => {
 
             const labels = Object.keys(data);
@@ -45,22 +45,25 @@ function formatIndianNumber(num) {
 
 /* ---------------- LOAD KPI DATA ---------------- */
 function loadForeignKPIData(year = 'all', crime = 'all') {
-    fetch(`/api/foreigner-data?year=${year}&crime=${crime}`)
+    // Only the Crime Head column is needed, as compact row arrays
+    fetch(`/api/foreigner-data?year=${year}&crime=${crime}&fields=Crime%20Head&format=columnar`)
         .then(res => res.json())
         .then(data => {
             if (data.rows && data.rows.length > 0) {
                 // Calculate KPIs from the data
-                let totalForeignCases = data.rows.length;
+                let totalForeignCases = data.total_rows;
                 let crimeFrequency = {};
                 let cityFrequency = {};
+                const crimeIndex = data.columns.indexOf('Crime Head');
+                const cityIndex = data.columns.indexOf('City');
                 
                 data.rows.forEach(row => {
                     // Count crime types
-                    const crimeType = row['Crime Head'] || 'Unknown';
+                    const crimeType = row[crimeIndex] || 'Unknown';
                     crimeFrequency[crimeType] = (crimeFrequency[crimeType] || 0) + 1;
                     
                     // Count cities
-                    const city = row['City'] || 'Unknown';
+                    const city = (cityIndex >= 0 && row[cityIndex]) || 'Unknown';
                     cityFrequency[city] = (cityFrequency[city] || 0) + 1;
                 });
                 
@@ -126,7 +129,7 @@ function loadTable(year, crime, page = 1) {
     // Show loading state
     table.innerHTML = '<div class="table-loading">Loading foreign crime data...</div>';
 
-    fetch(`/api/foreigner-data?year=${year}&crime=${crime}`)
+    fetch(`/api/foreigner-data?year=${year}&crime=${crime}&page=${page}&per_page=${rowsPerPage}&format=columnar`)
         .then(res => {
             if (!res.ok) {
                 throw new Error(`HTTP error! status: ${res.status}`);
@@ -161,7 +164,7 @@ function loadTable(year, crime, page = 1) {
             data.rows.forEach(row => {
                 tbody += "<tr>";
                 data.columns.forEach((col, index) => {
-                    const value = row[col] ?? "";
+                    const value = row[index] ?? "";
                     const formattedValue = (typeof value === 'number' && value > 1000) ? 
                         formatIndianNumber(value) : value;
                     
@@ -176,6 +179,8 @@ function loadTable(year, crime, page = 1) {
             tbody += "</tbody>";
 
             table.innerHTML = thead + tbody;
+
+            createPagination(data.total_rows, year, crime);
             
             // Update KPIs when table loads
             loadForeignKPIData(year, crime);
@@ -71,7 +71,7 @@ function loadTable(year, crime, page = 1) {
     const table = document.getElementById("govTable");
     table.innerHTML = '<div class="table-loading">Loading government crime data...</div>';
 
-    fetch(`/api/gov-data?year=${year}&crime=${crime}&page=${page}&per_page=${rowsPerPage}`)
+    fetch(`/api/gov-data?year=${year}&crime=${crime}&page=${page}&per_page=${rowsPerPage}&format=columnar`)
         .then(res => {
             if (!res.ok) {
                 throw new Error(`HTTP error! status: ${res.status}`);
@@ -107,7 +107,7 @@ function loadTable(year, crime, page = 1) {
                 tbody += "<tr>";
 
                 data.columns.forEach((col, index) => {
-                    const value = row[col] ?? "";
+                    const value = row[index] ?? "";
                     const formattedValue = (typeof value === 'number' && value > 1000) ? 
                         formatIndianNumber(value) : value;
                     
@@ -130,6 +130,12 @@ document.addEventListener("DOMContentLoaded", () => {
     
     // Load premium KPIs with enhanced formatting
     function initPremiumKPIs() {
+        // The KPI cards are rendered by the server; fetch only if they are missing
+        const arrestsCard = document.getElementById("total-arrests");
+        if (arrestsCard && arrestsCard.dataset.value) {
+            return;
+        }
+
         fetch("/api/home-kpis")
             .then(res => res.json())
             .then(data => {
@@ -39,6 +39,11 @@ function formatIndianNumber(num) {
 
 document.addEventListener("DOMContentLoaded", () => {
 
+    // The summary is rendered by the server; fetch it only if it is missing
+    if (document.getElementById("totalArrestsText").textContent.trim() !== "--") {
+        return;
+    }
+
     fetch("/api/reports-summary")
         .then(res => res.json())
         .then(data => {
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test /api/batch: the allowlist, the query limit, and one failing
+sub-query next to working ones
+"""
+import logging
+
+from app import app
+from routes.batch_routes import MAX_BATCH_QUERIES
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_batch():
+    print("📦 Testing the batch API")
+    print("=" * 60)
+    client = app.test_client()
+    results = []
+
+    # 1. Read-only data APIs batch; pages, chat and unknown paths don't
+    body = client.post("/api/batch", json={"queries": {
+        "trend": "/api/year-trend",
+        "cities": "/api/cities?year=2020",
+        "page": "/",
+        "chat": "/chat",
+        "missing": "/api/nothing-here",
+    }}).get_json()["results"]
+    statuses = {key: result["status"] for key, result in body.items()}
+    ok = statuses == {"trend": 200, "cities": 200, "page": 400, "chat": 404, "missing": 404}
+    ok = ok and body["trend"]["data"] == client.get("/api/year-trend").get_json()
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Allowlist {statuses}")
+
+    # 2. At most MAX_BATCH_QUERIES sub-queries (and at least one)
+    limit = client.post("/api/batch", json={"queries": {str(i): "/api/year-trend" for i in range(MAX_BATCH_QUERIES)}})
+    over = client.post("/api/batch", json={"queries": {str(i): "/api/year-trend" for i in range(MAX_BATCH_QUERIES + 1)}})
+    empty = client.get("/api/batch")
+    ok = limit.status_code == 200 and over.status_code == 400 and empty.status_code == 400
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} {MAX_BATCH_QUERIES} queries -> {limit.status_code}, "
+          f"{MAX_BATCH_QUERIES + 1} -> {over.status_code}, none -> {empty.status_code}")
+
+    # 3. One sub-query raising: a 500 for it, the others still answered, traceback logged
+    endpoint, _ = app.url_map.bind("localhost").match("/api/cities")
+    original = app.view_functions[endpoint]
+    handler = RecordingHandler()
+
+    def broken():
+        raise ValueError("broken view")
+
+    app.view_functions[endpoint] = broken
+    app.logger.addHandler(handler)
+    try:
+        body = client.post("/api/batch", json={"queries": {
+            "cities": "/api/cities?year=2020",
+            "trend": "/api/year-trend",
+        }}).get_json()["results"]
+    finally:
+        app.view_functions[endpoint] = original
+        app.logger.removeHandler(handler)
+    logged = [r for r in handler.records if "Batch query /api/cities?year=2020 failed" in r.getMessage()]
+    ok = (
+        body["cities"]["status"] == 500 and "broken view" in body["cities"]["data"]["error"]
+        and body["trend"]["status"] == 200
+        and len(logged) == 1 and logged[0].exc_info is not None
+    )
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Failing sub-query -> {body['cities']['status']}, "
+          f"others -> {body['trend']['status']}, {len(logged)} logged with traceback")
+
+    print()
+    print("=" * 60)
+    print(f"🎯 {sum(results)}/{len(results)} checks passed")
+    assert all(results), f"{len(results) - sum(results)} of {len(results)} checks failed"
+
+
+if __name__ == "__main__":
+    test_batch()
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Test /chat/stream and the parser for Groq's event stream against a local
+fake server that streams an insight (or drops the connection partway)
+"""
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# Extraction stays local; only the insight is streamed from the fake server
+os.environ["FAST_PATH_MIN_CONFIDENCE"] = "0"
+
+import services.insight_generator as insight_generator
+from app import app
+from services.cache_manager import chatbot_cache, message_cache
+from services.llm_guard import groq_breaker
+
+CHUNKS = ["Delhi ", "leads ", "in 2020."]
+
+
+class FakeGroqStream(BaseHTTPRequestHandler):
+    """Streams CHUNKS as chat completion deltas; `mode` is ok / cut / error"""
+    protocol_version = "HTTP/1.1"
+    mode = "ok"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if FakeGroqStream.mode == "error":
+            body = b'{"error": "down"}'
+            self.send_response(500)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        events = [": keep-alive", ""]
+        events += [f"data: {json.dumps({'choices': [{'delta': {'content': text}}]})}\n" for text in CHUNKS]
+        if FakeGroqStream.mode == "cut":
+            # Two deltas, then the connection drops without the final chunk
+            events = events[:4]
+        else:
+            events.append("data: [DONE]\n")
+        for event in events:
+            data = (event + "\n").encode()
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+        if FakeGroqStream.mode == "cut":
+            self.close_connection = True
+            return
+        self.wfile.write(b"0\r\n\r\n")
+
+    def handle(self):
+        try:
+            super().handle()
+        except ConnectionResetError:
+            pass  # the client closing its keep-alive connection
+
+    def log_message(self, *args):
+        pass
+
+
+def parse_sse(body):
+    """[(event, data)] from a text/event-stream body"""
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def stream(client, message, mode):
+    FakeGroqStream.mode = mode
+    message_cache.clear()
+    chatbot_cache.clear()
+    response = client.post("/chat/stream", json={"message": message})
+    return response, parse_sse(response.get_data(as_text=True))
+
+
+def test_chat_stream():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGroqStream)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    originals = insight_generator.GROQ_URL, insight_generator.LLM_INSIGHTS
+    insight_generator.GROQ_URL = f"http://127.0.0.1:{server.server_port}/openai/v1/chat/completions"
+    insight_generator.LLM_INSIGHTS = "async"
+    groq_breaker.__init__("groq", failure_threshold=100, reset_timeout=30)
+    try:
+        run_checks()
+    finally:
+        server.shutdown()
+        insight_generator.GROQ_URL, insight_generator.LLM_INSIGHTS = originals
+        groq_breaker.__init__("groq")
+        message_cache.clear()
+        chatbot_cache.clear()
+
+
+def run_checks():
+    print("📡 Testing the streaming chat endpoint")
+    print("=" * 60)
+    client = app.test_client()
+    results = []
+
+    # 1. Parser: deltas in order, comments / blank lines skipped, stops at [DONE]
+    FakeGroqStream.mode = "ok"
+    parts = list(insight_generator.stream_insight("prompt"))
+    ok = parts == CHUNKS
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} stream_insight -> {parts}")
+
+    # 2. Parser: a non-200 and a dropped stream both raise (the latter after its deltas)
+    FakeGroqStream.mode = "error"
+    try:
+        list(insight_generator.stream_insight("prompt"))
+        raised = False
+    except RuntimeError:
+        raised = True
+    FakeGroqStream.mode = "cut"
+    parts = []
+    groq_breaker.__init__("groq", failure_threshold=100, reset_timeout=30)
+    try:
+        for text in insight_generator.stream_insight("prompt"):
+            parts.append(text)
+    except requests.RequestException:
+        pass
+    else:
+        raised = False
+    ok = raised and parts == CHUNKS[:2] and groq_breaker.failures == 1
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} 500 and dropped stream raise; {len(parts)} deltas before the drop")
+
+    # 3. Endpoint framing: response first, insight deltas, then done with the full insight
+    response, events = stream(client, "murder in 2020", "ok")
+    names = [name for name, _ in events]
+    done = events[-1][1]
+    ok = (
+        response.mimetype == "text/event-stream"
+        and names == ["response"] + ["insight"] * len(CHUNKS) + ["done"]
+        and [data["text"] for name, data in events if name == "insight"] == CHUNKS
+        and done["insight"] == "".join(CHUNKS)
+    )
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Events {names}")
+
+    # 4. /chat (async insights) gets the answer without the streamed insight
+    cached = client.post("/chat", json={"message": "murder in 2020"}).get_json()
+    ok = cached.get("cached") and cached.get("insight") == events[0][1]["insight"] != done["insight"]
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Message tier keeps the local insight for /chat")
+
+    # 5. Upstream drops partway: the stream still ends with done, local insight
+    response, events = stream(client, "murder in 2020", "cut")
+    names = [name for name, _ in events]
+    ok = (
+        response.status_code == 200
+        and names[0] == "response" and names[-1] == "done"
+        and events[-1][1]["insight"] == events[0][1]["insight"]
+    )
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Dropped upstream: {names}, done carries the local insight")
+
+    print("\n" + "=" * 60)
+    print(f"🎯 {sum(results)}/{len(results)} checks passed")
+    assert all(results), f"{len(results) - sum(results)} of {len(results)} checks failed"
+
+
+if __name__ == "__main__":
+    test_chat_stream()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test negotiated gzip compression of JSON responses
+"""
+import gzip
+import json
+
+from app import app
+from services.compression import compressed_cache
+
+
+def test_compression():
+    print("🗜️ Testing JSON response compression")
+    print("=" * 60)
+    client = app.test_client()
+    compressed_cache.clear()
+    results = []
+
+    # 1. Large JSON is gzipped when accepted, same body once decoded
+    plain = client.get("/api/gov-data?page=1")
+    packed = client.get("/api/gov-data?page=1", headers={"Accept-Encoding": "gzip"})
+    ok = (
+        packed.headers.get("Content-Encoding") == "gzip"
+        and json.loads(gzip.decompress(packed.data)) == plain.get_json()
+        and "Accept-Encoding" in packed.headers.get("Vary", "")
+    )
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} gzip {len(plain.data)} -> {len(packed.data)} bytes")
+
+    # 2. Identity when not accepted
+    ok = "Content-Encoding" not in plain.headers
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} No encoding without Accept-Encoding")
+
+    # 3. The encoded copy has its own ETag and revalidates to 304
+    etag = packed.headers.get("ETag")
+    again = client.get("/api/gov-data?page=1", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    ok = etag != plain.headers.get("ETag") and again.status_code == 304 and again.headers.get("ETag") == etag
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} ETag {etag} -> {again.status_code}")
+
+    # 4. Repeats are served from the compressed cache
+    client.get("/api/gov-data?page=1", headers={"Accept-Encoding": "gzip"})
+    ok = compressed_cache.stats()["hits"] >= 1
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Compressed cache {compressed_cache.stats()}")
+
+    # 5. Small bodies and pages are left alone
+    small = client.get("/api/home-kpis", headers={"Accept-Encoding": "gzip"})
+    page = client.get("/", headers={"Accept-Encoding": "gzip"})
+    ok = "Content-Encoding" not in small.headers and "Content-Encoding" not in page.headers
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Small JSON ({len(small.data)} bytes) and HTML not compressed")
+
+    print()
+    print("=" * 60)
+    print(f"🎯 {sum(results)}/{len(results)} checks passed")
+    assert all(results), f"{len(results) - sum(results)} of {len(results)} checks failed"
+
+
+if __name__ == "__main__":
+    test_compression()
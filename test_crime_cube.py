@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Test the crime aggregate cube, city index and per-city totals against the
+per-request DataFrame computations they replaced (on the full CSVs,
+NCRB grand-total row included)
+"""
+import pandas as pd
+
+from services.analytics_engine import year_city_totals
+from services.city_index import city_index
+from services.crime_cube import crime_cube
+from services.data_loader import CRIME_DATA_PATHS, crime_data, crime_totals, load_csv, normalize_crime
+from services.helpers import POP_COLUMNS, find_column, normalize_city_key
+
+# The CSVs as every handler used to read them: all rows, total row last
+FULL = {year: normalize_crime(load_csv(path)) for year, path in CRIME_DATA_PATHS.items()}
+
+
+def city_rows(df):
+    df = df[df["City"].notna()]
+    return df[~df["City"].str.lower().str.contains("total", na=False)]
+
+
+def same(cube_sums, frame):
+    expected = frame.sum(numeric_only=True)
+    return all(int(cube_sums.get(col, 0)) == int(value) for col, value in expected.items())
+
+
+def test_crime_cube():
+    print("🧮 Testing the crime cube against the DataFrame computations")
+    print("=" * 60)
+    results = []
+
+    # 1. split_total: city rows plus the grand-total row give back the CSV
+    ok = all(
+        len(crime_data[year]) == len(df) - 1
+        and crime_totals[year].equals(df.iloc[-1])
+        and crime_data[year].equals(df.iloc[:-1].reset_index(drop=True))
+        for year, df in FULL.items()
+    )
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Grand-total row split off and kept per year")
+
+    # 2. totals(): every row summed, grand-total row included (old df.sum())
+    ok = all(same(crime_cube.totals(year), df) for year, df in FULL.items())
+    ok = ok and same(crime_cube.totals("all"), pd.concat(FULL.values(), ignore_index=True))
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} totals(year) and totals('all') match df.sum()")
+
+    # 3. totals(year, city): rows of one City label
+    checked = 0
+    ok = True
+    for year, df in FULL.items():
+        for city in df["City"].dropna().unique()[:5]:
+            ok = ok and same(crime_cube.totals(year, city), df[df["City"] == city])
+            checked += 1
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} totals(year, city) for {checked} city labels")
+
+    # 4. city_total(): real city rows only (grand-total row excluded)
+    expected = {}
+    for year, df in FULL.items():
+        total_col = find_column(df, ["Total", "Arrested"])
+        expected[year] = int(city_rows(df)[total_col].sum())
+    actual = {year: crime_cube.city_total(year) for year in FULL}
+    ok = actual == expected
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} city_total per year {actual}")
+
+    # 5. select(): one year or all of them
+    ok = crime_cube.select("2020") == [crime_cube.year("2020")] and len(crime_cube.select("all")) == len(FULL)
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} select('2020') / select('all')")
+
+    # 6. by_normalized_city: old gender-city comparison (labels collapsed)
+    ok = True
+    for gender in ("Male", "Female"):
+        col = f"Total - {gender}"
+        frames = []
+        for df in FULL.values():
+            d = df.assign(City=df["City"].astype(str).map(normalize_city_key))
+            frames.append(d[~d["City"].str.contains("total") & (d["City"] != "nan") & (d["City"] != "")])
+        old = pd.concat(frames).groupby("City")[col].sum()
+        new = crime_cube.by_normalized_city[col]
+        ok = ok and old.sort_index().astype(int).to_dict() == new.sort_index().astype(int).to_dict()
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} by_normalized_city matches the label-collapsed groupby")
+
+    # 7. Population comes from the grand-total row of the latest year
+    last = FULL[max(FULL)].iloc[-1]
+    ok = crime_cube.population == {key: int(last[col]) for key, col in POP_COLUMNS.items() if col in last.index}
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Population {crime_cube.population}")
+
+    # 8. year_city_totals: vectorized per-city totals in CSV order
+    ok = True
+    for year, df in FULL.items():
+        for gender, col in ((None, "Total - Total Persons Arrested by age and Sex"), ("male", "Total - Male")):
+            rows = city_rows(df)
+            old = list(zip(rows["City"], rows[col].astype(int)))
+            ok = ok and list(year_city_totals(year, gender).items()) == old
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} year_city_totals matches the filtered rows")
+
+    # 9. City index: aliases resolve to the row the substring scan found
+    ok = True
+    checked = 0
+    for year, df in FULL.items():
+        for city in city_rows(df)["City"].head(8):
+            name = city.split("(")[0].strip()
+            old = df[df["City"].str.lower().str.contains(name.lower(), na=False, regex=False)].iloc[0]
+            row = city_index.row(year, name)
+            ok = ok and row is not None and row["City"] == old["City"]
+            checked += 1
+    ok = ok and city_index.row("2020", "not a city") is None and city_index.row("2020", "total") is None
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} city_index.row for {checked} names, unknown and 'total' -> None")
+
+    print()
+    print("=" * 60)
+    print(f"🎯 {sum(results)}/{len(results)} checks passed")
+    assert all(results), f"{len(results) - sum(results)} of {len(results)} checks failed"
+
+
+if __name__ == "__main__":
+    test_crime_cube()
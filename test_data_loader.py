@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test that the shared data frames stay untouched by request handlers
+"""
+import os
+
+import pandas as pd
+
+# Never call the LLM
+os.environ["FAST_PATH_MIN_CONFIDENCE"] = "0"
+os.environ["LLM_INSIGHTS"] = "off"
+
+from app import app
+from services.data_loader import crime_data, foreign_data, gov_data
+
+
+def fingerprint():
+    frames = {f"crime {y}": df for y, df in crime_data.items()}
+    frames.update({f"gov {y}": df for y, df in gov_data.items()})
+    frames.update({f"foreign {y}": df for y, df in foreign_data.items()})
+    return {name: int(pd.util.hash_pandas_object(df, index=True).sum()) for name, df in frames.items()}
+
+
+def test_data_loader():
+    print("🧱 Testing shared data frames")
+    print("=" * 60)
+    results = []
+
+    # 1. Pandas' global copy semantics are left at the library default
+    ok = not pd.get_option("mode.copy_on_write")
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} mode.copy_on_write not switched on globally")
+
+    # 2. Handlers that filter and derive columns don't write back
+    before = fingerprint()
+    client = app.test_client()
+    for message in ("top juvenile cities 2020", "juvenile girls Delhi 2019", "murder in 2020",
+                    "top 5 cities 2020", "foreigner crimes 2020"):
+        client.post("/chat", json={"message": message})
+    for url in ("/api/juvenile-cities?year=2020", "/api/gov-data?year=all", "/api/foreigner-data",
+                "/api/year-city-filter?year=2020&age=18-30&gender=female"):
+        client.get(url)
+    changed = [name for name, value in fingerprint().items() if before[name] != value]
+    ok = not changed
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Frames unchanged after chat and API calls {changed or ''}")
+
+    print()
+    print("=" * 60)
+    print(f"🎯 {sum(results)}/{len(results)} checks passed")
+    assert all(results), f"{len(results) - sum(results)} of {len(results)} checks failed"
+
+
+if __name__ == "__main__":
+    test_data_loader()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test ETag / Last-Modified revalidation of the read-only dashboard APIs
+"""
+from app import app
+
+
+def test_http_cache():
+    print("🏷️ Testing HTTP revalidation of the data APIs")
+    print("=" * 60)
+    client = app.test_client()
+    results = []
+
+    # 1. Data responses carry validators and a max-age
+    first = client.get("/api/gov-data?year=2019&page=1")
+    etag = first.headers.get("ETag")
+    ok = first.status_code == 200 and etag and "max-age" in first.headers.get("Cache-Control", "")
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} 200 with ETag {etag} / {first.headers.get('Cache-Control')}")
+
+    # 2. Same query (args in any order) revalidates to an empty 304
+    again = client.get("/api/gov-data?page=1&year=2019", headers={"If-None-Match": etag})
+    ok = again.status_code == 304 and not again.data and again.headers.get("ETag") == etag
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} If-None-Match -> {again.status_code}")
+
+    # 3. Other query args get another ETag
+    other = client.get("/api/gov-data?year=2020&page=1", headers={"If-None-Match": etag})
+    ok = other.status_code == 200 and other.headers.get("ETag") != etag
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Different query -> {other.status_code}")
+
+    # 4. If-Modified-Since works on its own
+    modified = client.get("/api/home-kpis", headers={"If-Modified-Since": first.headers["Last-Modified"]})
+    ok = modified.status_code == 304
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} If-Modified-Since -> {modified.status_code}")
+
+    # 5. A gzip ETag only revalidates for a client that still accepts gzip
+    packed = client.get("/api/gov-data?year=2019&page=1", headers={"Accept-Encoding": "gzip"})
+    gzip_etag = packed.headers.get("ETag")
+    accepted = client.get("/api/gov-data?year=2019&page=1",
+                          headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag})
+    identity = client.get("/api/gov-data?year=2019&page=1", headers={"If-None-Match": gzip_etag})
+    refused = client.get("/api/gov-data?year=2019&page=1",
+                         headers={"Accept-Encoding": "gzip;q=0", "If-None-Match": gzip_etag})
+    ok = (
+        gzip_etag != etag and accepted.status_code == 304 and accepted.headers.get("ETag") == gzip_etag
+        and identity.status_code == 200 and refused.status_code == 200
+        and "Content-Encoding" not in identity.headers and identity.headers.get("ETag") == etag
+    )
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} {gzip_etag}: gzip client -> {accepted.status_code}, "
+          f"identity -> {identity.status_code}, gzip;q=0 -> {refused.status_code}")
+
+    # 6. Errors and the chat API are never marked cacheable
+    error = client.get("/api/gov-data?fields=Nope")
+    chat = client.post("/chat", json={"message": "hello"})
+    ok = "ETag" not in error.headers and "ETag" not in chat.headers
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} No validators on errors ({error.status_code}) or /chat")
+
+    print()
+    print("=" * 60)
+    print(f"🎯 {sum(results)}/{len(results)} checks passed")
+    assert all(results), f"{len(results) - sum(results)} of {len(results)} checks failed"
+
+
+if __name__ == "__main__":
+    test_http_cache()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Test the pooled HTTP client (keep-alive, retries, timeouts) against a local stub server
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from services.http_client import HttpClient
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Groq-like stub: counts connections, can fail or stall on demand"""
+    protocol_version = "HTTP/1.1"
+    connections = set()
+    requests_seen = 0
+    fail_next = 0
+    delay = 0
+
+    def do_POST(self):
+        cls = StubHandler
+        cls.connections.add(self.client_address)
+        cls.requests_seen += 1
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        if cls.delay:
+            time.sleep(cls.delay)
+
+        if cls.fail_next:
+            cls.fail_next -= 1
+            status, body = 503, b'{"error": "busy"}'
+        else:
+            status, body = 200, json.dumps({"choices": [{"message": {"content": "ok"}}]}).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def reset():
+    StubHandler.connections = set()
+    StubHandler.requests_seen = 0
+    StubHandler.fail_next = 0
+    StubHandler.delay = 0
+
+
+def test_http_client():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/v1/chat/completions"
+
+    results = []
+
+    # 1. Keep-alive: sequential calls reuse one connection
+    reset()
+    client = HttpClient(backoff=0.01)
+    for _ in range(5):
+        client.post(url, json={"q": "hi"})
+    ok = len(StubHandler.connections) == 1
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Keep-alive: 5 requests over {len(StubHandler.connections)} connection(s)")
+
+    # 2. Retries: two 503s are absorbed by the retry budget
+    reset()
+    StubHandler.fail_next = 2
+    response = client.post(url, json={"q": "hi"})
+    ok = response.status_code == 200 and StubHandler.requests_seen == 3
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Retry: status {response.status_code} after {StubHandler.requests_seen} attempts")
+
+    # 3. Budget exhausted: the last 503 is returned, not raised
+    reset()
+    StubHandler.fail_next = 5
+    response = client.post(url, json={"q": "hi"})
+    ok = response.status_code == 503 and StubHandler.requests_seen == 3
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Retry budget: status {response.status_code} after {StubHandler.requests_seen} attempts")
+
+    # 4. Read timeout is per call and not retried
+    reset()
+    StubHandler.delay = 1
+    start = time.time()
+    try:
+        client.post(url, json={"q": "hi"}, timeout=(1, 0.2))
+        ok = False
+    except Exception as e:
+        ok = type(e).__name__ in ("ReadTimeout", "ConnectionError") and StubHandler.requests_seen == 1
+    elapsed = time.time() - start
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Timeout: gave up after {elapsed:.2f}s, {StubHandler.requests_seen} attempt(s)")
+
+    client.close()
+    server.shutdown()
+
+    print("\n" + "=" * 60)
+    print(f"🎯 {sum(results)}/{len(results)} checks passed")
+    assert all(results), f"{len(results) - sum(results)} of {len(results)} checks failed"
+
+
+if __name__ == "__main__":
+    print("🔌 Testing pooled HTTP client")
+    print("=" * 60)
+    test_http_client()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test the precomputed insight store: batch build, serving from /chat,
+incremental rebuilds and invalidation when a source CSV changes
+"""
+import os
+import shutil
+import tempfile
+
+import build_insights
+from app import app
+from services import insight_store as store_module
+from services.cache_manager import chatbot_cache, message_cache
+from services.insight_store import InsightStore, insight_store
+
+
+def fake_fetch(calls):
+    def fetch(prompt):
+        calls.append(prompt)
+        return f"STORED {len(calls)}"
+    return fetch
+
+
+def test_insight_store():
+    print("🗃️ Testing precomputed insight store")
+    print("=" * 60)
+    results = []
+    directory = tempfile.mkdtemp()
+    insight_store.directory = directory
+
+    try:
+        # 1. Batch job covers every crime head / year of both datasets
+        jobs = list(build_insights.insight_jobs())
+        calls = []
+        generated, reused, failed = insight_store.build(jobs, fake_fetch(calls))
+        ok = generated == len(jobs) == len(calls) and reused == 0 and failed == 0
+        results.append(ok)
+        print(f"{'✅' if ok else '❌'} Built {generated} insights for {len(jobs)} pairs")
+
+        # 2. /chat answers from the store without the LLM
+        client = app.test_client()
+        chatbot_cache.clear()
+        message_cache.clear()
+        gov = client.post("/chat", json={"message": "theft statistics 2019"}).get_json()
+        foreign = client.post("/chat", json={"message": "cheating against foreigners 2020"}).get_json()
+        ok = gov.get("insight", "").startswith("STORED") and len(calls) == len(jobs)
+        results.append(ok)
+        print(f"{'✅' if ok else '❌'} Government answer uses stored insight: {gov.get('insight', '')[:40]!r}")
+        if foreign.get("type") == "foreign_crime_specific":
+            ok = foreign.get("insight", "").startswith("STORED")
+            results.append(ok)
+            print(f"{'✅' if ok else '❌'} Foreign answer uses stored insight: {foreign.get('insight', '')[:40]!r}")
+
+        # 3. Unchanged data: a rebuild reuses everything
+        calls.clear()
+        generated, reused, failed = insight_store.build(jobs, fake_fetch(calls))
+        ok = generated == 0 and reused == len(jobs) and not calls
+        results.append(ok)
+        print(f"{'✅' if ok else '❌'} Rebuild on unchanged CSVs: {generated} generated, {reused} reused")
+
+        # 4. A changed CSV invalidates the store until it is rebuilt
+        source = os.path.join(directory, "table.csv")
+        with open(source, "w") as fh:
+            fh.write("Crime Head,Cases\nTheft,10\n")
+        small = InsightStore(directory=os.path.join(directory, "small"), sources={"government": {"2020": source}})
+        small.build([("government", "2020", "Theft", "prompt v1")], lambda prompt: "ten thefts")
+        before = small.get("government", "2020", "theft")
+        with open(source, "w") as fh:
+            fh.write("Crime Head,Cases\nTheft,12\n")
+        small.load()
+        after = small.get("government", "2020", "theft")
+        ok = before == "ten thefts" and after is None
+        results.append(ok)
+        print(f"{'✅' if ok else '❌'} Edited CSV: stored insight {before!r} -> {after!r}")
+    finally:
+        insight_store.directory = store_module.INSIGHT_STORE_DIR
+        insight_store.load()
+        shutil.rmtree(directory)
+
+    print()
+    print("=" * 60)
+    print(f"🎯 {sum(results)}/{len(results)} checks passed")
+    assert all(results), f"{len(results) - sum(results)} of {len(results)} checks failed"
+
+
+if __name__ == "__main__":
+    test_insight_store()
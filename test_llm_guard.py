@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test the Groq circuit breaker and latency budget against a local fake
+server that injects delays and errors
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import services.insight_generator as insight_generator
+import services.llm_extractor as llm_extractor
+from services.llm_guard import CircuitBreaker, latency_budget, groq_breaker
+
+
+class FakeGroq(BaseHTTPRequestHandler):
+    """Answers like Groq; `mode` switches between ok / error / slow / slow_error"""
+    protocol_version = "HTTP/1.1"
+    mode = "ok"
+    delay = 0
+    requests_seen = 0
+
+    def do_POST(self):
+        FakeGroq.requests_seen += 1
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+        if FakeGroq.mode in ("slow", "slow_error"):
+            time.sleep(FakeGroq.delay)
+
+        if FakeGroq.mode in ("error", "slow_error"):
+            status, body = 500, b'{"error": "down"}'
+        else:
+            content = json.dumps({"intent": "city_profile", "cities": ["Delhi"], "years": ["2020"],
+                                  "gender": "", "crime": "", "confidence": 0.95})
+            status, body = 200, json.dumps({"choices": [{"message": {"content": content}}]}).encode()
+
+        try:
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def log_message(self, *args):
+        pass
+
+
+def reset(mode="ok", delay=0, threshold=3, reset_timeout=0.5):
+    FakeGroq.mode = mode
+    FakeGroq.delay = delay
+    FakeGroq.requests_seen = 0
+    groq_breaker.__init__("groq", failure_threshold=threshold, reset_timeout=reset_timeout)
+
+
+def test_llm_guard():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGroq)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/openai/v1/chat/completions"
+
+    originals = (llm_extractor.GROQ_URL, insight_generator.GROQ_URL, insight_generator.LLM_INSIGHTS,
+                 groq_breaker.failure_threshold, groq_breaker.reset_timeout)
+    llm_extractor.GROQ_URL = url
+    insight_generator.GROQ_URL = url
+    # Insights wait on the LLM (the blocking path is what is guarded)
+    insight_generator.LLM_INSIGHTS = "sync"
+    try:
+        run_checks()
+    finally:
+        server.shutdown()
+        (llm_extractor.GROQ_URL, insight_generator.GROQ_URL, insight_generator.LLM_INSIGHTS,
+         threshold, reset_timeout) = originals
+        groq_breaker.__init__("groq", failure_threshold=threshold, reset_timeout=reset_timeout)
+
+
+def run_checks():
+    fallback = {"intent": "rules", "cities": [], "years": [], "gender": "", "crime": ""}
+    results = []
+
+    # 1. Errors trip the breaker; later calls fall back without a request.
+    # Every attempt is one upstream request and one breaker failure, so the
+    # first call's retries open it
+    reset("error", threshold=3)
+    for i in range(6):
+        llm_extractor.llm_extract(f"breaker test {i}", default=fallback)
+    ok = groq_breaker.state == "open" and FakeGroq.requests_seen == 3 and groq_breaker.short_circuited == 5
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Breaker opens after 3 failures: {FakeGroq.requests_seen} requests, "
+          f"{groq_breaker.short_circuited} short-circuited")
+
+    # 2. While open, insights use the caller's fallback immediately
+    start = time.time()
+    text = insight_generator.generate_insight("q", {"a": 1}, fallback="basic insight")
+    ok = text == "basic insight" and time.time() - start < 0.05
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Open breaker: insight fallback in {(time.time() - start) * 1000:.1f} ms")
+
+    # 3. Half-open probe succeeds -> closed
+    FakeGroq.mode = "ok"
+    time.sleep(0.6)
+    parsed = llm_extractor.llm_extract("probe question", default=fallback)
+    ok = parsed["intent"] == "city_profile" and groq_breaker.state == "closed"
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Half-open probe succeeded, breaker {groq_breaker.state}")
+
+    # 4. A failed probe re-opens it
+    reset("error", threshold=1, reset_timeout=0.2)
+    llm_extractor.llm_extract("fail once", default=fallback)
+    time.sleep(0.3)
+    llm_extractor.llm_extract("failed probe", default=fallback)
+    ok = groq_breaker.state == "open"
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Failed half-open probe re-opens the breaker")
+
+    # 5. Timeouts count as failures
+    reset("slow", delay=1.0, threshold=2)
+    with latency_budget(0.3):
+        llm_extractor.llm_extract("slow one", default=fallback)
+    with latency_budget(0.3):
+        llm_extractor.llm_extract("slow two", default=fallback)
+    ok = groq_breaker.state == "open"
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Read timeouts trip the breaker")
+
+    # 6. One budget across all LLM calls of a request
+    reset("slow", delay=0.4, threshold=100)
+    start = time.time()
+    with latency_budget(0.75):
+        llm_extractor.llm_extract("budget one", default=fallback)        # ~0.4s
+        insight_generator.generate_insight("budget two", {"b": 2}, fallback="basic")  # cut to ~0.35s
+        insight_generator.generate_insight("budget three", {"c": 3}, fallback="basic")  # not sent
+    elapsed = time.time() - start
+    ok = elapsed < 1.0 and FakeGroq.requests_seen == 2
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} 0.75s budget: 3 LLM steps took {elapsed:.2f}s, {FakeGroq.requests_seen} requests sent")
+
+    # 7. Retries of a slow 503 stay within the budget
+    reset("slow_error", delay=0.4, threshold=100)
+    start = time.time()
+    with latency_budget(0.75):
+        parsed = llm_extractor.llm_extract("slow 503", default=fallback)
+    elapsed = time.time() - start
+    ok = parsed == fallback and elapsed < 0.75 and FakeGroq.requests_seen == groq_breaker.failures == 1
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} 0.75s budget, 503 after 0.4s: fallback in {elapsed:.2f}s, "
+          f"{FakeGroq.requests_seen} request(s), {groq_breaker.failures} breaker failure(s)")
+
+    # 8. Breaker unit: half-open admits a single probe
+    breaker = CircuitBreaker("unit", failure_threshold=1, reset_timeout=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+    ok = breaker.allow() and not breaker.allow()
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Half-open lets exactly one probe through")
+
+    print("\n" + "=" * 60)
+    print(f"🎯 {sum(results)}/{len(results)} checks passed")
+    assert all(results), f"{len(results) - sum(results)} of {len(results)} checks failed"
+
+
+if __name__ == "__main__":
+    print("🧯 Testing LLM circuit breaker and latency budget")
+    print("=" * 60)
+    test_llm_guard()
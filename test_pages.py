@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test the server-rendered pages: KPI values in the HTML and the page cache's
+ETag revalidation
+"""
+from app import app
+from services.response_formatter import format_indian_number
+
+
+def test_pages():
+    print("🖥️ Testing rendered pages")
+    print("=" * 60)
+    client = app.test_client()
+    results = []
+
+    # 1. Indian digit grouping, as the pages' own JS formats numbers
+    cases = {0: "0", 999: "999", 1000: "1,000", 123456: "1,23,456", 166123556: "16,61,23,556", -45678: "-45,678"}
+    ok = all(format_indian_number(num) == text for num, text in cases.items())
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} format_indian_number {list(cases.values())}")
+
+    # 2. The home page carries the KPIs the API reports, already formatted
+    home = client.get("/")
+    html = home.get_data(as_text=True)
+    api = client.get("/api/home-kpis").get_json()
+    expected = [
+        f'data-value="{api["total_population"]}">{format_indian_number(api["total_population"])}</div>',
+        f'data-value="{api["total_arrests"]}">{format_indian_number(api["total_arrests"])}</div>',
+    ]
+    ok = home.status_code == 200 and all(text in html for text in expected)
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} / renders population {format_indian_number(api['total_population'])}, "
+          f"arrests {format_indian_number(api['total_arrests'])}")
+
+    # 3. Reports page summary matches /api/reports-summary
+    summary = client.get("/api/reports-summary").get_json()
+    reports = client.get("/reports").get_data(as_text=True)
+    ok = f"<strong>{format_indian_number(summary['total_arrests'])}</strong>" in reports
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} /reports renders total arrests {format_indian_number(summary['total_arrests'])}")
+
+    # 4. A second request with the page's ETag is an empty 304 (not in debug mode)
+    etag = home.headers.get("ETag")
+    again = client.get("/", headers={"If-None-Match": etag})
+    ok = not app.debug and etag and again.status_code == 304 and not again.data
+    ok = ok and "no-cache" in home.headers.get("Cache-Control", "")
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} If-None-Match {etag} -> {again.status_code}")
+
+    print()
+    print("=" * 60)
+    print(f"🎯 {sum(results)}/{len(results)} checks passed")
+    assert all(results), f"{len(results) - sum(results)} of {len(results)} checks failed"
+
+
+if __name__ == "__main__":
+    test_pages()
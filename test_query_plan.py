@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test the two chat cache tiers: the message tier (same question) and the
+plan tier (same query plan, however it is worded)
+"""
+import os
+
+# Never call the LLM
+os.environ["FAST_PATH_MIN_CONFIDENCE"] = "0"
+os.environ["LLM_INSIGHTS"] = "off"
+
+import services.query_plan as query_plan
+from app import app
+from services.cache_manager import chatbot_cache, message_cache
+from services.query_plan import UNCACHED_ROUTES, is_cacheable, plan_key, resolve_plan
+from services.rule_extractor import rule_extract
+
+PHRASINGS = ["Delhi arrests 2020", "How many arrests in Delhi in 2020?", "arrests in delhi during 2020"]
+UNCACHED = {"invalid_years": "Delhi arrests 2030", "year_crimes": "2020", "fallback": "average rate 2019 stuff"}
+
+
+def plan(message):
+    return resolve_plan(message, rule_extract(message))
+
+
+def answer(response):
+    return {k: v for k, v in response.items() if k not in ("cached", "response_time")}
+
+
+def test_query_plan():
+    print("🗺️ Testing the query plan cache tiers")
+    print("=" * 60)
+    client = app.test_client()
+    chatbot_cache.clear()
+    message_cache.clear()
+    results = []
+
+    # 1. Differently worded questions resolve to one plan key
+    keys = [plan_key(plan(message)) for message in PHRASINGS]
+    ok = all(key == keys[0] for key in keys) and keys[0]["v"] == query_plan.PLAN_VERSION
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} {len(PHRASINGS)} phrasings -> {keys[0]}")
+
+    # 2. ... and share its plan cache entry
+    first = client.post("/chat", json={"message": PHRASINGS[0]}).get_json()
+    second = client.post("/chat", json={"message": PHRASINGS[1]}).get_json()
+    ok = not first.get("cached") and second.get("cached") and answer(second) == answer(first)
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Second phrasing answered from the plan tier")
+
+    # 3. Message tier: the same question up to case and punctuation skips extraction
+    plan_hits = chatbot_cache.hits
+    again = client.post("/chat", json={"message": "  delhi ARRESTS 2020 ?"}).get_json()
+    ok = again.get("cached") and chatbot_cache.hits == plan_hits and message_cache.hits >= 1
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Repeated question answered from the message tier")
+
+    # 4. Error / handoff routes never get a plan entry
+    ok = UNCACHED_ROUTES == set(UNCACHED)
+    for route, message in UNCACHED.items():
+        resolved = plan(message)
+        client.post("/chat", json={"message": message})
+        client.post("/chat", json={"message": message})
+        ok = ok and resolved["route"] == route and not is_cacheable(resolved)
+        ok = ok and chatbot_cache.get(plan_key(resolved)) is None
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} {', '.join(sorted(UNCACHED))} not cached")
+
+    # 5. Bumping PLAN_VERSION invalidates entries written under the old one
+    original = query_plan.PLAN_VERSION
+    try:
+        query_plan.PLAN_VERSION = original + 1
+        bumped = client.post("/chat", json={"message": PHRASINGS[2]}).get_json()
+        ok = not bumped.get("cached") and plan_key(plan(PHRASINGS[2]))["v"] == original + 1
+    finally:
+        query_plan.PLAN_VERSION = original
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} PLAN_VERSION {original} -> {original + 1} misses the old entry")
+
+    chatbot_cache.clear()
+    message_cache.clear()
+
+    print()
+    print("=" * 60)
+    print(f"🎯 {sum(results)}/{len(results)} checks passed")
+    assert all(results), f"{len(results) - sum(results)} of {len(results)} checks failed"
+
+
+if __name__ == "__main__":
+    test_query_plan()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test the chatbot response cache backends (LRU limits, TTL, sharing between worker processes)
+"""
+
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+
+from services.cache_manager import ChatbotCache, MemoryBackend, SQLiteBackend
+from services.extraction_cache import ExtractionCache
+
+
+def query(i):
+    return {'cities': [f"City {i}"], 'years': ['2020'], 'intent': 'city_profile'}
+
+
+def check_limits(name, backend):
+    cache = ChatbotCache(backend)
+    results = []
+
+    for i in range(3):
+        cache.set(query(i), {'value': i})
+    cache.get(query(0))                 # touch 0 so 1 is least recently used
+    cache.set(query(3), {'value': 3})   # evicts 1
+
+    ok = cache.get(query(1)) is None and cache.get(query(0)) == {'value': 0}
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} {name}: LRU eviction by count")
+
+    copy = cache.get(query(3))
+    copy['value'] = 'changed'
+    ok = cache.get(query(3)) == {'value': 3}
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} {name}: hits return private copies")
+
+    cache.set(query(4), {'value': 'x' * 5000})  # over the byte budget with the rest
+    stats = cache.stats()
+    ok = stats['bytes'] <= 6000 and stats['evictions'] >= 2
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} {name}: byte bound ({stats['bytes']} bytes, {stats['evictions']} evictions)")
+
+    time.sleep(1.1)
+    ok = cache.get(query(4)) is None and cache.stats()['expirations'] >= 1
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} {name}: TTL expiry")
+    return results
+
+
+def worker_set(db_path):
+    ChatbotCache(SQLiteBackend(db_path)).set(query(42), {'from_pid': os.getpid()})
+
+
+def test_response_cache():
+    results = check_limits("memory", MemoryBackend(max_size=3, ttl=1, max_bytes=6000))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "responses.db")
+        results += check_limits("sqlite", SQLiteBackend(db_path, max_size=3, ttl=1, max_bytes=6000))
+
+        # The extraction cache's SQLite store is bounded and expires too
+        extractions = os.path.join(tmp, "extractions.db")
+        writer = ExtractionCache(db_path=extractions, db_max_size=3, ttl=1)
+        for i in range(6):
+            writer.set(f"Delhi arrests {i}?", {'years': [str(i)]})
+        reader = ExtractionCache(db_path=extractions, db_max_size=3, ttl=1)
+        bounded = reader.store.stats()['entries'] == 3 and reader.get("delhi arrests 5") == {'years': ['5']}
+        time.sleep(1.1)
+        ok = bounded and reader.get("delhi arrests 4") is None
+        results.append(ok)
+        print(f"{'✅' if ok else '❌'} extraction cache: SQLite store capped at 3 rows, TTL expiry")
+
+        # A response cached by one worker process is a hit in another
+        shared = os.path.join(tmp, "shared.db")
+        SQLiteBackend(shared)
+        process = multiprocessing.Process(target=worker_set, args=(shared,))
+        process.start()
+        process.join()
+        hit = ChatbotCache(SQLiteBackend(shared)).get(query(42))
+        ok = hit is not None and hit['from_pid'] == process.pid
+        results.append(ok)
+        print(f"{'✅' if ok else '❌'} sqlite: entry written by worker {process.pid} read by {os.getpid()}")
+
+        # Hits are read-only: they don't wait for another worker's write lock
+        writer = sqlite3.connect(shared, isolation_level=None)
+        writer.execute("BEGIN IMMEDIATE")
+        start = time.time()
+        hit = ChatbotCache(SQLiteBackend(shared)).get(query(42))
+        elapsed = time.time() - start
+        writer.execute("ROLLBACK")
+        writer.close()
+        ok = hit is not None and elapsed < 1
+        results.append(ok)
+        print(f"{'✅' if ok else '❌'} sqlite: hit during another worker's write in {elapsed * 1000:.1f} ms")
+
+    print("\n" + "=" * 60)
+    print(f"🎯 {sum(results)}/{len(results)} checks passed")
+    assert all(results), f"{len(results) - sum(results)} of {len(results)} checks failed"
+
+
+if __name__ == "__main__":
+    print("🗄️ Testing response cache backends")
+    print("=" * 60)
+    test_response_cache()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test the local rule extractor: its vocabulary and the confidence threshold
+that decides whether a message still goes to the LLM
+"""
+import services.rule_extractor as rule_extractor
+from services.rule_extractor import CITY_ALIASES, CITY_ALTERNATES, extract_query, rule_extract
+
+CONFIDENT = ["Delhi arrests 2020", "top 5 cities 2019", "compare Bombay and Calcutta",
+             "kidnapping in Bangalore 2019", "juvenile girls Delhi 2019"]
+UNSURE = ["how did things go with Madras when the monsoon came",  # city only, 0.44
+          "what about the weather in that place yesterday"]       # nothing recognized, 0.0
+
+
+def test_rule_extractor():
+    print("📐 Testing the rule extractor fast path")
+    print("=" * 60)
+    results = []
+
+    # 1. Alternate spellings resolve to the same dataset label as the city itself
+    resolved = {alt: CITY_ALIASES.get(alt) for alt, base in CITY_ALTERNATES.items() if base in CITY_ALIASES}
+    ok = bool(resolved) and all(label == CITY_ALIASES[CITY_ALTERNATES[alt]] for alt, label in resolved.items())
+    ok = ok and rule_extract("compare Bombay and Calcutta")["cities"] == rule_extract("compare Mumbai and Kolkata")["cities"]
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} {len(resolved)} CITY_ALTERNATES resolve like their base city")
+
+    # 2. INTENT_KEYWORDS: first match wins, "top N" and two cities override
+    expected = {
+        "juvenile crime trend 2019": "juvenile",
+        "foreigner crimes trend": "trend",
+        "highest arrests 2020": "highest",
+        "top 5 cities 2019": "top_n",
+        "Delhi and Mumbai 2020": "city_comparison",
+        "Delhi arrests 2020": "city_profile",
+        "murder 2020": "statistics",
+    }
+    intents = {message: rule_extract(message)["intent"] for message in expected}
+    ok = intents == expected
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Intents {intents}")
+
+    llm_calls = []
+
+    def fake_llm_extract(message, default=None):
+        llm_calls.append((message, default))
+        return {"intent": "from_llm"}
+
+    original_llm, original_threshold = rule_extractor.llm_extract, rule_extractor.FAST_PATH_MIN_CONFIDENCE
+    rule_extractor.llm_extract = fake_llm_extract
+    try:
+        rule_extractor.FAST_PATH_MIN_CONFIDENCE = 0.9
+
+        # 3. Confident parses are answered locally
+        answers = [extract_query(message) for message in CONFIDENT]
+        ok = not llm_calls and answers == [rule_extract(message) for message in CONFIDENT]
+        results.append(ok)
+        print(f"{'✅' if ok else '❌'} {len(CONFIDENT)} confident messages skip the LLM")
+
+        # 4. Low-confidence and unrecognized messages reach llm_extract, rules as fallback
+        answers = [extract_query(message) for message in UNSURE]
+        ok = (
+            [message for message, _ in llm_calls] == UNSURE
+            and all(default == rule_extract(message) for message, default in llm_calls)
+            and all(answer == {"intent": "from_llm"} for answer in answers)
+        )
+        results.append(ok)
+        print(f"{'✅' if ok else '❌'} {len(llm_calls)} unsure messages sent to llm_extract")
+
+        # 5. The threshold decides: 0.44 is local below it, LLM above it
+        llm_calls.clear()
+        rule_extractor.FAST_PATH_MIN_CONFIDENCE = 0.4
+        extract_query(UNSURE[0])
+        local = not llm_calls
+        rule_extractor.FAST_PATH_MIN_CONFIDENCE = 0.5
+        extract_query(UNSURE[0])
+        ok = local and len(llm_calls) == 1
+        results.append(ok)
+        print(f"{'✅' if ok else '❌'} Confidence {rule_extract(UNSURE[0])['confidence']}: local at 0.4, LLM at 0.5")
+    finally:
+        rule_extractor.llm_extract, rule_extractor.FAST_PATH_MIN_CONFIDENCE = original_llm, original_threshold
+
+    print()
+    print("=" * 60)
+    print(f"🎯 {sum(results)}/{len(results)} checks passed")
+    assert all(results), f"{len(results) - sum(results)} of {len(results)} checks failed"
+
+
+if __name__ == "__main__":
+    test_rule_extractor()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Test request coalescing: a burst of identical calls runs the work once
+"""
+
+import threading
+import time
+
+from services.single_flight import SingleFlight
+
+
+def burst(flight, key, fn, n=20):
+    """Start n threads on the same key at once; return what each got"""
+    results = [None] * n
+    errors = [None] * n
+    start = threading.Barrier(n)
+
+    def worker(i):
+        start.wait()
+        try:
+            results[i] = flight.do(key, fn)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+def test_single_flight():
+    results = []
+
+    # 1. One execution for a burst of 20 identical calls
+    flight = SingleFlight()
+    calls = []
+
+    def slow_extract():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"cities": ["Delhi (City)"], "years": ["2020"]}
+
+    got, _ = burst(flight, ("extract", "delhi arrests 2020"), slow_extract)
+    ok = len(calls) == 1 and all(r == {"cities": ["Delhi (City)"], "years": ["2020"]} for r in got)
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Burst of {len(got)}: {len(calls)} execution(s), stats {flight.stats()}")
+
+    # 2. Callers get private copies
+    got[0]["years"].append("2016")
+    ok = all(r["years"] == ["2020"] for r in got[1:])
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Results are independent copies")
+
+    # 3. The leader's exception reaches every waiter
+    def failing():
+        time.sleep(0.1)
+        raise RuntimeError("groq down")
+
+    _, errors = burst(flight, ("insight", "x"), failing, n=5)
+    ok = all(isinstance(e, RuntimeError) for e in errors)
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Errors shared: {sum(e is not None for e in errors)}/5 callers raised")
+
+    # 4. Different keys and later calls are not coalesced
+    calls.clear()
+    flight.do("a", slow_extract)
+    flight.do("a", slow_extract)
+    flight.do("b", slow_extract)
+    ok = len(calls) == 3 and flight.stats()["in_flight"] == 0
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Sequential / distinct keys run separately ({len(calls)} executions)")
+
+    print("\n" + "=" * 60)
+    print(f"🎯 {sum(results)}/{len(results)} checks passed")
+    assert all(results), f"{len(results) - sum(results)} of {len(results)} checks failed"
+
+
+if __name__ == "__main__":
+    print("🛬 Testing single-flight request coalescing")
+    print("=" * 60)
+    test_single_flight()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test the CSV snapshot cache in both formats (Feather is skipped without pyarrow)
+"""
+import os
+import tempfile
+
+import pandas as pd
+
+import services.snapshot_cache as snapshot_cache
+
+
+def check_format(fmt, tmp):
+    """Snapshot reuse / invalidation with snapshot_cache set to one format"""
+    results = []
+    source = os.path.join(tmp, f"crimes_{fmt}.csv")
+    pd.DataFrame({"City": ["Delhi", "Mumbai"], "Total": [10, 20]}).to_csv(source, index=False)
+
+    builds = []
+
+    def _build(path):
+        builds.append(path)
+        return pd.read_csv(path)
+
+    # 1. Second load comes from the snapshot, same frame
+    first = snapshot_cache.load_snapshot(source, _build)
+    second = snapshot_cache.load_snapshot(source, _build)
+    snapshot_path, _ = snapshot_cache._paths(source, "build")
+    ok = len(builds) == 1 and second.equals(first) and os.path.exists(snapshot_path)
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} {fmt}: reused {os.path.basename(snapshot_path)}, {len(builds)} CSV parse(s)")
+
+    # 2. Touched but unchanged: still the snapshot
+    os.utime(source, None)
+    snapshot_cache.load_snapshot(source, _build)
+    ok = len(builds) == 1
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} {fmt}: touched source keeps the snapshot")
+
+    # 3. Changed contents: the CSV is parsed again
+    pd.DataFrame({"City": ["Delhi"], "Total": [99]}).to_csv(source, index=False)
+    third = snapshot_cache.load_snapshot(source, _build)
+    ok = len(builds) == 2 and third["Total"].tolist() == [99]
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} {fmt}: changed source rebuilds the snapshot")
+    return results
+
+
+def test_snapshot_cache():
+    print("🧊 Testing CSV snapshots")
+    print("=" * 60)
+    results = []
+    originals = snapshot_cache.SNAPSHOT_DIR, snapshot_cache.SNAPSHOT_FORMAT
+
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_cache.SNAPSHOT_DIR = os.path.join(tmp, ".snapshots")
+        try:
+            for fmt in ("pickle", "feather"):
+                if fmt == "feather" and snapshot_cache.feather is None:
+                    print("⏭️ feather: skipped (pyarrow not installed)")
+                    continue
+                snapshot_cache.SNAPSHOT_FORMAT = fmt
+                results += check_format(fmt, tmp)
+        finally:
+            snapshot_cache.SNAPSHOT_DIR, snapshot_cache.SNAPSHOT_FORMAT = originals
+
+    print()
+    print("=" * 60)
+    print(f"🎯 {sum(results)}/{len(results)} checks passed")
+    assert all(results), f"{len(results) - sum(results)} of {len(results)} checks failed"
+
+
+if __name__ == "__main__":
+    test_snapshot_cache()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test the static asset pipeline (minification, hashed names, precompressed variants)
+"""
+import gzip
+import os
+import tempfile
+
+from flask import Flask
+
+from services.static_assets import build_assets, init_static_assets, minify_css
+
+
+def test_static_assets():
+    print("📦 Testing static asset pipeline")
+    print("=" * 60)
+    results = []
+
+    # 1. The CSS minifier leaves quoted strings alone
+    css = 'a > b , c { content: "x ; y , z" ; font: 12px \'a > b\' ; } /* note */'
+    out = minify_css(css)
+    ok = out == 'a>b,c{content: "x ; y , z";font: 12px \'a > b\'}'
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} minify_css -> {out}")
+
+    with tempfile.TemporaryDirectory() as static_dir:
+        os.makedirs(os.path.join(static_dir, "css"))
+        with open(os.path.join(static_dir, "css", "site.css"), "w") as fh:
+            fh.write("body {\n  color : red ;\n}\n" * 100)
+
+        # 2. Content-hashed name; unchanged sources keep it
+        first = build_assets(static_dir)
+        again = build_assets(static_dir)
+        asset = first.get("css/site.css", "")
+        ok = asset.startswith("css/site.") and asset.endswith(".css") and first == again
+        results.append(ok)
+        print(f"{'✅' if ok else '❌'} css/site.css -> {asset}")
+
+        # 3. Served gzipped with immutable caching when accepted
+        app = Flask(__name__, static_folder=static_dir)
+        init_static_assets(app, static_dir)
+        response = app.test_client().get(f"/static/dist/{asset}", headers={"Accept-Encoding": "gzip"})
+        ok = (
+            response.headers.get("Content-Encoding") == "gzip"
+            and gzip.decompress(response.data).startswith(b"body{color : red}")
+            and "immutable" in response.headers.get("Cache-Control", "")
+        )
+        results.append(ok)
+        response.close()
+        print(f"{'✅' if ok else '❌'} gzip variant, {response.headers.get('Cache-Control')}")
+
+    print()
+    print("=" * 60)
+    print(f"🎯 {sum(results)}/{len(results)} checks passed")
+    assert all(results), f"{len(results) - sum(results)} of {len(results)} checks failed"
+
+
+if __name__ == "__main__":
+    test_static_assets()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test the paged table API body (page bounds, fields=, format=columnar, 400 errors)
+"""
+import pandas as pd
+from flask import Flask
+
+from services.helpers import table_response
+
+app = Flask(__name__)
+TABLE = pd.DataFrame({
+    "City": [f"City {i}" for i in range(10)],
+    "Total": list(range(10)),
+    "Note": ["x", None] * 5,
+})
+
+
+def table(query, **kwargs):
+    with app.test_request_context(f"/table?{query}"):
+        return table_response(TABLE, **kwargs)
+
+
+def test_table_response():
+    print("📄 Testing table_response")
+    print("=" * 60)
+    results = []
+
+    # 1. No paging args and no default: every row as records, NaN filled
+    body, status = table("")
+    ok = status == 200 and len(body["rows"]) == 10 and "page" not in body and body["rows"][1]["Note"] == ""
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} All {len(body['rows'])} rows without paging")
+
+    # 2. Paging: second page, default per_page, page below 1 clamps to 1
+    body, status = table("page=2&per_page=4")
+    default, _ = table("page=0", default_per_page=3)
+    ok = (
+        [row["Total"] for row in body["rows"]] == [4, 5, 6, 7] and body["total_rows"] == 10
+        and default["page"] == 1 and default["per_page"] == 3 and len(default["rows"]) == 3
+    )
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} page=2&per_page=4 -> {[row['Total'] for row in body['rows']]}")
+
+    # 3. per_page is capped at max_per_page (and at least 1)
+    capped, _ = table("per_page=500", max_per_page=5)
+    floor, _ = table("per_page=0")
+    ok = capped["per_page"] == 5 and len(capped["rows"]) == 5 and floor["per_page"] == 1
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} per_page=500 capped to {capped['per_page']}, per_page=0 -> {floor['per_page']}")
+
+    # 4. A page past the end is empty, not an error
+    body, status = table("page=99&per_page=4")
+    ok = status == 200 and body["rows"] == [] and body["total_rows"] == 10
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} page=99 -> {status}, {len(body['rows'])} rows")
+
+    # 5. fields= narrows the columns; columnar sends them once
+    body, status = table("fields=Total,%20City&format=columnar&per_page=2")
+    ok = status == 200 and body["columns"] == ["Total", "City"] and body["rows"] == [[0, "City 0"], [1, "City 1"]]
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Columnar {body['columns']} {body['rows']}")
+
+    # 6. Unknown fields and formats are 400s
+    fields_body, fields_status = table("fields=City,Bogus")
+    format_body, format_status = table("format=csv")
+    ok = (
+        fields_status == 400 and "Bogus" in fields_body["error"] and fields_body["available_fields"] == ["City", "Total", "Note"]
+        and format_status == 400 and "csv" in format_body["error"]
+    )
+    results.append(ok)
+    print(f"{'✅' if ok else '❌'} Unknown field -> {fields_status}, unknown format -> {format_status}")
+
+    print()
+    print("=" * 60)
+    print(f"🎯 {sum(results)}/{len(results)} checks passed")
+    assert all(results), f"{len(results) - sum(results)} of {len(results)} checks failed"
+
+
+if __name__ == "__main__":
+    test_table_response()